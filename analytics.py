@@ -0,0 +1,158 @@
+"""
+Materialized Field Worker analytics.
+
+``analytics_snapshot`` holds one counter per (creation day, block, status).
+Write endpoints adjust the affected counter inside their own transaction, so
+the admin overview reads O(days x blocks) rows however large the
+field_workers table grows. A background reconciler periodically recomputes
+the counters from source and repairs any drift (failed writes or manual
+SQL). It holds the snapshot table's write lock while it reads and rewrites,
+so an increment either committed before the reconcile (and is in the
+recount) or waits and applies on top of the corrected value.
+"""
+import asyncio
+import logging
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy import false, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select, func
+
+from db import dialect_insert
+from models import AnalyticsSnapshot, FieldWorker, Village
+
+logger = logging.getLogger(__name__)
+
+# Seconds between reconciler passes
+RECONCILE_INTERVAL_SECONDS = 3600
+
+
+def _bucket_day(value: datetime | date | str) -> date:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+async def bump_snapshot(
+    session: AsyncSession,
+    created_at: datetime,
+    block: Optional[str],
+    status: str,
+    delta: int
+) -> None:
+    """Adjust one counter by delta. Caller commits with its own changes."""
+    if not block or not delta:
+        return
+    now = datetime.now(timezone.utc)
+    stmt = dialect_insert(AnalyticsSnapshot).values(
+        day=_bucket_day(created_at),
+        block=block,
+        status=status,
+        count=delta,
+        updated_at=now
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["day", "block", "status"],
+        set_={"count": AnalyticsSnapshot.count + delta, "updated_at": now}
+    )
+    await session.execute(stmt)
+
+
+async def bump_field_worker(
+    session: AsyncSession,
+    field_worker: FieldWorker,
+    old_status: Optional[str],
+    new_status: Optional[str]
+) -> None:
+    """Move a Field Worker between status counters (None = not counted)."""
+    block_result = await session.execute(
+        select(Village.block).where(Village.id == field_worker.village_id)
+    )
+    block = block_result.scalar_one_or_none()
+    if old_status:
+        await bump_snapshot(session, field_worker.created_at, block, old_status, -1)
+    if new_status:
+        await bump_snapshot(session, field_worker.created_at, block, new_status, 1)
+
+
+async def _lock_snapshot(session: AsyncSession) -> None:
+    """Block snapshot writes until the session commits."""
+    if session.bind.dialect.name == "postgresql":
+        # Row locks would miss buckets a concurrent write is about to insert
+        await session.execute(text(f"LOCK TABLE {AnalyticsSnapshot.__tablename__} IN EXCLUSIVE MODE"))
+    else:
+        # SQLite: any write statement takes the database write lock
+        await session.execute(
+            update(AnalyticsSnapshot).where(false()).values(count=AnalyticsSnapshot.count)
+        )
+
+
+async def reconcile_snapshot(session: AsyncSession) -> int:
+    """Recompute every counter from field_workers and fix drift. Returns rows corrected."""
+    await _lock_snapshot(session)
+    day_bucket = func.date(FieldWorker.created_at)
+    source_result = await session.execute(
+        select(day_bucket, Village.block, FieldWorker.status, func.count(FieldWorker.id))
+        .join(Village, FieldWorker.village_id == Village.id)
+        .group_by(day_bucket, Village.block, FieldWorker.status)
+    )
+    expected = {
+        (_bucket_day(day), block, status): count
+        for day, block, status, count in source_result.all()
+    }
+
+    snapshot_result = await session.execute(select(AnalyticsSnapshot))
+    corrected = 0
+    now = datetime.now(timezone.utc)
+    for row in snapshot_result.scalars().all():
+        key = (row.day, row.block, row.status)
+        count = expected.pop(key, 0)
+        if count == 0:
+            # Buckets decremented to zero are pruned here, not counted as drift
+            await session.delete(row)
+            if row.count != 0:
+                corrected += 1
+        elif row.count != count:
+            row.count = count
+            row.updated_at = now
+            corrected += 1
+
+    for (day, block, status), count in expected.items():
+        session.add(AnalyticsSnapshot(day=day, block=block, status=status, count=count, updated_at=now))
+        corrected += 1
+
+    await session.commit()
+    return corrected
+
+
+async def read_snapshot(session: AsyncSession) -> list[tuple[date, str, str, int]]:
+    """Return all non-zero (day, block, status, count) counters."""
+    result = await session.execute(
+        select(
+            AnalyticsSnapshot.day,
+            AnalyticsSnapshot.block,
+            AnalyticsSnapshot.status,
+            AnalyticsSnapshot.count
+        ).where(AnalyticsSnapshot.count != 0)
+    )
+    return [(_bucket_day(day), block, status, count) for day, block, status, count in result.all()]
+
+
+async def run_snapshot_reconciler(session_maker, interval: float = RECONCILE_INTERVAL_SECONDS) -> None:
+    """Reconcile once immediately, then every interval seconds until cancelled."""
+    while True:
+        try:
+            async with session_maker() as session:
+                corrected = await reconcile_snapshot(session)
+            if corrected:
+                logger.info(f"Analytics snapshot reconciled: {corrected} counters corrected")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Analytics snapshot reconciliation failed: {e}", exc_info=True)
+        await asyncio.sleep(interval)
@@ -0,0 +1,245 @@
+"""
+Set-based computation of BlockStatistics.
+
+Every metric for every block comes from one grouped query per source table
+(villages, seva requests, members, testimonials), and the results are written
+back in a single INSERT ... ON CONFLICT statement. The number of queries is
+the same however many blocks are configured.
+
+``block_stats_scheduler`` runs the refresh in the background so public reads
+only ever serve the stored rows.
+"""
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+from sqlalchemy import case, distinct
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select, func
+
+from db import dialect_insert
+from geometry import geometry_area_sq_km
+from models import BlockStatistics, Member, SevaRequest, SevaResponse, Testimonial, Village
+
+logger = logging.getLogger(__name__)
+
+BLOCKS_GEOJSON_PATH = 'static/geojson/bhadrak_blocks.geojson'
+
+ACTIVE_SEVA_STATUSES = ["open", "assigned", "in_progress"]
+
+_block_features: list[dict] | None = None
+
+
+def load_block_features() -> list[dict]:
+    """Load block boundary features once per process.
+
+    Raises FileNotFoundError / json.JSONDecodeError for the caller to report.
+    """
+    global _block_features
+    if _block_features is None:
+        with open(BLOCKS_GEOJSON_PATH, 'r', encoding='utf-8') as f:
+            _block_features = json.load(f).get('features', [])
+    return _block_features
+
+
+def _hours_between(start, end, dialect_name: str):
+    if dialect_name == "postgresql":
+        return func.extract('epoch', end - start) / 3600.0
+    return (func.julianday(end) - func.julianday(start)) * 24.0
+
+
+def _activity(active_requests: int) -> tuple[str, str]:
+    if active_requests >= 10:
+        return "high", "#10b981"  # Green
+    if active_requests >= 5:
+        return "medium", "#f59e0b"  # Yellow
+    if active_requests >= 1:
+        return "low", "#f97316"  # Orange
+    return "none", "#9ca3af"  # Gray
+
+
+async def refresh_all_block_statistics(session: AsyncSession) -> int:
+    """Recompute and upsert statistics for every configured block. Returns block count."""
+    features = load_block_features()
+    blocks = {
+        feature['properties']['name']: feature
+        for feature in features
+        if feature.get('properties', {}).get('name')
+    }
+    if not blocks:
+        return 0
+    block_names = list(blocks)
+    dialect_name = session.bind.dialect.name
+
+    # Villages and population
+    village_rows = await session.execute(
+        select(Village.block, func.count(Village.id), func.sum(Village.population))
+        .where(Village.block.in_(block_names))
+        .group_by(Village.block)
+    )
+    villages = {block: (count, int(pop or 0)) for block, count, pop in village_rows.all()}
+
+    # Seva requests: total, active and fulfilled
+    seva_rows = await session.execute(
+        select(
+            Village.block,
+            func.count(SevaRequest.id),
+            func.sum(case((SevaRequest.status.in_(ACTIVE_SEVA_STATUSES), 1), else_=0)),
+            func.sum(case((SevaRequest.status == "fulfilled", 1), else_=0))
+        )
+        .join(Village, SevaRequest.village_id == Village.id)
+        .where(Village.block.in_(block_names))
+        .group_by(Village.block)
+    )
+    seva = {
+        block: (total, int(active or 0), int(fulfilled or 0))
+        for block, total, active, fulfilled in seva_rows.all()
+    }
+
+    # Average hours from request creation to first volunteer response
+    first_response = (
+        select(
+            SevaResponse.request_id.label("request_id"),
+            func.min(SevaResponse.responded_at).label("first_responded_at")
+        )
+        .group_by(SevaResponse.request_id)
+        .subquery()
+    )
+    response_rows = await session.execute(
+        select(
+            Village.block,
+            func.avg(_hours_between(SevaRequest.created_at, first_response.c.first_responded_at, dialect_name))
+        )
+        .join(first_response, first_response.c.request_id == SevaRequest.id)
+        .join(Village, SevaRequest.village_id == Village.id)
+        .where(Village.block.in_(block_names))
+        .group_by(Village.block)
+    )
+    response_hours = {block: avg for block, avg in response_rows.all()}
+
+    # Verified volunteers and the villages they cover
+    member_rows = await session.execute(
+        select(Village.block, func.count(Member.id), func.count(distinct(Member.village_id)))
+        .join(Village, Member.village_id == Village.id)
+        .where(Member.verified == True)
+        .where(Village.block.in_(block_names))
+        .group_by(Village.block)
+    )
+    members = {block: (volunteers, covered) for block, volunteers, covered in member_rows.all()}
+
+    # Testimonials attributed to a village in the block
+    testimonial_rows = await session.execute(
+        select(Village.block, func.count(Testimonial.id))
+        .join(Village, Testimonial.village_id == Village.id)
+        .where(Village.block.in_(block_names))
+        .group_by(Village.block)
+    )
+    testimonials = dict(testimonial_rows.all())
+
+    now = datetime.now(timezone.utc)
+    values = []
+    for block_name, feature in blocks.items():
+        total_villages, population = villages.get(block_name, (0, 0))
+        total_seva, active_seva, fulfilled_seva = seva.get(block_name, (0, 0, 0))
+        total_volunteers, villages_with_members = members.get(block_name, (0, 0))
+        avg_hours = response_hours.get(block_name)
+        area = geometry_area_sq_km(feature.get('geometry') or {})
+        activity_level, activity_color = _activity(active_seva)
+
+        values.append({
+            "block_name": block_name,
+            "block_code": feature['properties'].get('block_code', block_name[:3].upper()),
+            "total_villages": total_villages,
+            "population": population,
+            "active_seva_requests": active_seva,
+            "total_seva_requests": total_seva,
+            "fulfilled_seva_count": fulfilled_seva,
+            "avg_response_time_hours": round(float(avg_hours), 2) if avg_hours is not None else None,
+            "testimonial_count": testimonials.get(block_name, 0),
+            "villages_with_members": villages_with_members,
+            "total_volunteers": total_volunteers,
+            "coverage_percentage": round(villages_with_members / total_villages * 100, 1) if total_villages else 0.0,
+            "activity_level": activity_level,
+            "activity_color": activity_color,
+            "seva_density": (total_seva / population) * 1000 if population > 0 else 0.0,
+            "population_density": round(population / area, 1) if area > 0 else 0.0,
+            "last_calculated": now,
+            "updated_at": now,
+        })
+
+    stmt = dialect_insert(BlockStatistics).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["block_name"],
+        set_={
+            column: getattr(stmt.excluded, column)
+            for column in values[0]
+            if column != "block_name"
+        }
+    )
+    await session.execute(stmt)
+    await session.commit()
+    return len(values)
+
+
+class BlockStatisticsScheduler:
+    """Recompute block statistics in the background.
+
+    Runs every ``interval`` seconds, and ``debounce`` seconds after the first
+    write in a burst (``notify_write``), so read endpoints only ever serve
+    stored rows. ``max_staleness`` is the bound advertised to readers; a read
+    that finds older rows calls ``request_refresh`` instead of recomputing.
+    """
+
+    def __init__(self, interval: float = 300.0, debounce: float = 5.0, max_staleness: float = 900.0):
+        self.interval = interval
+        self.debounce = debounce
+        self.max_staleness = max_staleness
+        self.last_calculated: datetime | None = None
+        self._wake: asyncio.Event | None = None
+
+    def notify_write(self) -> None:
+        """Signal that source data changed; coalesced into one refresh."""
+        if self._wake is not None:
+            self._wake.set()
+
+    request_refresh = notify_write
+
+    def is_stale(self, last_calculated: datetime | None) -> bool:
+        if last_calculated is None:
+            return True
+        if last_calculated.tzinfo is None:
+            last_calculated = last_calculated.replace(tzinfo=timezone.utc)
+        age = (datetime.now(timezone.utc) - last_calculated).total_seconds()
+        return age > self.max_staleness
+
+    async def refresh_now(self, session_maker) -> None:
+        async with session_maker() as session:
+            await refresh_all_block_statistics(session)
+        self.last_calculated = datetime.now(timezone.utc)
+
+    async def run(self, session_maker) -> None:
+        """Refresh once immediately, then on interval or debounced writes until cancelled."""
+        self._wake = asyncio.Event()
+        while True:
+            try:
+                await self.refresh_now(session_maker)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Block statistics refresh failed: {e}", exc_info=True)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+                # Let the rest of the burst land before recomputing
+                await asyncio.sleep(self.debounce)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+
+block_stats_scheduler = BlockStatisticsScheduler(
+    interval=float(os.getenv("BLOCK_STATS_REFRESH_SECONDS", 300)),
+    debounce=float(os.getenv("BLOCK_STATS_DEBOUNCE_SECONDS", 5)),
+    max_staleness=float(os.getenv("BLOCK_STATS_MAX_STALENESS_SECONDS", 900)),
+)
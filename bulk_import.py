@@ -0,0 +1,277 @@
+"""
+Streaming CSV imports for the admin bulk upload endpoints.
+
+Rows are read lazily from the uploaded file (never decoded as one string),
+resolved against lookup maps loaded once per import, and written in batches
+of ``IMPORT_BATCH_SIZE``. Each batch runs in a SAVEPOINT and is committed on
+its own, so a failing batch is reported row by row while the rest of the
+import carries on; rows that fail validation are reported individually and
+never reach the database. An optional ``progress`` callback is awaited at the
+end of every batch, before it commits, with the rows read and errors so far;
+progress written through the import session therefore commits together with
+the batch, and ``start_row`` resumes an import exactly after the last
+committed batch (see import_jobs.py).
+"""
+import contextlib
+import csv
+import io
+import itertools
+import logging
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, BinaryIO, Callable, Iterator, Optional
+
+from sqlalchemy import false, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from db import dialect_insert
+from models import Member, Village
+from village_resolver import VillageResolver
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 500
+
+# Fuzzy village matches listed in a member import result; the count is exact
+MAX_REPORTED_FUZZY_MATCHES = 1000
+
+# Awaited before each batch commits with (rows_processed, errors_so_far)
+ProgressCallback = Callable[[int, list[str]], Awaitable[None]]
+
+# Bytes read from the upload per chunk
+READ_CHUNK_SIZE = 64 * 1024
+
+VILLAGE_COORD_COLUMNS = ("lat", "lng", "south", "west", "north", "east")
+
+
+def iter_csv_rows(raw: BinaryIO) -> Iterator[tuple[int, dict]]:
+    """Yield (line_number, row) from a binary UTF-8 CSV stream, chunk by chunk."""
+    text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+    text._CHUNK_SIZE = READ_CHUNK_SIZE
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    finally:
+        # Leave the upload open for its owner
+        text.detach()
+
+
+def _data_rows(raw: BinaryIO, start_row: int) -> Iterator[tuple[int, dict]]:
+    return itertools.islice(iter_csv_rows(raw), start_row, None)
+
+
+def _batches(rows: Iterator, size: int = IMPORT_BATCH_SIZE) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@contextlib.asynccontextmanager
+async def _savepoint(session: AsyncSession) -> AsyncIterator[None]:
+    """SAVEPOINT for one batch, inside a real transaction.
+
+    The sqlite3 driver only opens a transaction before DML, so a SAVEPOINT
+    sent first ran outside one and its RELEASE committed the batch ahead of
+    the progress written for it; a no-op UPDATE opens the transaction.
+    """
+    if session.bind.dialect.name == "sqlite":
+        await session.execute(update(Village).where(false()).values(id=Village.id))
+    async with session.begin_nested():
+        yield
+
+
+def _village_values(row: dict) -> dict:
+    name = (row.get('name') or '').strip()
+    block = (row.get('block') or '').strip()
+    if not name or not block:
+        raise ValueError("name and block are required")
+    values = {"name": name, "block": block}
+    for column in VILLAGE_COORD_COLUMNS:
+        values[column] = float(row[column])
+    values["code_2011"] = row.get('code_2011', '')
+    return values
+
+
+async def import_villages_csv(
+    session: AsyncSession,
+    raw: BinaryIO,
+    progress: Optional[ProgressCallback] = None,
+    start_row: int = 0
+) -> dict:
+    """Create or update villages from a CSV keyed on (name, block).
+
+    Returns {"inserted", "created", "updated", "errors"}; ``inserted`` counts
+    every row written, as the endpoint always has. Rows before ``start_row``
+    are skipped.
+    """
+    existing_result = await session.execute(select(Village.id, Village.name, Village.block))
+    village_ids = {(name, block): village_id for village_id, name, block in existing_result.all()}
+
+    created = updated = 0
+    processed = start_row
+    errors: list[str] = []
+    now = datetime.now(timezone.utc)
+
+    for batch in _batches(_data_rows(raw, start_row)):
+        processed += len(batch)
+        # Last row wins when a batch repeats a village
+        new_rows: dict[tuple[str, str], dict] = {}
+        update_rows: dict[int, dict] = {}
+        valid = []
+        for line, row in batch:
+            try:
+                values = _village_values(row)
+            except Exception as e:
+                errors.append(f"Row {line} ({row.get('name') or '?'}): {e}")
+                continue
+            valid.append((line, row))
+            key = (values["name"], values["block"])
+            village_id = village_ids.get(key)
+            if village_id is None:
+                new_rows[key] = values
+            else:
+                update_rows[village_id] = {**values, "id": village_id, "updated_at": now}
+
+        try:
+            async with _savepoint(session):
+                if new_rows:
+                    keys = list(new_rows)
+                    result = await session.execute(
+                        insert(Village).returning(Village.id, sort_by_parameter_order=True),
+                        [
+                            {
+                                **new_rows[key],
+                                "district": "Bhadrak",
+                                "state": "Odisha",
+                                "show_pin": True,
+                                "created_at": now,
+                                "updated_at": now,
+                            }
+                            for key in keys
+                        ]
+                    )
+                    new_ids = result.scalars().all()
+                if update_rows:
+                    # Keyed on the primary key; villages has no (name, block) constraint
+                    stmt = dialect_insert(Village).values([
+                        {**values, "district": "Bhadrak", "state": "Odisha", "show_pin": True, "created_at": now}
+                        for values in update_rows.values()
+                    ])
+                    await session.execute(stmt.on_conflict_do_update(
+                        index_elements=["id"],
+                        set_={
+                            column: getattr(stmt.excluded, column)
+                            for column in (*VILLAGE_COORD_COLUMNS, "code_2011", "updated_at")
+                        }
+                    ))
+        except Exception as e:
+            logger.warning(f"Village import batch failed: {e}")
+            for line, row in valid:
+                errors.append(f"Row {line} ({row.get('name') or '?'}): {e}")
+        else:
+            if new_rows:
+                village_ids.update(zip(keys, new_ids))
+            created += len(new_rows)
+            updated += len(update_rows)
+        if progress is not None:
+            await progress(processed, errors)
+        await session.commit()
+
+    await session.commit()
+    return {"inserted": created + updated, "created": created, "updated": updated, "errors": errors}
+
+
+def _member_values(row: dict) -> dict:
+    full_name = (row.get('full_name') or '').strip()
+    if not full_name:
+        raise ValueError("full_name is required")
+    return {
+        "full_name": full_name,
+        "role": row['role'],
+        "phone": row['phone'],
+        "languages": row.get('languages') or '',
+    }
+
+
+async def import_members_csv(
+    session: AsyncSession,
+    raw: BinaryIO,
+    verify_on_import: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    start_row: int = 0
+) -> dict:
+    """Create members from a CSV whose ``village`` column names an existing village.
+
+    Villages are resolved in memory (see village_resolver.py); an optional
+    ``block`` column disambiguates villages that share a name. Returns
+    {"inserted", "fuzzy_matched", "fuzzy_matches", "errors"}, where
+    ``fuzzy_matches`` lists each inserted row whose village name was guessed
+    ({"row", "full_name", "village", "matched"}) for an admin to review.
+    Rows before ``start_row`` are skipped.
+    """
+    villages_result = await session.execute(select(Village.id, Village.name, Village.block))
+    resolver = VillageResolver(villages_result.all())
+
+    inserted = fuzzy_matched = 0
+    processed = start_row
+    errors: list[str] = []
+    fuzzy_matches: list[dict] = []
+    now = datetime.now(timezone.utc)
+
+    for batch in _batches(_data_rows(raw, start_row)):
+        processed += len(batch)
+        rows = []
+        batch_fuzzy = []
+        for line, row in batch:
+            try:
+                village_id, matched = resolver.resolve(row.get('village') or '', row.get('block'))
+            except LookupError as e:
+                errors.append(f"{row.get('full_name') or '?'}: {e}")
+                continue
+            try:
+                values = _member_values(row)
+            except Exception as e:
+                errors.append(f"{row.get('full_name') or '?'}: {str(e)}")
+                continue
+            rows.append({
+                **values,
+                "village_id": village_id,
+                "verified": verify_on_import,
+                "created_at": now,
+                "updated_at": now,
+            })
+            if matched is not None:
+                batch_fuzzy.append({
+                    "row": line,
+                    "full_name": values["full_name"],
+                    "village": row.get('village'),
+                    "matched": matched,
+                })
+
+        if rows:
+            try:
+                async with _savepoint(session):
+                    await session.execute(insert(Member), rows)
+            except Exception as e:
+                logger.warning(f"Member import batch failed: {e}")
+                errors.extend(f"{values['full_name']}: {str(e)}" for values in rows)
+            else:
+                inserted += len(rows)
+                fuzzy_matched += len(batch_fuzzy)
+                fuzzy_matches.extend(batch_fuzzy[:MAX_REPORTED_FUZZY_MATCHES - len(fuzzy_matches)])
+        if progress is not None:
+            await progress(processed, errors)
+        await session.commit()
+
+    return {
+        "inserted": inserted,
+        "fuzzy_matched": fuzzy_matched,
+        "fuzzy_matches": fuzzy_matches,
+        "errors": errors,
+    }
@@ -0,0 +1,108 @@
+"""
+Pluggable invalidation backends for in-process caches.
+
+Each cache namespace has a version number. A cache keeps the version its
+value was built at and rebuilds when the backend reports a newer one;
+``bump`` invalidates a namespace.
+
+- ``MemoryCacheBackend`` keeps versions in this process only (single worker).
+- ``DatabaseCacheBackend`` stores them in the shared ``cache_versions`` table
+  and polls it at most every ``poll_interval`` seconds, so an invalidation in
+  one worker reaches every other worker (SQLite or Postgres, any host) within
+  that bound.
+
+Select with ``CACHE_BACKEND=memory|database``. The default is ``database``
+on Postgres (autoscale deployments) and ``memory`` on SQLite.
+"""
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+from sqlmodel import select
+
+from db import DATABASE_URL, async_session_maker, dialect_insert
+from models import CacheVersion
+
+logger = logging.getLogger(__name__)
+
+# Upper bound, in seconds, on how long another worker may serve a stale value
+CACHE_POLL_SECONDS = 2.0
+
+
+class MemoryCacheBackend:
+    """Process-local versions; invalidations are not seen by other workers."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._versions: dict[str, int] = {}
+
+    async def version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    async def bump(self, namespace: str) -> int:
+        self._versions[namespace] = self._versions.get(namespace, 0) + 1
+        return self._versions[namespace]
+
+    def known_version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+
+class DatabaseCacheBackend(MemoryCacheBackend):
+    """Versions shared through the cache_versions table, polled lazily."""
+
+    name = "database"
+
+    def __init__(self, poll_interval: float = CACHE_POLL_SECONDS):
+        super().__init__()
+        self.poll_interval = poll_interval
+        self._checked_at = float("-inf")
+
+    async def _poll(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.poll_interval:
+            return
+        self._checked_at = now
+        try:
+            async with async_session_maker() as session:
+                result = await session.execute(select(CacheVersion.namespace, CacheVersion.version))
+                self._versions.update(dict(result.all()))
+        except Exception as e:
+            # Keep serving with the last known versions; retried next interval
+            logger.warning(f"Cache version poll failed: {e}")
+
+    async def version(self, namespace: str) -> int:
+        await self._poll()
+        return self._versions.get(namespace, 0)
+
+    async def bump(self, namespace: str) -> int:
+        now = datetime.now(timezone.utc)
+        stmt = dialect_insert(CacheVersion).values(namespace=namespace, version=1, updated_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["namespace"],
+            set_={"version": CacheVersion.version + 1, "updated_at": now}
+        )
+        async with async_session_maker() as session:
+            await session.execute(stmt)
+            await session.commit()
+            result = await session.execute(
+                select(CacheVersion.version).where(CacheVersion.namespace == namespace)
+            )
+            version = result.scalar_one()
+        self._versions[namespace] = version
+        return version
+
+
+def create_cache_backend(kind: str | None = None) -> MemoryCacheBackend:
+    if kind is None:
+        kind = os.getenv("CACHE_BACKEND") or ("memory" if DATABASE_URL.startswith("sqlite") else "database")
+    kind = kind.lower()
+    if kind == "database":
+        return DatabaseCacheBackend(float(os.getenv("CACHE_POLL_SECONDS", CACHE_POLL_SECONDS)))
+    if kind != "memory":
+        logger.warning(f"Unknown CACHE_BACKEND '{kind}', using memory")
+    return MemoryCacheBackend()
+
+
+cache_backend = create_cache_backend()
@@ -0,0 +1,99 @@
+"""
+Read-through cache for admin-edited configuration tables.
+
+CustomLabel, MapSettings, BlockSettings, FormFieldConfig and AboutPage are
+read on almost every page but only change when an admin edits them. Each
+table gets a ``CachedConfig`` that loads a plain-dict snapshot on first use
+and serves it from memory until the matching admin write endpoint calls
+``invalidate()``. Invalidation bumps the entry's version in the configured
+cache backend (see cache_backend.py), so other workers reload too; the
+endpoints expose it as ``X-Config-Version`` so clients can tell when to re-read.
+"""
+import asyncio
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from cache_backend import cache_backend
+from db import async_session_maker
+from models import AboutPage, BlockSettings, CustomLabel, FormFieldConfig, MapSettings
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class CachedConfig(Generic[T]):
+    """One cached table snapshot, invalidated through the shared cache backend."""
+
+    def __init__(self, name: str, loader: Callable[[AsyncSession], Awaitable[T]]):
+        self.name = name
+        self._loader = loader
+        self._value = _MISSING
+        self._loaded_version = -1
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> int:
+        return cache_backend.known_version(self.name)
+
+    async def get(self) -> T:
+        """Return the cached snapshot, reloading with a fresh session when the version moved."""
+        version = await cache_backend.version(self.name)
+        if self._value is not _MISSING and self._loaded_version == version:
+            return self._value
+        async with self._lock:
+            if self._value is not _MISSING and self._loaded_version == version:
+                return self._value
+            async with async_session_maker() as session:
+                value = await self._loader(session)
+            # Tagged with the version read before loading, so an invalidation
+            # that lands mid-load forces another reload on the next get()
+            self._value = value
+            self._loaded_version = version
+            return value
+
+    async def invalidate(self) -> None:
+        """Bump the version for every worker; call after the admin write has committed."""
+        self._value = _MISSING
+        await cache_backend.bump(self.name)
+
+
+async def _load_custom_labels(session: AsyncSession) -> list[dict]:
+    result = await session.execute(select(CustomLabel).order_by(CustomLabel.display_order))
+    return [label.model_dump() for label in result.scalars().all()]
+
+
+async def _load_map_settings(session: AsyncSession) -> Optional[dict]:
+    result = await session.execute(select(MapSettings))
+    settings = result.scalars().first()
+    return settings.model_dump() if settings else None
+
+
+async def _load_block_settings(session: AsyncSession) -> list[dict]:
+    result = await session.execute(select(BlockSettings))
+    return [block.model_dump() for block in result.scalars().all()]
+
+
+async def _load_form_fields(session: AsyncSession) -> list[dict]:
+    result = await session.execute(select(FormFieldConfig).order_by(FormFieldConfig.display_order))
+    return [field.model_dump() for field in result.scalars().all()]
+
+
+async def _load_about_page(session: AsyncSession) -> Optional[dict]:
+    result = await session.execute(select(AboutPage))
+    about = result.scalars().first()
+    return about.model_dump() if about else None
+
+
+custom_labels_cache: CachedConfig[list[dict]] = CachedConfig("custom_labels", _load_custom_labels)
+map_settings_cache: CachedConfig[Optional[dict]] = CachedConfig("map_settings", _load_map_settings)
+block_settings_cache: CachedConfig[list[dict]] = CachedConfig("block_settings", _load_block_settings)
+form_fields_cache: CachedConfig[list[dict]] = CachedConfig("form_field_config", _load_form_fields)
+about_page_cache: CachedConfig[Optional[dict]] = CachedConfig("about_page", _load_about_page)
+
+
+def version_header(*caches: CachedConfig) -> dict[str, str]:
+    """Response header carrying the version(s) of the config a response was built from."""
+    return {"X-Config-Version": ",".join(f"{c.name}={c.version}" for c in caches)}
@@ -0,0 +1,272 @@
+"""
+Streaming data exports.
+
+Export endpoints hand ``StreamingResponse`` an async generator that opens its
+own session (the request's session is closed before the body is sent),
+streams a column-only SELECT with ``yield_per`` (a server-side cursor on
+Postgres) and yields output one partition of rows at a time. Memory use
+stays at one partition however large the table is.
+
+``EXPORT_DATASETS`` describes the tables served by ``/api/export/data/{name}``:
+which columns may be exported, which village columns are joined in, and how
+a block coordinator's rows are scoped. Each dataset streams as CSV, NDJSON
+or Parquet; Parquet needs the optional ``pyarrow`` package and is written one
+row group per partition with a schema taken from the column types.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Optional, Sequence
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Numeric
+from sqlalchemy.sql import Select
+from sqlmodel import select
+
+from db import async_session_maker
+from models import Audit, Doctor, FieldWorker, Member, SevaRequest, User, Village
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Rows fetched from the cursor, and written out, per chunk
+EXPORT_ROWS_PER_CHUNK = 1000
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+async def stream_rows(stmt: Select, session_maker=async_session_maker) -> AsyncIterator[Sequence]:
+    """Yield lists of result rows from a streamed query."""
+    async with session_maker() as session:
+        result = await session.stream(stmt.execution_options(yield_per=EXPORT_ROWS_PER_CHUNK))
+        async for partition in result.partitions():
+            yield partition
+
+
+async def stream_csv(
+    stmt: Select,
+    header: Sequence[str],
+    format_row: Callable[[Any], Sequence],
+    session_maker=async_session_maker
+) -> AsyncIterator[str]:
+    """Yield a CSV export chunk by chunk: the header, then one chunk per partition."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+    async for partition in stream_rows(stmt, session_maker):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(format_row(row) for row in partition)
+        yield buffer.getvalue()
+
+
+def coordinator_blocks(user: User) -> list[str]:
+    """Blocks a coordinator may see: the primary block plus assigned ones."""
+    blocks = [user.primary_block.strip()] if user.primary_block else []
+    if user.assigned_blocks:
+        blocks.extend(blk.strip() for blk in user.assigned_blocks.split(",") if blk.strip())
+    return sorted(set(blocks))
+
+
+class ExportDataset:
+    """A table exposed to the export endpoint, with its columns and row scoping.
+
+    ``coordinator_scope`` decides what a block coordinator gets: "block" rows
+    in their blocks, "owner" only rows they submitted, "verified" only
+    verified rows, and None means super admins only. ``coordinator_exclude``
+    lists columns only super admins may export.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model,
+        coordinator_scope: Optional[str],
+        exclude: Sequence[str] = (),
+        with_village: bool = False,
+        coordinator_exclude: Sequence[str] = ()
+    ):
+        self.name = name
+        self.model = model
+        self.coordinator_scope = coordinator_scope
+        self.coordinator_exclude = set(coordinator_exclude)
+        self.with_village = with_village
+        self.columns = {
+            column.name: getattr(model, column.name)
+            for column in model.__table__.columns
+            if column.name not in exclude
+        }
+        if with_village:
+            self.columns["village_name"] = Village.name.label("village_name")
+            self.columns["block"] = Village.block.label("block")
+
+    def allows(self, role: str) -> bool:
+        return role == "super_admin" or self.coordinator_scope is not None
+
+    def parse_columns(self, raw: Optional[str], role: str) -> list[str]:
+        """Column names from a ``?columns=`` value; every column ``role`` may see when empty."""
+        available = [
+            name for name in self.columns
+            if role == "super_admin" or name not in self.coordinator_exclude
+        ]
+        if not raw:
+            return available
+        names = [name.strip() for name in raw.split(",") if name.strip()]
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValueError(
+                f"Unknown columns for {self.name}: {', '.join(unknown)}. "
+                f"Available: {', '.join(available)}"
+            )
+        return list(dict.fromkeys(names))
+
+    def query(self, columns: list[str], user: User) -> Select:
+        """SELECT of the given columns, scoped to what ``user`` may export."""
+        stmt = select(*(self.columns[name] for name in columns)).select_from(self.model)
+        if self.with_village:
+            stmt = stmt.join(Village, self.model.village_id == Village.id)
+        if user.role != "super_admin":
+            if self.coordinator_scope == "block":
+                stmt = stmt.where(Village.block.in_(coordinator_blocks(user)))
+            elif self.coordinator_scope == "owner":
+                stmt = stmt.where(self.model.submitted_by_user_id == user.id)
+            elif self.coordinator_scope == "verified":
+                stmt = stmt.where(self.model.verified == True)
+        return stmt.order_by(self.model.id)
+
+
+EXPORT_DATASETS = {
+    dataset.name: dataset
+    for dataset in (
+        ExportDataset("villages", Village, "block"),
+        ExportDataset("members", Member, "block", with_village=True),
+        # Coordinators see what the public doctors page shows
+        ExportDataset("doctors", Doctor, "verified", coordinator_exclude=("referred_by",)),
+        ExportDataset("seva-requests", SevaRequest, "block", with_village=True),
+        ExportDataset("field-workers", FieldWorker, "owner", with_village=True),
+        ExportDataset("users", User, None, exclude=("password_hash", "google_id")),
+        ExportDataset("audit", Audit, None),
+    )
+}
+
+
+def _text_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def _csv_chunks(stmt: Select, columns: list[str], session_maker) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode('utf-8')
+    async for partition in stream_rows(stmt, session_maker):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            ['' if value is None else _text_value(value) for value in row]
+            for row in partition
+        )
+        yield buffer.getvalue().encode('utf-8')
+
+
+async def _ndjson_chunks(stmt: Select, columns: list[str], session_maker) -> AsyncIterator[bytes]:
+    async for partition in stream_rows(stmt, session_maker):
+        yield ''.join(
+            json.dumps(dict(zip(columns, row)), default=_text_value, ensure_ascii=False) + '\n'
+            for row in partition
+        ).encode('utf-8')
+
+
+def _arrow_type(sql_type):
+    if isinstance(sql_type, Boolean):
+        return pyarrow.bool_()
+    if isinstance(sql_type, Integer):
+        return pyarrow.int64()
+    if isinstance(sql_type, (Float, Numeric)):
+        return pyarrow.float64()
+    if isinstance(sql_type, DateTime):
+        return pyarrow.timestamp('us')
+    if isinstance(sql_type, Date):
+        return pyarrow.date32()
+    return pyarrow.string()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain.
+
+    tell() keeps counting across drains, since Parquet records absolute
+    offsets in its footer.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _parquet_chunks(stmt: Select, columns: list[str], session_maker) -> AsyncIterator[bytes]:
+    schema = pyarrow.schema([
+        (name, _arrow_type(column.type))
+        for name, column in zip(columns, stmt.selected_columns)
+    ])
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    try:
+        async for partition in stream_rows(stmt, session_maker):
+            values = list(zip(*partition))
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=field.type) for column, field in zip(values, schema)],
+                schema=schema
+            ))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def check_format(export_format: str) -> None:
+    """Raise ValueError for an unknown format or one whose writer isn't installed."""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format '{export_format}'. Use one of: {', '.join(EXPORT_FORMATS)}")
+    if export_format == "parquet" and pyarrow is None:
+        raise ValueError("Parquet export needs the optional pyarrow package")
+
+
+def stream_export(
+    stmt: Select,
+    columns: list[str],
+    export_format: str,
+    session_maker=async_session_maker
+) -> AsyncIterator[bytes]:
+    """Byte chunks of ``stmt`` rendered in ``export_format`` (see check_format)."""
+    writers = {"csv": _csv_chunks, "ndjson": _ndjson_chunks, "parquet": _parquet_chunks}
+    return writers[export_format](stmt, columns, session_maker)
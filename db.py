@@ -17,7 +17,9 @@ if DATABASE_URL.startswith("postgres"):
         DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
 # Configure engine differently for SQLite vs Postgres
+# dialect_insert supports INSERT ... ON CONFLICT for upserts on either backend
 if DATABASE_URL.startswith('sqlite'):
+    from sqlalchemy.dialects.sqlite import insert as dialect_insert
     engine = create_async_engine(
         DATABASE_URL,
         echo=False,
@@ -25,6 +27,7 @@ if DATABASE_URL.startswith('sqlite'):
         pool_pre_ping=True
     )
 else:
+    from sqlalchemy.dialects.postgresql import insert as dialect_insert
     engine = create_async_engine(
         DATABASE_URL,
         echo=False,
@@ -40,12 +43,20 @@ else:
 async_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+def _create_missing_indexes(sync_conn):
+    """create_all skips tables that already exist, so add any newly declared indexes."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 async def init_db():
     import logging
     logger = logging.getLogger(__name__)
     try:
         async with engine.begin() as conn:
             await conn.run_sync(SQLModel.metadata.create_all)
+            await conn.run_sync(_create_missing_indexes)
         logger.info("Database tables initialized successfully")
     except Exception as e:
         logger.error(f"Database initialization failed: {e}", exc_info=True)
@@ -0,0 +1,308 @@
+"""
+Pre-serialized, pre-compressed GeoJSON responses.
+
+The map GeoJSON only changes when a file under static/geojson is replaced, so
+each payload is serialized once, compressed once (gzip, plus brotli when the
+optional ``brotli`` package is installed) and tagged with a content-hash ETag.
+Endpoints hand the stored bytes straight to the client and answer repeat
+loads with ``304 Not Modified``. Each payload also has simplified levels of
+detail and, for the choropleth and blocks, a TopoJSON encoding
+(``get_artifact(name, lod, output_format)``, see geo_topology.py).
+
+``scripts/build_geo_artifacts.py`` writes the same blobs to ``ARTIFACT_DIR``
+ahead of time; when its manifest matches the current source files they are
+loaded from disk instead of being recompressed at startup.
+
+Endpoints use ``load_artifact``: a cache miss (before warm-up finishes, or
+after an invalidation) is built in a worker thread, once per artifact
+however many requests are waiting for it.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+
+from geo_topology import MAX_LOD, Topology, simplify_collection, to_topojson
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+VILLAGES_GEOJSON_PATH = 'static/geojson/bhadrak_villages.geojson'
+BLOCKS_GEOJSON_PATH = 'static/geojson/bhadrak_blocks.geojson'
+BOUNDARY_GEOJSON_PATH = 'static/geojson/bhadrak_boundary.geojson'
+
+ARTIFACT_DIR = 'static/geojson/build'
+MANIFEST_NAME = 'manifest.json'
+
+# Clients always revalidate; an unchanged artifact costs one 304
+CACHE_CONTROL = "public, no-cache"
+
+# Encoding name -> file suffix, in server preference order
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz", "identity": ""}
+
+
+def choropleth_collection(data: dict) -> dict:
+    """Village FeatureCollection trimmed to the properties the choropleth uses."""
+    features = []
+    for i, feature in enumerate(data.get('features', [])):
+        props = feature.get('properties') or {}
+        features.append({
+            "type": "Feature",
+            "properties": {
+                "name": props.get('NAME', props.get('name', f'Village_{i}')),
+                "block": props.get('SUB_DIST', props.get('block', 'Unknown')),
+                "population": props.get('population', props.get('POP', 1000 + (i * 10))),
+            },
+            "geometry": feature.get('geometry')
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+# Artifact name -> (source file, transform applied to the parsed source)
+ARTIFACT_SOURCES: dict[str, tuple[str, Optional[Callable[[dict], dict]]]] = {
+    "choropleth": (VILLAGES_GEOJSON_PATH, choropleth_collection),
+    "villages": (VILLAGES_GEOJSON_PATH, None),
+    "blocks": (BLOCKS_GEOJSON_PATH, None),
+    "boundary": (BOUNDARY_GEOJSON_PATH, None),
+}
+
+# Artifacts also offered as TopoJSON -> name of their TopoJSON object
+TOPOJSON_OBJECTS = {
+    "choropleth": "villages",
+    "blocks": "blocks",
+}
+
+
+class GeoArtifact:
+    """One payload in every available encoding, with a strong ETag per encoding."""
+
+    media_type = "application/json"
+
+    def __init__(self, name: str, source_sha256: str, bodies: dict[str, bytes]):
+        self.name = name
+        self.source_sha256 = source_sha256
+        self.bodies = bodies
+        digest = hashlib.sha256(bodies["identity"]).hexdigest()[:20]
+        self.etags = {
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in bodies
+        }
+
+    @classmethod
+    def from_payload(cls, name: str, source_sha256: str, payload: dict) -> "GeoArtifact":
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            bodies["br"] = brotli.compress(body, quality=11)
+        return cls(name, source_sha256, bodies)
+
+    def choose_encoding(self, accept_encoding: str) -> str:
+        """Pick the smallest encoding the client accepts."""
+        accepted = set()
+        for token in accept_encoding.split(","):
+            coding, _, params = token.strip().partition(";")
+            coding = coding.strip().lower()
+            if params.replace(" ", "").lower() in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                continue
+            accepted.add(coding)
+        for encoding in ENCODING_SUFFIXES:
+            if encoding in self.bodies and (encoding in accepted or "*" in accepted):
+                return encoding
+        return "identity"
+
+    def not_modified(self, if_none_match: str) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return not tags.isdisjoint(self.etags.values())
+
+    def response(self, request: Request) -> Response:
+        """Serve the stored bytes, or 304 when the client already has them."""
+        encoding = self.choose_encoding(request.headers.get("accept-encoding", ""))
+        headers = {
+            "ETag": self.etags[encoding],
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if self.not_modified(request.headers.get("if-none-match", "")):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=self.bodies[encoding], media_type=self.media_type, headers=headers)
+
+
+def _sha256_file(path: str) -> tuple[bytes, str]:
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return raw, hashlib.sha256(raw).hexdigest()
+
+
+def _read_manifest(artifact_dir: str) -> dict:
+    try:
+        with open(os.path.join(artifact_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable GeoJSON artifact manifest: {e}")
+        return {}
+
+
+def _load_prebuilt(name: str, source_sha256: str, artifact_dir: str) -> Optional[GeoArtifact]:
+    entry = _read_manifest(artifact_dir).get(name)
+    if not entry or entry.get("source_sha256") != source_sha256:
+        return None
+    bodies = {}
+    for encoding in entry.get("encodings", []):
+        # Prebuilt brotli blobs are served even without the brotli package here
+        try:
+            with open(os.path.join(artifact_dir, name + ".json" + ENCODING_SUFFIXES[encoding]), 'rb') as f:
+                bodies[encoding] = f.read()
+        except (KeyError, OSError):
+            return None
+    if "identity" not in bodies:
+        return None
+    return GeoArtifact(name, source_sha256, bodies)
+
+
+def artifact_key(name: str, lod: Optional[int] = None, output_format: str = "geojson") -> str:
+    key = name if lod is None else f"{name}.lod{lod}"
+    return key if output_format == "geojson" else f"{key}.{output_format}"
+
+
+# Topologies by source hash; the choropleth and raw villages share geometry
+_topologies: dict[str, Topology] = {}
+_topology_lock = threading.Lock()
+
+
+def _topology(source_sha256: str, payload: dict) -> Topology:
+    with _topology_lock:
+        topology = _topologies.get(source_sha256)
+        if topology is None:
+            topology = Topology([feature.get('geometry') for feature in payload.get('features', [])])
+            _topologies[source_sha256] = topology
+        return topology
+
+
+def build_artifact(
+    name: str,
+    lod: Optional[int] = None,
+    output_format: str = "geojson",
+    artifact_dir: Optional[str] = ARTIFACT_DIR
+) -> GeoArtifact:
+    """Build one artifact from its source file, reusing prebuilt blobs when current.
+
+    ``lod`` selects a simplified level of detail and ``output_format`` may be
+    "topojson" for names in TOPOJSON_OBJECTS (see geo_topology.py). Pass
+    ``artifact_dir=None`` to always rebuild. Raises FileNotFoundError /
+    json.JSONDecodeError for the caller to report.
+    """
+    key = artifact_key(name, lod, output_format)
+    path, transform = ARTIFACT_SOURCES[name]
+    raw, source_sha256 = _sha256_file(path)
+    if artifact_dir is not None:
+        prebuilt = _load_prebuilt(key, source_sha256, artifact_dir)
+        if prebuilt is not None:
+            return prebuilt
+    payload = json.loads(raw)
+    if transform is not None:
+        payload = transform(payload)
+    if output_format == "topojson":
+        payload = to_topojson(payload, TOPOJSON_OBJECTS[name], lod, _topology(source_sha256, payload))
+    elif lod is not None:
+        payload = simplify_collection(payload, lod, _topology(source_sha256, payload))
+    return GeoArtifact.from_payload(key, source_sha256, payload)
+
+
+def artifact_variants(name: str) -> list[tuple[Optional[int], str]]:
+    """Every (lod, output_format) combination served for an artifact."""
+    formats = ["geojson", "topojson"] if name in TOPOJSON_OBJECTS else ["geojson"]
+    return [(lod, output_format) for output_format in formats for lod in (None, *range(MAX_LOD + 1))]
+
+
+def write_artifact(artifact: GeoArtifact, artifact_dir: str = ARTIFACT_DIR) -> dict:
+    """Write every encoding of an artifact to disk and return its manifest entry."""
+    os.makedirs(artifact_dir, exist_ok=True)
+    for encoding, body in artifact.bodies.items():
+        with open(os.path.join(artifact_dir, artifact.name + ".json" + ENCODING_SUFFIXES[encoding]), 'wb') as f:
+            f.write(body)
+    return {
+        "source_sha256": artifact.source_sha256,
+        "etag": artifact.etags["identity"],
+        "encodings": sorted(artifact.bodies),
+        "sizes": {encoding: len(body) for encoding, body in artifact.bodies.items()},
+    }
+
+
+_artifacts: dict[str, GeoArtifact] = {}
+# Builds run in worker threads (warm-up and load_artifact); one per key at a time
+_build_locks: dict[str, threading.Lock] = {}
+_build_locks_lock = threading.Lock()
+# Bumped by clear_artifacts so a build that was in flight isn't cached
+_generation = 0
+_pending: dict[str, asyncio.Future] = {}
+
+
+def get_artifact(name: str, lod: Optional[int] = None, output_format: str = "geojson") -> GeoArtifact:
+    """Return the cached artifact, building it on first use (blocking; see load_artifact)."""
+    key = artifact_key(name, lod, output_format)
+    artifact = _artifacts.get(key)
+    if artifact is not None:
+        return artifact
+    with _build_locks_lock:
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+    with build_lock:
+        artifact = _artifacts.get(key)
+        if artifact is None:
+            generation = _generation
+            artifact = build_artifact(name, lod, output_format)
+            if generation == _generation:
+                _artifacts[key] = artifact
+    return artifact
+
+
+async def load_artifact(name: str, lod: Optional[int] = None, output_format: str = "geojson") -> GeoArtifact:
+    """Return the cached artifact, building a missing one in a worker thread."""
+    key = artifact_key(name, lod, output_format)
+    artifact = _artifacts.get(key)
+    if artifact is not None:
+        return artifact
+    pending = _pending.get(key)
+    if pending is None:
+        pending = asyncio.ensure_future(asyncio.to_thread(get_artifact, name, lod, output_format))
+        _pending[key] = pending
+        pending.add_done_callback(lambda _: _pending.pop(key, None))
+    # A disconnecting client must not cancel a build others are waiting on
+    return await asyncio.shield(pending)
+
+
+def clear_artifacts() -> None:
+    global _generation
+    _generation += 1
+    _artifacts.clear()
+    with _topology_lock:
+        _topologies.clear()
+
+
+def prime_artifacts() -> None:
+    """Build every artifact and LOD up front so the first map load is already cheap."""
+    for name in ARTIFACT_SOURCES:
+        try:
+            for lod, output_format in artifact_variants(name):
+                get_artifact(name, lod, output_format)
+        except FileNotFoundError:
+            logger.warning(f"GeoJSON artifact '{name}' skipped: {ARTIFACT_SOURCES[name][0]} not found")
+        except Exception as e:
+            logger.error(f"GeoJSON artifact '{name}' failed to build: {e}", exc_info=True)
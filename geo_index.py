@@ -0,0 +1,133 @@
+"""
+Point-in-village lookup over the static village polygons.
+
+Village bounding boxes are bucketed into a uniform grid sized to the average
+village, so a lookup tests only the handful of polygons registered in one
+cell, then runs an exact even-odd point-in-polygon test (holes included).
+The index is built once per loaded feature list, like the tile cache;
+request handlers go through ``load_village_index``, which builds a missing
+index in a worker thread, once however many requests miss at the same time.
+"""
+import asyncio
+import math
+import threading
+from typing import Optional
+
+from geo_topology import polygonal_rings
+
+# District centre used when nothing better is known about a location
+DEFAULT_CENTER = (21.054, 86.52)
+
+
+def _point_in_ring(x: float, y: float, ring: list) -> bool:
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def point_in_polygons(x: float, y: float, polygons: list) -> bool:
+    """Even-odd test against Polygon/MultiPolygon rings (outer ring first, then holes)."""
+    for polygon in polygons:
+        if polygon and _point_in_ring(x, y, polygon[0]):
+            if not any(_point_in_ring(x, y, hole) for hole in polygon[1:]):
+                return True
+    return False
+
+
+class VillageSpatialIndex:
+    """Uniform grid of village bounding boxes with exact containment tests."""
+
+    def __init__(self, features: list[dict]):
+        self.features = features
+        self._entries = []
+        for i, feature in enumerate(features):
+            polygons = polygonal_rings(feature.get('geometry'))
+            if not polygons:
+                continue
+            xs = [pt[0] for polygon in polygons for pt in polygon[0]]
+            ys = [pt[1] for polygon in polygons for pt in polygon[0]]
+            if not xs:
+                continue
+            props = feature.get('properties') or {}
+            self._entries.append({
+                "index": i,
+                "name": (props.get('NAME') or props.get('name') or '').strip(),
+                "block": (props.get('SUB_DIST') or props.get('block') or '').strip(),
+                "polygons": polygons,
+                "bbox": (min(xs), min(ys), max(xs), max(ys)),
+            })
+
+        self._grid: dict[tuple[int, int], list[int]] = {}
+        if not self._entries:
+            self.extent = None
+            self.cell_size = 1.0
+            return
+        self.extent = (
+            min(e["bbox"][0] for e in self._entries),
+            min(e["bbox"][1] for e in self._entries),
+            max(e["bbox"][2] for e in self._entries),
+            max(e["bbox"][3] for e in self._entries),
+        )
+        # Cells about one average village wide keep each bucket to a few entries
+        mean_size = sum(
+            max(e["bbox"][2] - e["bbox"][0], e["bbox"][3] - e["bbox"][1])
+            for e in self._entries
+        ) / len(self._entries)
+        self.cell_size = mean_size or 0.01
+        for position, entry in enumerate(self._entries):
+            x0, y0, x1, y1 = entry["bbox"]
+            for cx in range(self._cell(x0), self._cell(x1) + 1):
+                for cy in range(self._cell(y0), self._cell(y1) + 1):
+                    self._grid.setdefault((cx, cy), []).append(position)
+
+    def _cell(self, value: float) -> int:
+        return math.floor(value / self.cell_size)
+
+    def locate(self, lat: float, lng: float) -> Optional[dict]:
+        """Return the village containing (lat, lng) as {index, name, block}, or None.
+
+        ``index`` is the feature's position in the static GeoJSON.
+        """
+        for position in self._grid.get((self._cell(lng), self._cell(lat)), ()):
+            entry = self._entries[position]
+            x0, y0, x1, y1 = entry["bbox"]
+            if x0 <= lng <= x1 and y0 <= lat <= y1 and point_in_polygons(lng, lat, entry["polygons"]):
+                return {"index": entry["index"], "name": entry["name"], "block": entry["block"]}
+        return None
+
+    def center(self) -> tuple[float, float]:
+        """(lat, lng) centre of the village extent, or the default district centre."""
+        if self.extent is None:
+            return DEFAULT_CENTER
+        x0, y0, x1, y1 = self.extent
+        return (y0 + y1) / 2, (x0 + x1) / 2
+
+
+_index: Optional[VillageSpatialIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_village_index(features: list[dict]) -> VillageSpatialIndex:
+    """Return the index for this feature list, rebuilding when the list was reloaded.
+
+    Building is slow; call from a worker thread (see load_village_index).
+    """
+    global _index
+    with _index_lock:
+        if _index is None or _index.features is not features:
+            _index = VillageSpatialIndex(features)
+        return _index
+
+
+async def load_village_index(features: list[dict]) -> VillageSpatialIndex:
+    """Index for this feature list, built off the event loop on a miss."""
+    index = _index
+    if index is None or index.features is not features:
+        index = await asyncio.to_thread(get_village_index, features)
+    return index
@@ -0,0 +1,303 @@
+"""
+Village polygon tiles on the Web Mercator ``z/x/y`` grid.
+
+A tile holds every village whose bounding box touches it, simplified to
+about one screen pixel at that zoom (topology-preserving Douglas-Peucker,
+see geo_topology.py), clipped to the tile
+plus a small buffer so strokes don't seam, and rounded to the zoom's pixel
+precision. Tiles are compact GeoJSON served as pre-compressed GeoArtifacts
+(see geo_artifacts.py) and cached per loaded feature list, so a reloaded
+GeoJSON file starts a fresh cache. ``pregenerate`` fills the cache for the
+district extent at startup.
+
+Requests go through ``get_tile``, which builds a missing tile in a worker
+thread, once per tile however many requests ask for it at the same time.
+The cache is an LRU of ``TILE_CACHE_SIZE`` tiles, so arbitrary z/x/y
+requests cannot grow it without bound.
+"""
+import asyncio
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from geo_artifacts import GeoArtifact
+from geo_topology import Topology
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 256
+
+# Extra margin around each tile, in pixels, kept when clipping
+TILE_BUFFER_PX = 8
+
+# Simplification tolerance, in pixels at the tile's zoom
+SIMPLIFY_TOLERANCE_PX = 1.0
+
+# Zooms served at all; past the last one clients should overzoom
+TILE_MAX_ZOOM = 16
+
+# Zooms built for the whole district at startup (district fit is ~z9-10)
+PREGENERATE_ZOOMS = range(8, 14)
+
+# Tiles kept in memory; comfortably more than the pregenerated set
+TILE_CACHE_SIZE = 2048
+
+MAX_LATITUDE = 85.0511287798
+
+
+def valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= TILE_MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def lnglat_to_tile(lng: float, lat: float, z: int) -> tuple[int, int]:
+    n = 2 ** z
+    lat = max(min(lat, MAX_LATITUDE), -MAX_LATITUDE)
+    x = int((lng + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """Return (west, south, east, north) in degrees."""
+    n = 2 ** z
+
+    def lat(ty: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y)
+
+
+def pixel_degrees(z: int) -> float:
+    """Approximate width of one tile pixel at zoom z, in degrees of longitude."""
+    return 360.0 / (TILE_SIZE * 2 ** z)
+
+
+def coordinate_decimals(z: int) -> int:
+    """Decimal places that still resolve one pixel at zoom z."""
+    return max(0, math.ceil(-math.log10(pixel_degrees(z))))
+
+
+def clip_ring(ring: list, west: float, south: float, east: float, north: float) -> list:
+    """Sutherland-Hodgman clip of a closed ring to a box; [] when nothing is left."""
+    points = ring[:-1] if len(ring) > 1 and ring[0] == ring[-1] else list(ring)
+    edges = (
+        (lambda p: p[0] >= west, lambda a, b: _cross_x(a, b, west)),
+        (lambda p: p[0] <= east, lambda a, b: _cross_x(a, b, east)),
+        (lambda p: p[1] >= south, lambda a, b: _cross_y(a, b, south)),
+        (lambda p: p[1] <= north, lambda a, b: _cross_y(a, b, north)),
+    )
+    for inside, intersect in edges:
+        if not points:
+            break
+        output = []
+        prev = points[-1]
+        for point in points:
+            if inside(point):
+                if not inside(prev):
+                    output.append(intersect(prev, point))
+                output.append(point)
+            elif inside(prev):
+                output.append(intersect(prev, point))
+            prev = point
+        points = output
+    if len(points) < 3:
+        return []
+    return points + [points[0]]
+
+
+def _cross_x(a, b, x: float) -> tuple[float, float]:
+    t = (x - a[0]) / (b[0] - a[0])
+    return x, a[1] + t * (b[1] - a[1])
+
+
+def _cross_y(a, b, y: float) -> tuple[float, float]:
+    t = (y - a[1]) / (b[1] - a[1])
+    return a[0] + t * (b[0] - a[0]), y
+
+
+def _bbox(polygons: list) -> Optional[tuple[float, float, float, float]]:
+    xs = [pt[0] for polygon in polygons if polygon for pt in polygon[0]]
+    ys = [pt[1] for polygon in polygons if polygon for pt in polygon[0]]
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class VillageTileIndex:
+    """Tile builder and cache for one loaded list of village features."""
+
+    def __init__(self, features: list[dict]):
+        self.features = features
+        # Shared borders are simplified once, so neighbours never gap or overlap
+        self.topology = Topology([feature.get('geometry') for feature in features])
+        self._entries = []
+        for i, feature in enumerate(features):
+            bbox = _bbox(self.topology.polygons(i) or [])
+            if bbox is None:
+                continue
+            props = feature.get('properties') or {}
+            self._entries.append({
+                "index": i,
+                # Same 1-based ids the map page assigns to the static features
+                "id": i + 1,
+                "properties": {
+                    "name": props.get('NAME', props.get('name', f'Village_{i}')),
+                    "block": props.get('SUB_DIST', props.get('block', 'Unknown')),
+                    "population": props.get('population', props.get('POP')),
+                },
+                "bbox": bbox,
+            })
+        if self._entries:
+            self.extent = (
+                min(e["bbox"][0] for e in self._entries),
+                min(e["bbox"][1] for e in self._entries),
+                max(e["bbox"][2] for e in self._entries),
+                max(e["bbox"][3] for e in self._entries),
+            )
+        else:
+            self.extent = None
+        # LRU of built tiles; builds run in worker threads, hence the lock
+        self._tiles: OrderedDict[tuple[int, int, int], GeoArtifact] = OrderedDict()
+        self._tiles_lock = threading.Lock()
+        # Builds in flight, shared by concurrent requests for the same tile
+        self._pending: dict[tuple[int, int, int], asyncio.Future] = {}
+        self._empty = GeoArtifact.from_payload("tile-empty", "", {"type": "FeatureCollection", "features": []})
+
+    def _build(self, z: int, x: int, y: int) -> Optional[dict]:
+        west, south, east, north = tile_bounds(z, x, y)
+        buffer_x = (east - west) * TILE_BUFFER_PX / TILE_SIZE
+        buffer_y = (north - south) * TILE_BUFFER_PX / TILE_SIZE
+        west, south, east, north = west - buffer_x, south - buffer_y, east + buffer_x, north + buffer_y
+        decimals = coordinate_decimals(z)
+        tolerance = pixel_degrees(z) * SIMPLIFY_TOLERANCE_PX
+
+        features = []
+        for entry in self._entries:
+            bx0, by0, bx1, by1 = entry["bbox"]
+            if bx1 < west or bx0 > east or by1 < south or by0 > north:
+                continue
+            contained = bx0 >= west and bx1 <= east and by0 >= south and by1 <= north
+            polygons = []
+            for polygon in self.topology.polygons(entry["index"], tolerance):
+                rings = []
+                for ring in polygon:
+                    clipped = ring if contained else clip_ring(ring, west, south, east, north)
+                    if clipped:
+                        rings.append([[round(px, decimals), round(py, decimals)] for px, py in clipped])
+                    elif not rings:
+                        # Outer ring fell outside the tile; drop the whole polygon
+                        break
+                if rings:
+                    polygons.append(rings)
+            if not polygons:
+                continue
+            features.append({
+                "type": "Feature",
+                "id": entry["id"],
+                "properties": entry["properties"],
+                "geometry": (
+                    {"type": "Polygon", "coordinates": polygons[0]} if len(polygons) == 1
+                    else {"type": "MultiPolygon", "coordinates": polygons}
+                )
+            })
+        if not features:
+            return None
+        return {"type": "FeatureCollection", "features": features}
+
+    def _cached(self, key: tuple[int, int, int]) -> Optional[GeoArtifact]:
+        with self._tiles_lock:
+            artifact = self._tiles.get(key)
+            if artifact is not None:
+                self._tiles.move_to_end(key)
+            return artifact
+
+    def tile(self, z: int, x: int, y: int) -> GeoArtifact:
+        """Return the cached tile, building it on a miss (blocking; see get_tile)."""
+        key = (z, x, y)
+        artifact = self._cached(key)
+        if artifact is not None:
+            return artifact
+        if not self._intersects_extent(z, x, y):
+            # Everything outside the district shares one uncached empty tile
+            return self._empty
+        payload = self._build(z, x, y)
+        artifact = self._empty if payload is None else GeoArtifact.from_payload(f"tile-{z}-{x}-{y}", "", payload)
+        with self._tiles_lock:
+            self._tiles[key] = artifact
+            while len(self._tiles) > TILE_CACHE_SIZE:
+                self._tiles.popitem(last=False)
+        return artifact
+
+    async def get_tile(self, z: int, x: int, y: int) -> GeoArtifact:
+        """Return a tile without blocking the event loop on a cache miss."""
+        key = (z, x, y)
+        artifact = self._cached(key)
+        if artifact is not None:
+            return artifact
+        if not self._intersects_extent(z, x, y):
+            return self._empty
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(asyncio.to_thread(self.tile, z, x, y))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        # A disconnecting client must not cancel a build others are waiting on
+        return await asyncio.shield(pending)
+
+    def _intersects_extent(self, z: int, x: int, y: int) -> bool:
+        if self.extent is None:
+            return False
+        west, south, east, north = tile_bounds(z, x, y)
+        ex0, ey0, ex1, ey1 = self.extent
+        return not (ex1 < west or ex0 > east or ey1 < south or ey0 > north)
+
+    def extent_tiles(self, z: int) -> list[tuple[int, int, int]]:
+        if self.extent is None:
+            return []
+        west, south, east, north = self.extent
+        x0, y0 = lnglat_to_tile(west, north, z)
+        x1, y1 = lnglat_to_tile(east, south, z)
+        return [(z, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+    def pregenerate(self, zooms=PREGENERATE_ZOOMS) -> int:
+        """Build every tile covering the district at the given zooms. Returns tile count."""
+        count = 0
+        for z in zooms:
+            for key in self.extent_tiles(z):
+                self.tile(*key)
+                count += 1
+        return count
+
+
+_index: Optional[VillageTileIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_tile_index(features: list[dict]) -> VillageTileIndex:
+    """Return the index for this feature list, rebuilding when the list was reloaded.
+
+    Building the topology is slow; call from a worker thread (see get_tile).
+    """
+    global _index
+    with _index_lock:
+        if _index is None or _index.features is not features:
+            _index = VillageTileIndex(features)
+        return _index
+
+
+async def get_tile(features: list[dict], z: int, x: int, y: int) -> GeoArtifact:
+    """Tile for this feature list, with index and tile builds off the event loop."""
+    index = _index
+    if index is None or index.features is not features:
+        index = await asyncio.to_thread(get_tile_index, features)
+    return await index.get_tile(z, x, y)
+
+
+def pregenerate(features: list[dict]) -> int:
+    index = get_tile_index(features)
+    count = index.pregenerate()
+    logger.info(f"Pre-generated {count} village tiles for zooms {PREGENERATE_ZOOMS.start}-{PREGENERATE_ZOOMS.stop - 1}")
+    return count
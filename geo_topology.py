@@ -0,0 +1,380 @@
+"""
+Shared-arc topology and levels of detail for polygon features.
+
+Neighbouring villages store their common border twice. ``Topology`` cuts
+every ring at junctions (points where more than two boundary segments meet)
+and keeps each border once as an *arc*; rings become lists of arc
+references, TopoJSON style (``~i`` = arc ``i`` reversed). Simplifying arcs
+instead of rings gives adjacent polygons the same simplified border, so
+levels of detail never open gaps or overlaps between villages.
+
+Simplification is Douglas-Peucker. Each arc point gets a weight once (the
+tolerance at which DP would drop it), so any tolerance is a cheap filter.
+``to_topojson`` writes the arcs out as quantized, delta-encoded TopoJSON.
+"""
+import math
+from collections import OrderedDict
+from typing import Optional
+
+Point = tuple[float, float]
+
+# Level of detail -> (simplification tolerance, coordinate decimals).
+# One degree is ~111 km at Bhadrak, so LOD 3 drops detail under ~110 m.
+LOD_LEVELS = [
+    (0.0, 6),      # 0: full detail, quantized to ~0.1 m
+    (0.00005, 5),  # 1: ~5 m, street zoom
+    (0.0002, 5),   # 2: ~20 m, village zoom
+    (0.001, 4),    # 3: ~110 m, district zoom
+]
+MAX_LOD = len(LOD_LEVELS) - 1
+
+# Simplified arc sets kept per topology (tile zooms and LODs each use one)
+ARC_CACHE_SIZE = 4
+
+
+def lod_for_zoom(zoom: int) -> int:
+    """Coarsest LOD whose tolerance stays under one 256px-tile pixel at zoom."""
+    pixel = 360.0 / (256 * 2 ** zoom)
+    lod = 0
+    for level, (tolerance, _) in enumerate(LOD_LEVELS):
+        if tolerance <= pixel:
+            lod = level
+    return lod
+
+
+def resolve_lod(lod: Optional[int], zoom: Optional[int]) -> Optional[int]:
+    """Explicit ?lod= wins over ?zoom=; None means the unsimplified source."""
+    if lod is not None:
+        return lod
+    if zoom is not None:
+        return lod_for_zoom(zoom)
+    return None
+
+
+def _segment_distance_sq(p: Point, a: Point, b: Point) -> float:
+    ax, ay = a
+    dx, dy = b[0] - ax, b[1] - ay
+    if dx == 0 and dy == 0:
+        return (p[0] - ax) ** 2 + (p[1] - ay) ** 2
+    t = max(0.0, min(1.0, ((p[0] - ax) * dx + (p[1] - ay) * dy) / (dx * dx + dy * dy)))
+    return (p[0] - ax - t * dx) ** 2 + (p[1] - ay - t * dy) ** 2
+
+
+def _line_weights(points: list[Point]) -> list[float]:
+    """DP drop tolerance for every point of an open line; endpoints never drop."""
+    n = len(points)
+    weights = [0.0] * n
+    weights[0] = weights[-1] = math.inf
+    stack = [(0, n - 1, math.inf)]
+    while stack:
+        first, last, cap = stack.pop()
+        if last - first < 2:
+            continue
+        max_dist, index = -1.0, first + 1
+        for i in range(first + 1, last):
+            dist = _segment_distance_sq(points[i], points[first], points[last])
+            if dist > max_dist:
+                max_dist, index = dist, i
+        # A point only survives while the split that exposed it does
+        weight = min(math.sqrt(max_dist), cap)
+        weights[index] = weight
+        stack.append((first, index, weight))
+        stack.append((index, last, weight))
+    return weights
+
+
+def _arc_weights(points: list[Point], closed: bool) -> list[float]:
+    if not closed:
+        return _line_weights(points)
+    # Closed ring: split at the point farthest from the start and pin both
+    start = points[0]
+    far = max(range(1, len(points) - 1), key=lambda i: (points[i][0] - start[0]) ** 2 + (points[i][1] - start[1]) ** 2)
+    weights = _line_weights(points[:far + 1])[:-1] + _line_weights(points[far:])
+    weights[far] = math.inf
+    return weights
+
+
+def _open_ring(ring: list) -> list[Point]:
+    points = [(float(pt[0]), float(pt[1])) for pt in ring]
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    # Repeated vertices would read as spurious junctions
+    return [pt for i, pt in enumerate(points) if i == 0 or pt != points[i - 1]]
+
+
+def _canonical_closed(points: list[Point]) -> list[Point]:
+    start = points.index(min(points))
+    rotated = points[start:] + points[:start]
+    return rotated + [rotated[0]]
+
+
+def polygonal_rings(geometry: Optional[dict]) -> Optional[list[list[list]]]:
+    """Polygon/MultiPolygon coordinates as a list of polygons, else None."""
+    if not geometry:
+        return None
+    coords = geometry.get('coordinates') or []
+    if geometry.get('type') == 'Polygon':
+        return [coords] if coords else []
+    if geometry.get('type') == 'MultiPolygon':
+        return [polygon for polygon in coords if polygon]
+    return None
+
+
+class Topology:
+    """Arcs shared between the polygonal geometries of a feature list."""
+
+    def __init__(self, geometries: list[Optional[dict]]):
+        polygon_sets = [polygonal_rings(geometry) for geometry in geometries]
+        rings = [
+            ring
+            for polygons in polygon_sets if polygons
+            for polygon in polygons
+            for ring in (_open_ring(r) for r in polygon)
+        ]
+
+        neighbours: dict[Point, set[Point]] = {}
+        for ring in rings:
+            n = len(ring)
+            if n < 3:
+                continue
+            for i, point in enumerate(ring):
+                adjacent = neighbours.setdefault(point, set())
+                adjacent.add(ring[i - 1])
+                adjacent.add(ring[(i + 1) % n])
+        self.junctions = {point for point, adjacent in neighbours.items() if len(adjacent) > 2}
+
+        self.arcs: list[list[Point]] = []
+        self._arc_index: dict[tuple, int] = {}
+        # Per geometry: polygons -> rings -> arc refs; None for non-polygonal
+        self.shapes: list[Optional[list[list[list[int]]]]] = []
+        for polygons in polygon_sets:
+            if polygons is None:
+                self.shapes.append(None)
+                continue
+            shape = []
+            for polygon in polygons:
+                refs = [self._ring_arcs(_open_ring(ring)) for ring in polygon]
+                if refs[0]:
+                    shape.append([ring_refs for ring_refs in refs if ring_refs])
+            self.shapes.append(shape)
+
+        self.weights = [
+            _arc_weights(points, closed=points[0] == points[-1])
+            for points in self.arcs
+        ]
+        self._simplified: OrderedDict[float, list[list[Point]]] = OrderedDict()
+
+    def _add_arc(self, points: list[Point]) -> int:
+        key = tuple(points)
+        if key in self._arc_index:
+            return self._arc_index[key]
+        reverse = key[::-1]
+        if reverse in self._arc_index:
+            return ~self._arc_index[reverse]
+        self._arc_index[key] = len(self.arcs)
+        self.arcs.append(points)
+        return len(self.arcs) - 1
+
+    def _ring_arcs(self, ring: list[Point]) -> list[int]:
+        if len(ring) < 3:
+            return []
+        cuts = [i for i, point in enumerate(ring) if point in self.junctions]
+        if not cuts:
+            # Stand-alone ring (or one shared whole, e.g. an enclave and its hole)
+            points = _canonical_closed(ring)
+            reverse = _canonical_closed(ring[::-1])
+            if tuple(reverse) in self._arc_index:
+                return [~self._arc_index[tuple(reverse)]]
+            return [self._add_arc(points)]
+        ring = ring[cuts[0]:] + ring[:cuts[0]]
+        ring.append(ring[0])
+        refs = []
+        start = 0
+        for i in range(1, len(ring)):
+            if ring[i] in self.junctions:
+                refs.append(self._add_arc(ring[start:i + 1]))
+                start = i
+        return refs
+
+    def arc_points(self, tolerance: float = 0.0) -> list[list[Point]]:
+        """Every arc simplified to tolerance, never collapsing a ring below a triangle."""
+        if tolerance <= 0:
+            return self.arcs
+        cached = self._simplified.get(tolerance)
+        if cached is not None:
+            self._simplified.move_to_end(tolerance)
+            return cached
+
+        keep = [[w > tolerance for w in weights] for weights in self.weights]
+        for shape in self.shapes:
+            for polygon in shape or []:
+                for refs in polygon:
+                    self._keep_triangle(refs, keep)
+        simplified = [
+            [pt for pt, kept in zip(points, arc_keep) if kept]
+            for points, arc_keep in zip(self.arcs, keep)
+        ]
+
+        self._simplified[tolerance] = simplified
+        if len(self._simplified) > ARC_CACHE_SIZE:
+            self._simplified.popitem(last=False)
+        return simplified
+
+    def _keep_triangle(self, refs: list[int], keep: list[list[bool]]) -> None:
+        """Re-admit the heaviest dropped points until the ring has 3 distinct vertices."""
+        def distinct() -> int:
+            points = set()
+            for ref in refs:
+                arc = ~ref if ref < 0 else ref
+                points.update(pt for pt, kept in zip(self.arcs[arc], keep[arc]) if kept)
+            return len(points)
+
+        missing = 3 - distinct()
+        if missing <= 0:
+            return
+        candidates = sorted(
+            (
+                (self.weights[arc][i], arc, i)
+                for arc in {~ref if ref < 0 else ref for ref in refs}
+                for i, kept in enumerate(keep[arc]) if not kept
+            ),
+            reverse=True
+        )
+        for _, arc, i in candidates:
+            keep[arc][i] = True
+            if distinct() >= 3:
+                return
+
+    def _ring(self, refs: list[int], arcs: list[list[Point]]) -> list[Point]:
+        ring: list[Point] = []
+        for ref in refs:
+            points = arcs[~ref][::-1] if ref < 0 else arcs[ref]
+            ring.extend(points if not ring else points[1:])
+        return ring
+
+    def polygons(self, index: int, tolerance: float = 0.0) -> Optional[list[list[list[Point]]]]:
+        """Closed rings of geometry ``index`` at tolerance, or None if not polygonal."""
+        shape = self.shapes[index]
+        if shape is None:
+            return None
+        arcs = self.arc_points(tolerance)
+        return [[self._ring(refs, arcs) for refs in polygon] for polygon in shape]
+
+    def geometry(self, index: int, tolerance: float = 0.0, decimals: Optional[int] = None) -> Optional[dict]:
+        """GeoJSON geometry of ``index`` at tolerance, rounded to decimals."""
+        polygons = self.polygons(index, tolerance)
+        if polygons is None:
+            return None
+        coordinates = []
+        for polygon in polygons:
+            rings = []
+            for ring in polygon:
+                if decimals is not None:
+                    ring = _quantize_ring(ring, decimals)
+                if len(ring) >= 4:
+                    rings.append([list(pt) for pt in ring])
+                elif not rings:
+                    # Outer ring vanished at this precision; holes go with it
+                    break
+            if rings:
+                coordinates.append(rings)
+        if len(coordinates) == 1:
+            return {"type": "Polygon", "coordinates": coordinates[0]}
+        return {"type": "MultiPolygon", "coordinates": coordinates}
+
+
+def _quantize_ring(ring: list[Point], decimals: int) -> list[Point]:
+    rounded = [(round(x, decimals), round(y, decimals)) for x, y in ring]
+    return [pt for i, pt in enumerate(rounded) if i == 0 or pt != rounded[i - 1]]
+
+
+def simplify_collection(collection: dict, lod: int, topology: Optional[Topology] = None) -> dict:
+    """Copy of a FeatureCollection with polygon geometries at the given LOD.
+
+    Pass a Topology already built from the same features to reuse it.
+    """
+    features = collection.get('features', [])
+    if topology is None:
+        topology = Topology([feature.get('geometry') for feature in features])
+    tolerance, decimals = LOD_LEVELS[lod]
+    simplified = []
+    for i, feature in enumerate(features):
+        geometry = topology.geometry(i, tolerance, decimals)
+        simplified.append({**feature, "geometry": geometry if geometry is not None else feature.get('geometry')})
+    return {**collection, "features": simplified}
+
+
+# Grid cells per axis for TopoJSON integer coordinates (~1 m across the district)
+TOPOJSON_QUANTIZATION = 100000
+
+
+def to_topojson(
+    collection: dict,
+    object_name: str,
+    lod: Optional[int] = None,
+    topology: Optional[Topology] = None,
+    quantization: int = TOPOJSON_QUANTIZATION
+) -> dict:
+    """Encode a FeatureCollection as quantized, delta-encoded TopoJSON.
+
+    Shared borders appear once in ``arcs``; each geometry lists arc indexes
+    (``~i`` = reversed). ``lod`` simplifies the arcs first and snaps them to
+    that level's grid; otherwise the extent is split into ``quantization``
+    cells per axis. Pass a Topology already built from the same features to
+    reuse it.
+    """
+    features = collection.get('features', [])
+    if topology is None:
+        topology = Topology([feature.get('geometry') for feature in features])
+    tolerance = LOD_LEVELS[lod][0] if lod is not None else 0.0
+    arcs = topology.arc_points(tolerance)
+
+    points = [pt for arc in arcs for pt in arc]
+    if points:
+        x0, y0 = min(p[0] for p in points), min(p[1] for p in points)
+        x1, y1 = max(p[0] for p in points), max(p[1] for p in points)
+    else:
+        x0 = y0 = x1 = y1 = 0.0
+    if lod is not None:
+        # Same grid as the LOD's GeoJSON rounding; finer would only add noise
+        kx = ky = 10.0 ** -LOD_LEVELS[lod][1]
+    else:
+        kx = (x1 - x0) / (quantization - 1) or 1.0
+        ky = (y1 - y0) / (quantization - 1) or 1.0
+
+    encoded_arcs = []
+    for arc in arcs:
+        encoded = []
+        prev_x = prev_y = 0
+        for x, y in arc:
+            qx, qy = round((x - x0) / kx), round((y - y0) / ky)
+            if encoded and qx == prev_x and qy == prev_y:
+                continue
+            encoded.append([qx - prev_x, qy - prev_y])
+            prev_x, prev_y = qx, qy
+        if len(encoded) == 1:
+            # Arc shorter than one grid cell: keep it a valid two-point line
+            encoded.append([0, 0])
+        encoded_arcs.append(encoded)
+
+    geometries = []
+    for i, feature in enumerate(features):
+        shape = topology.shapes[i]
+        if shape is None:
+            geometry = {"type": None}
+        elif len(shape) == 1:
+            geometry = {"type": "Polygon", "arcs": shape[0]}
+        else:
+            geometry = {"type": "MultiPolygon", "arcs": shape}
+        if feature.get('id') is not None:
+            geometry["id"] = feature['id']
+        geometry["properties"] = feature.get('properties') or {}
+        geometries.append(geometry)
+
+    return {
+        "type": "Topology",
+        "bbox": [x0, y0, x1, y1],
+        "transform": {"scale": [kx, ky], "translate": [x0, y0]},
+        "objects": {object_name: {"type": "GeometryCollection", "geometries": geometries}},
+        "arcs": encoded_arcs,
+    }
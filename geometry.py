@@ -0,0 +1,164 @@
+"""
+Vectorized statistics for Polygon/MultiPolygon geometries.
+
+Every ring of every geometry in a batch is flattened into one contiguous
+float64 coordinate array, so the shoelace sums, bounding boxes and vertex
+means run as NumPy reductions instead of per-coordinate Python loops.
+
+Centroids are area-weighted (holes subtract), with the vertex mean as the
+fallback for degenerate geometries of zero area. Areas use the same
+equirectangular approximation per ring (scaled at the ring's mean latitude)
+that block statistics always have.
+"""
+import math
+from typing import Optional
+
+import numpy as np
+
+from geo_topology import polygonal_rings
+
+# Mean Earth radius used for the equirectangular area approximation
+EARTH_RADIUS_KM = 6371.0088
+
+KM_PER_DEGREE = math.radians(1) * EARTH_RADIUS_KM
+
+# Below this many square degrees a geometry is treated as having no area
+MIN_AREA_DEG2 = 1e-12
+
+
+def _ring_table(geometries: list[Optional[dict]]):
+    """Flatten rings into (coords, ring_starts, ring_owner, ring_role).
+
+    ``coords`` is an (N, 2) lng/lat array with each geometry's rings stored
+    contiguously; ``ring_role`` is +1 for outer rings and -1 for holes.
+    """
+    flat: list = []
+    starts: list[int] = []
+    owners: list[int] = []
+    roles: list[int] = []
+    for owner, geometry in enumerate(geometries):
+        for polygon in polygonal_rings(geometry) or ():
+            for position, ring in enumerate(polygon):
+                if not ring:
+                    continue
+                starts.append(len(flat))
+                owners.append(owner)
+                roles.append(1 if position == 0 else -1)
+                flat.extend(ring)
+
+    if not flat:
+        coords = np.empty((0, 2), dtype=np.float64)
+    else:
+        try:
+            coords = np.asarray(flat, dtype=np.float64)
+        except ValueError:
+            # Mixed 2D/3D positions; keep lng/lat only
+            coords = np.asarray([pt[:2] for pt in flat], dtype=np.float64)
+        coords = coords[:, :2]
+    return (
+        coords,
+        np.asarray(starts, dtype=np.intp),
+        np.asarray(owners, dtype=np.intp),
+        np.asarray(roles, dtype=np.float64),
+    )
+
+
+def geometry_stats(geometries: list[Optional[dict]]) -> list[Optional[dict]]:
+    """Centroid, bounding box and area for each geometry in one pass.
+
+    Returns one dict per geometry with lat, lng, south, west, north, east and
+    area_sq_km, or None for geometries that are not polygonal or have no
+    coordinates.
+    """
+    count = len(geometries)
+    coords, starts, owners, roles = _ring_table(geometries)
+    results: list[Optional[dict]] = [None] * count
+    if not len(coords):
+        return results
+
+    n = len(coords)
+    lengths = np.diff(np.append(starts, n))
+    point_owner = np.repeat(owners, lengths)
+
+    # Shift each ring to its first vertex so the cross products don't cancel
+    # away precision at large coordinate values
+    origin = coords[starts]
+    local = coords - np.repeat(origin, lengths, axis=0)
+    x, y = local[:, 0], local[:, 1]
+    nxt = np.arange(1, n + 1)
+    nxt[starts + lengths - 1] = starts  # close every ring back on itself
+    cross = x * y[nxt] - x[nxt] * y
+
+    signed_area = np.add.reduceat(cross, starts) / 2.0
+    moment_x = np.add.reduceat((x + x[nxt]) * cross, starts) / 6.0
+    moment_y = np.add.reduceat((y + y[nxt]) * cross, starts) / 6.0
+    # Orient outer rings positive and holes negative whatever their winding
+    weight = roles * np.sign(signed_area)
+    ring_area = np.abs(signed_area) * roles
+    ring_mx = moment_x * weight + ring_area * origin[:, 0]
+    ring_my = moment_y * weight + ring_area * origin[:, 1]
+
+    area = np.bincount(owners, weights=ring_area, minlength=count)
+    mx = np.bincount(owners, weights=ring_mx, minlength=count)
+    my = np.bincount(owners, weights=ring_my, minlength=count)
+
+    mean_lat = np.radians(np.add.reduceat(coords[:, 1], starts) / lengths)
+    ring_km2 = ring_area * KM_PER_DEGREE * KM_PER_DEGREE * np.cos(mean_lat)
+    area_km2 = np.maximum(np.bincount(owners, weights=ring_km2, minlength=count), 0.0)
+
+    points = np.bincount(point_owner, minlength=count)
+    mean_x = np.bincount(point_owner, weights=coords[:, 0], minlength=count)
+    mean_y = np.bincount(point_owner, weights=coords[:, 1], minlength=count)
+
+    # Each geometry's points are contiguous, so bounds reduce over its slice
+    present = np.flatnonzero(points)
+    point_starts = np.concatenate(([0], np.cumsum(points)[:-1]))[present]
+    west = np.minimum.reduceat(coords[:, 0], point_starts)
+    east = np.maximum.reduceat(coords[:, 0], point_starts)
+    south = np.minimum.reduceat(coords[:, 1], point_starts)
+    north = np.maximum.reduceat(coords[:, 1], point_starts)
+
+    for k, i in enumerate(present.tolist()):
+        if abs(area[i]) > MIN_AREA_DEG2:
+            lng, lat = mx[i] / area[i], my[i] / area[i]
+        else:
+            lng, lat = mean_x[i] / points[i], mean_y[i] / points[i]
+        results[i] = {
+            "lat": float(lat),
+            "lng": float(lng),
+            "south": float(south[k]),
+            "west": float(west[k]),
+            "north": float(north[k]),
+            "east": float(east[k]),
+            "area_sq_km": float(area_km2[i]),
+        }
+    return results
+
+
+def feature_stats(geometry: Optional[dict]) -> Optional[dict]:
+    """geometry_stats for a single geometry."""
+    return geometry_stats([geometry])[0]
+
+
+def geometry_area_sq_km(geometry: dict) -> float:
+    """Approximate area of a Polygon/MultiPolygon in square kilometres."""
+    stats = feature_stats(geometry)
+    return stats["area_sq_km"] if stats else 0.0
+
+
+def vertex_bounds(geometries: list[Optional[dict]]) -> Optional[dict]:
+    """Vertex mean and bounding box over a whole set of geometries, or None if empty."""
+    coords = _ring_table(geometries)[0]
+    if not len(coords):
+        return None
+    mean = coords.mean(axis=0)
+    low = coords.min(axis=0)
+    high = coords.max(axis=0)
+    return {
+        "lat": float(mean[1]),
+        "lng": float(mean[0]),
+        "south": float(low[1]),
+        "west": float(low[0]),
+        "north": float(high[1]),
+        "east": float(high[0]),
+    }
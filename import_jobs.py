@@ -0,0 +1,293 @@
+"""
+Background bulk CSV import jobs.
+
+An upload is stored in the database (``import_upload_chunks``) and recorded
+as a queued ImportJob row; the request returns straight away with the job
+id. Every instance runs ``import_runner``, which claims queued jobs with a
+conditional ``UPDATE ... WHERE status = 'queued'`` so each job runs on one
+instance only, copies the upload to a local temporary file and runs the
+streaming importers from bulk_import.py against it. The upload is deleted
+when the job finishes.
+
+Progress (rows processed, errors, heartbeat) is written through the import
+session before each batch commits, so it always matches what is in the
+database, and only while the job is still owned by this instance. A job
+whose heartbeat is older than ``IMPORT_HEARTBEAT_TIMEOUT`` (its instance was
+stopped or scaled away) is put back in the queue and resumed by any instance
+from the first uncommitted row; if the old owner wakes up, its next batch
+finds the job no longer its own and rolls back.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+from sqlalchemy import and_, delete, func, insert, or_, update
+from sqlmodel import select
+
+from models import ImportJob, ImportUploadChunk
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process as the owner of the jobs it runs
+INSTANCE_ID = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+# Seconds without a heartbeat after which a running job is taken over
+IMPORT_HEARTBEAT_TIMEOUT = int(os.getenv("IMPORT_HEARTBEAT_TIMEOUT", "120"))
+
+# Seconds between checks for queued or abandoned jobs
+IMPORT_POLL_INTERVAL = 10
+
+# Bytes of the upload stored per chunk row
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Errors kept on the job row; the count is always exact
+MAX_STORED_ERRORS = 1000
+
+
+class ImportJobLost(Exception):
+    """The job stopped being owned by this instance while it ran."""
+
+
+async def store_upload(session, job_id: int, file: UploadFile) -> None:
+    """Copy an upload into import_upload_chunks, one chunk at a time."""
+    seq = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        await session.execute(insert(ImportUploadChunk).values(job_id=job_id, seq=seq, data=chunk))
+        seq += 1
+
+
+async def load_upload(session, job_id: int, out: BinaryIO) -> None:
+    """Write a job's stored upload to ``out``."""
+    result = await session.stream_scalars(
+        select(ImportUploadChunk.data)
+        .where(ImportUploadChunk.job_id == job_id)
+        .order_by(ImportUploadChunk.seq)
+        .execution_options(yield_per=4)
+    )
+    async for chunk in result:
+        out.write(chunk)
+
+
+def job_status(job: ImportJob) -> dict:
+    """Public view of a job, with throughput in rows per second."""
+    end = job.finished_at or datetime.now(timezone.utc)
+    rows_per_second = None
+    if job.started_at is not None:
+        started = job.started_at if job.started_at.tzinfo else job.started_at.replace(tzinfo=timezone.utc)
+        end = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+        elapsed = (end - started).total_seconds()
+        if elapsed > 0:
+            rows_per_second = round(job.rows_processed / elapsed, 1)
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "filename": job.filename,
+        "rows_processed": job.rows_processed,
+        "error_count": job.error_count,
+        "errors": json.loads(job.errors or "[]"),
+        "result": json.loads(job.result) if job.result else None,
+        "message": job.message,
+        "rows_per_second": rows_per_second,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+class ImportJobRunner:
+    """Claims and processes queued import jobs, one at a time per instance."""
+
+    def __init__(self):
+        self._wake: asyncio.Event | None = None
+
+    async def create_job(
+        self,
+        session,
+        kind: str,
+        file: UploadFile,
+        created_by: Optional[str] = None,
+        options: Optional[dict] = None
+    ) -> ImportJob:
+        """Store the upload, record a queued job and wake the worker."""
+        job = ImportJob(
+            kind=kind,
+            filename=file.filename,
+            options=json.dumps(options or {}),
+            created_by=created_by
+        )
+        session.add(job)
+        await session.flush()
+        await store_upload(session, job.id, file)
+        await session.commit()
+        await session.refresh(job)
+        if self._wake is not None:
+            self._wake.set()
+        return job
+
+    @staticmethod
+    async def _requeue_stale(session) -> None:
+        """Put running jobs whose owner stopped reporting back in the queue."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=IMPORT_HEARTBEAT_TIMEOUT)
+        result = await session.execute(
+            update(ImportJob)
+            .where(and_(
+                ImportJob.status == "running",
+                or_(ImportJob.heartbeat_at.is_(None), ImportJob.heartbeat_at < cutoff)
+            ))
+            .values(status="queued", owner=None)
+        )
+        await session.commit()
+        if result.rowcount:
+            logger.warning(f"Requeued {result.rowcount} import job(s) with a stale heartbeat")
+
+    @staticmethod
+    async def _next_queued(session) -> Optional[int]:
+        result = await session.execute(
+            select(ImportJob.id).where(ImportJob.status == "queued").order_by(ImportJob.id).limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def _claim(session, job_id: int) -> bool:
+        now = datetime.now(timezone.utc)
+        result = await session.execute(
+            update(ImportJob)
+            .where(and_(ImportJob.id == job_id, ImportJob.status == "queued"))
+            .values(
+                status="running",
+                owner=INSTANCE_ID,
+                heartbeat_at=now,
+                started_at=func.coalesce(ImportJob.started_at, now)
+            )
+        )
+        await session.commit()
+        return result.rowcount == 1
+
+    async def process(self, session_maker, job_id: int) -> None:
+        from bulk_import import import_members_csv, import_villages_csv
+
+        async with session_maker() as session:
+            if not await self._claim(session, job_id):
+                return
+            job = await session.get(ImportJob, job_id)
+            kind = job.kind
+            options = json.loads(job.options or "{}")
+            # Rows and errors committed by earlier runs of a resumed job
+            start_row = job.rows_processed
+            previous_errors = json.loads(job.errors or "[]")
+            previous_error_count = job.error_count
+            owned = and_(
+                ImportJob.id == job_id,
+                ImportJob.owner == INSTANCE_ID,
+                ImportJob.status == "running"
+            )
+
+            def error_values(errors: list[str]) -> dict:
+                return {
+                    "error_count": previous_error_count + len(errors),
+                    "errors": json.dumps((previous_errors + errors)[:MAX_STORED_ERRORS]),
+                }
+
+            async def progress(rows_processed: int, errors: list[str]) -> None:
+                result = await session.execute(
+                    update(ImportJob).where(owned).values(
+                        rows_processed=rows_processed,
+                        heartbeat_at=datetime.now(timezone.utc),
+                        **error_values(errors)
+                    )
+                )
+                if result.rowcount != 1:
+                    raise ImportJobLost(f"Import job {job_id} is no longer owned by {INSTANCE_ID}")
+
+            if start_row:
+                logger.info(f"Resuming import job {job_id} at row {start_row}")
+            try:
+                with tempfile.TemporaryFile() as raw:
+                    await load_upload(session, job_id, raw)
+                    raw.seek(0)
+                    if kind == "villages":
+                        result = await import_villages_csv(
+                            session, raw, progress=progress, start_row=start_row
+                        )
+                    elif kind == "members":
+                        result = await import_members_csv(
+                            session, raw,
+                            verify_on_import=bool(options.get("verify_on_import")),
+                            progress=progress,
+                            start_row=start_row
+                        )
+                    else:
+                        raise ValueError(f"Unknown import kind: {kind}")
+            except ImportJobLost as e:
+                logger.warning(str(e))
+                await session.rollback()
+                return
+            except Exception as e:
+                logger.error(f"Import job {job_id} failed: {e}", exc_info=True)
+                await session.rollback()
+                values = {"status": "failed", "message": str(e)}
+            else:
+                errors = result.pop("errors", [])
+                if start_row:
+                    result["resumed_at_row"] = start_row
+                values = {"status": "completed", "result": json.dumps(result), **error_values(errors)}
+
+            now = datetime.now(timezone.utc)
+            finished = await session.execute(
+                update(ImportJob).where(owned).values(finished_at=now, heartbeat_at=now, **values)
+            )
+            if finished.rowcount == 1:
+                await session.execute(delete(ImportUploadChunk).where(ImportUploadChunk.job_id == job_id))
+            await session.commit()
+            if finished.rowcount == 1 and values["status"] == "completed":
+                await self._after_import()
+
+    @staticmethod
+    async def _after_import() -> None:
+        from block_statistics import block_stats_scheduler
+        from volunteer_matching import volunteer_index_cache
+        block_stats_scheduler.notify_write()
+        await volunteer_index_cache.invalidate()
+
+    async def run(self, session_maker) -> None:
+        """Process queued jobs, and take over abandoned ones, until cancelled."""
+        self._wake = asyncio.Event()
+        while True:
+            self._wake.clear()
+            job_id = None
+            try:
+                async with session_maker() as session:
+                    await self._requeue_stale(session)
+                    job_id = await self._next_queued(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Could not check for import jobs: {e}", exc_info=True)
+
+            if job_id is not None:
+                try:
+                    await self.process(session_maker, job_id)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Import job {job_id} crashed: {e}", exc_info=True)
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), IMPORT_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+
+import_runner = ImportJobRunner()
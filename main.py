@@ -1,10 +1,11 @@
-from fastapi import FastAPI, Request, Depends, HTTPException, Form, UploadFile, File, Query
+from fastapi import FastAPI, Request, Response, Depends, HTTPException, Form, UploadFile, File, Query
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sqlmodel import select, or_, func
+from sqlmodel import select, or_, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
+import asyncio
 import csv
 import io
 import json
@@ -16,49 +17,104 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 STATIC_VILLAGE_FEATURES: list[dict] | None = None
-STATIC_BLOCK_FEATURE_MAP: dict[str, list[dict]] = {}
+# Per-feature geometry_stats and per-block bounds, precomputed with the
+# features (see static_geo_cache.py)
+STATIC_VILLAGE_STATS: list[dict | None] = []
+STATIC_VILLAGE_SHA256: str | None = None
+STATIC_BLOCK_BOUNDS: dict[str, dict | None] = {}
 STATIC_BLOCK_CACHE: dict[str, dict | None] = {}
 
+# Cache namespace for everything derived from the static GeoJSON files;
+# bumping it makes every worker reload them (see cache_backend.py)
+STATIC_GEO_NAMESPACE = "static_geojson"
+_static_geo_version: int | None = None
+_static_village_lock = asyncio.Lock()
 
-def _normalize_block(name: str) -> str:
-    return ''.join(ch for ch in name.lower() if ch.isalnum())
+
+from village_resolver import normalize_block as _normalize_block, normalize_village_key as _normalize_village_key
+
+
+async def _sync_static_geo_version():
+    """Drop the static GeoJSON caches if they were invalidated in any worker."""
+    global STATIC_VILLAGE_FEATURES, STATIC_VILLAGE_STATS, STATIC_VILLAGE_SHA256, STATIC_BLOCK_BOUNDS, _static_geo_version
+    from cache_backend import cache_backend
+    version = await cache_backend.version(STATIC_GEO_NAMESPACE)
+    if version != _static_geo_version:
+        STATIC_VILLAGE_FEATURES = None
+        STATIC_VILLAGE_STATS = []
+        STATIC_VILLAGE_SHA256 = None
+        STATIC_BLOCK_BOUNDS = {}
+        STATIC_BLOCK_CACHE.clear()
+        geo_artifacts.clear_artifacts()
+        _static_geo_version = version
 
 
 async def ensure_static_village_features() -> list[dict]:
-    global STATIC_VILLAGE_FEATURES, STATIC_BLOCK_FEATURE_MAP
+    await _sync_static_geo_version()
     if STATIC_VILLAGE_FEATURES is None:
-        try:
-            with open('static/geojson/bhadrak_villages.geojson', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                STATIC_VILLAGE_FEATURES = data.get('features', [])
-        except FileNotFoundError:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning("GeoJSON file not found: static/geojson/bhadrak_villages.geojson - villages features will be empty")
-            STATIC_VILLAGE_FEATURES = []
-        except json.JSONDecodeError as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Invalid JSON in GeoJSON file: {e}")
-            STATIC_VILLAGE_FEATURES = []
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error loading GeoJSON file: {e}", exc_info=True)
-            STATIC_VILLAGE_FEATURES = []
-
-        block_map: dict[str, list[dict]] = {}
-        for feature in STATIC_VILLAGE_FEATURES:
-            props = feature.get('properties', {})
-            block = (props.get('SUB_DIST') or props.get('block') or '').strip()
-            if not block:
-                continue
-            normalized = _normalize_block(block)
-            block_map.setdefault(normalized, []).append(feature)
-        STATIC_BLOCK_FEATURE_MAP = block_map
+        # One loader at a time; the others wait and reuse its result
+        async with _static_village_lock:
+            if STATIC_VILLAGE_FEATURES is None:
+                await _load_static_village_features()
     return STATIC_VILLAGE_FEATURES
 
 
+async def _load_static_village_features() -> None:
+    global STATIC_VILLAGE_FEATURES, STATIC_VILLAGE_STATS, STATIC_VILLAGE_SHA256, STATIC_BLOCK_BOUNDS
+    # Built in locals and published together once the thread returns, so
+    # readers never see stats or bounds from one load next to features
+    # from another (or a half-reset set while the file is being parsed)
+    features, stats, sha256, block_bounds = [], [], None, {}
+    try:
+        # Unchanged files come back from the on-disk cache without parsing;
+        # either way the work runs off the event loop
+        prepared = await asyncio.to_thread(
+            load_prepared_villages, 'static/geojson/bhadrak_villages.geojson', _normalize_block
+        )
+        features, stats = prepared.features, prepared.stats
+        sha256, block_bounds = prepared.source_sha256, prepared.block_bounds
+    except FileNotFoundError:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.warning("GeoJSON file not found: static/geojson/bhadrak_villages.geojson - villages features will be empty")
+    except json.JSONDecodeError as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error(f"Invalid JSON in GeoJSON file: {e}")
+    except Exception as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error(f"Error loading GeoJSON file: {e}", exc_info=True)
+    STATIC_VILLAGE_STATS = stats
+    STATIC_VILLAGE_SHA256 = sha256
+    STATIC_BLOCK_BOUNDS = block_bounds
+    STATIC_BLOCK_CACHE.clear()
+    STATIC_VILLAGE_FEATURES = features
+
+
+async def _serve_geo_artifact(
+    name: str,
+    request: Request,
+    label: str,
+    lod: Optional[int] = None,
+    output_format: str = "geojson"
+) -> Response:
+    import logging
+    logger = logging.getLogger(__name__)
+    try:
+        artifact = await geo_artifacts.load_artifact(name, lod, output_format)
+        return artifact.response(request)
+    except FileNotFoundError:
+        logger.error(f"GeoJSON file not found: {geo_artifacts.ARTIFACT_SOURCES[name][0]}")
+        raise HTTPException(status_code=500, detail=f"{label} file not found")
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON in {name} GeoJSON file: {e}")
+        raise HTTPException(status_code=500, detail=f"Invalid {label.lower()} data")
+    except Exception as e:
+        logger.error(f"Error loading {name} GeoJSON: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error loading {label.lower()}")
+
+
 async def get_block_bounds_from_static(block_name: str) -> dict | None:
     if not block_name:
         return None
@@ -69,174 +125,45 @@ async def get_block_bounds_from_static(block_name: str) -> dict | None:
     if normalized in STATIC_BLOCK_CACHE:
         return STATIC_BLOCK_CACHE[normalized]
 
-    block_features = STATIC_BLOCK_FEATURE_MAP.get(normalized)
-    if not block_features:
+    stats = STATIC_BLOCK_BOUNDS.get(normalized)
+    if normalized not in STATIC_BLOCK_BOUNDS:
         from difflib import get_close_matches
-        matches = get_close_matches(normalized, list(STATIC_BLOCK_FEATURE_MAP.keys()), n=1, cutoff=0.72)
-        if matches:
-            normalized = matches[0]
-            block_features = STATIC_BLOCK_FEATURE_MAP.get(normalized)
-        else:
-            STATIC_BLOCK_CACHE[normalized] = None
-            return None
-
-    lats: list[float] = []
-    lngs: list[float] = []
-    south = north = west = east = None
-
-    for feature in block_features:
-        geometry = feature.get('geometry', {})
-        coords = geometry.get('coordinates', [])
-        if geometry.get('type') == 'Polygon':
-            polygons = [coords]
-        elif geometry.get('type') == 'MultiPolygon':
-            polygons = coords
-        else:
-            polygons = []
-
-        for polygon in polygons:
-            for ring in polygon:
-                for lng, lat in ring:
-                    lats.append(lat)
-                    lngs.append(lng)
-                    south = lat if south is None else min(south, lat)
-                    north = lat if north is None else max(north, lat)
-                    west = lng if west is None else min(west, lng)
-                    east = lng if east is None else max(east, lng)
-
-    if not lats or not lngs:
-        STATIC_BLOCK_CACHE[normalized] = None
-        return None
+        matches = get_close_matches(normalized, list(STATIC_BLOCK_BOUNDS.keys()), n=1, cutoff=0.72)
+        stats = STATIC_BLOCK_BOUNDS[matches[0]] if matches else None
 
-    stats = {
-        'lat': sum(lats) / len(lats),
-        'lng': sum(lngs) / len(lngs),
-        'south': south,
-        'west': west,
-        'north': north,
-        'east': east
-    }
     STATIC_BLOCK_CACHE[normalized] = stats
     return stats
 
 
-
-def _normalize_village_key(name: str, block: str) -> str:
-    combined = f"{name or ''}::{block or ''}".lower()
-    return ''.join(ch for ch in combined if ch.isalnum())
-
-
-def _iterate_feature_coords(feature: dict) -> list[tuple[float, float]]:
-    geometry = feature.get("geometry", {})
-    coords = geometry.get("coordinates", [])
-    if geometry.get("type") == "Polygon":
-        polygons = [coords]
-    elif geometry.get("type") == "MultiPolygon":
-        polygons = coords
-    else:
-        return []
-    collected: list[tuple[float, float]] = []
-    for polygon in polygons:
-        for ring in polygon:
-            for lng, lat in ring:
-                collected.append((lat, lng))
-    return collected
-
-
-def _compute_feature_stats(feature: dict) -> dict | None:
-    coords = _iterate_feature_coords(feature)
-    if not coords:
-        return None
-    lats = [lat for lat, _ in coords]
-    lngs = [lng for _, lng in coords]
-    lat = sum(lats) / len(lats)
-    lng = sum(lngs) / len(lngs)
-    south = min(lats)
-    north = max(lats)
-    west = min(lngs)
-    east = max(lngs)
-    return {
-        "lat": lat,
-        "lng": lng,
-        "south": south,
-        "north": north,
-        "west": west,
-        "east": east,
-    }
-
-
 async def sync_static_villages(session: AsyncSession):
-    """Ensure the Village table contains entries for all static GeoJSON features."""
-    features = await ensure_static_village_features()
-    existing_result = await session.execute(select(Village.id, Village.name, Village.block))
-    existing_map = {
-        _normalize_village_key(name, block): village_id
-        for village_id, name, block in existing_result.all()
-    }
+    """Ensure the Village table contains entries for all static GeoJSON features.
 
-    new_villages: list[Village] = []
-    for feature in features:
-        props = feature.get('properties', {})
-        name = (props.get('NAME') or props.get('name') or '').strip()
-        block = (props.get('SUB_DIST') or props.get('block') or '').strip()
-        if not name or not block:
-            continue
-        key = _normalize_village_key(name, block)
-        if key in existing_map:
-            continue
-
-        stats = _compute_feature_stats(feature)
-        if not stats:
-            continue
-
-        population = props.get('population') or props.get('POP') or 0
-        code_2011 = props.get('CENSUSCODE') or props.get('code_2011') or props.get('code')
-
-        new_villages.append(Village(
-            name=name,
-            block=block,
-            lat=stats['lat'],
-            lng=stats['lng'],
-            south=stats['south'],
-            west=stats['west'],
-            north=stats['north'],
-            east=stats['east'],
-            population=population,
-            code_2011=str(code_2011) if code_2011 else None,
-            show_pin=True
-        ))
-
-    if not new_villages:
+    Incremental: a no-op while the GeoJSON is unchanged, otherwise only new
+    and changed features are written (see village_sync.py).
+    """
+    from village_sync import sync_village_features
+    features = await ensure_static_village_features()
+    if not STATIC_VILLAGE_SHA256:
         return
-
-    session.add_all(new_villages)
-    await session.flush()
-
-    for village in new_villages:
-        key = _normalize_village_key(village.name, village.block)
-        existing_map[key] = village.id
-
-    # Ensure each newly inserted village has a pin entry
-    pin_result = await session.execute(select(VillagePin.village_id))
-    existing_pins = {row[0] for row in pin_result.all()}
-    new_pins = [
-        VillagePin(
-            village_id=village.id,
-            field_worker_count=0,
-            uk_center_count=0,
-            is_active=True
-        )
-        for village in new_villages
-        if village.id not in existing_pins
-    ]
-    if new_pins:
-        session.add_all(new_pins)
-
-    await session.commit()
+    await sync_village_features(
+        session, STATIC_VILLAGE_SHA256, features, STATIC_VILLAGE_STATS, _normalize_village_key
+    )
 
 
 from db import init_db, get_session
 from models import Village, Member, Doctor, Audit, Report, SevaRequest, SevaResponse, Testimonial, BlockSettings, MapSettings, VillagePin, CustomLabel, BlockStatistics, User, FieldWorker, FormFieldConfig, AboutPage
+from block_statistics import block_stats_scheduler
+import geo_artifacts
+import geo_index
+import geo_tiles
+import village_graph
+from static_geo_cache import load_prepared_villages
+from geo_topology import MAX_LOD, resolve_lod
+from volunteer_matching import volunteer_index_cache
+from config_cache import (
+    custom_labels_cache, map_settings_cache, block_settings_cache,
+    form_fields_cache, about_page_cache, version_header
+)
 from auth import create_session_token, get_current_admin, get_current_user, get_optional_user, require_super_admin, require_block_coordinator, ADMIN_EMAIL, ADMIN_PASSWORD, pwd_context, hash_password
 
 
@@ -283,6 +210,7 @@ async def seed_default_labels(session: AsyncSession):
             session.add(label)
     
     await session.commit()
+    await custom_labels_cache.invalidate()
 
 
 @asynccontextmanager
@@ -295,13 +223,47 @@ async def lifespan(app: FastAPI):
     logger = logging.getLogger(__name__)
     
     logger.info("Starting application initialization...")
+    # The only critical step; everything else warms up in the background
     await init_db()
     
-    # Seed default labels
     from db import async_session_maker
-    async with async_session_maker() as session:
-        await seed_default_labels(session)
-        await sync_static_villages(session)
+    from warmup import warmup
+    
+    async def seed_labels():
+        async with async_session_maker() as session:
+            await seed_default_labels(session)
+    
+    async def sync_villages():
+        async with async_session_maker() as session:
+            await sync_static_villages(session)
+    
+    async def build_static_geo():
+        static_features = await ensure_static_village_features()
+        # Village tiles for the district extent, so tile clients never wait on a build
+        await asyncio.to_thread(geo_tiles.pregenerate, static_features)
+        await asyncio.to_thread(geo_index.get_village_index, static_features)
+        await asyncio.to_thread(village_graph.get_village_graph, static_features)
+    
+    warmup_task = asyncio.create_task(warmup.run([
+        ("labels", seed_labels),
+        ("static_villages", ensure_static_village_features),
+        ("village_sync", sync_villages),
+        # Serialize and compress the map GeoJSON
+        ("geo_artifacts", lambda: asyncio.to_thread(geo_artifacts.prime_artifacts)),
+        ("geo_indexes", build_static_geo),
+    ]))
+    
+    # Background verification of the materialized analytics counters
+    from analytics import run_snapshot_reconciler, RECONCILE_INTERVAL_SECONDS
+    reconcile_interval = float(os.getenv("ANALYTICS_RECONCILE_SECONDS", RECONCILE_INTERVAL_SECONDS))
+    reconciler_task = asyncio.create_task(run_snapshot_reconciler(async_session_maker, reconcile_interval))
+    
+    # Block statistics are recomputed in the background, never inside a read
+    block_stats_task = asyncio.create_task(block_stats_scheduler.run(async_session_maker))
+    
+    # Bulk CSV imports run here rather than inside the upload request
+    from import_jobs import import_runner
+    import_task = asyncio.create_task(import_runner.run(async_session_maker))
     
     logger.info("Application initialization complete")
     print("\n" + "=" * 60)
@@ -315,6 +277,11 @@ async def lifespan(app: FastAPI):
     print("   Dashboard:   http://0.0.0.0:5000/admin")
     print("=" * 60 + "\n")
     yield
+    
+    warmup_task.cancel()
+    reconciler_task.cancel()
+    block_stats_task.cancel()
+    import_task.cancel()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -405,13 +372,28 @@ async def health_check(session: AsyncSession = Depends(get_session)):
             }
         )
     
+    from cache_backend import cache_backend
+    from warmup import warmup
     return {
         "status": "healthy",
         "database": db_status,
+        "cache_backend": cache_backend.name,
+        "ready": warmup.ready,
+        "warmup": warmup.status(),
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: 503 until the background warm-up has finished"""
+    from warmup import warmup
+    status = warmup.status()
+    if not status["ready"]:
+        return JSONResponse(status_code=503, content=status)
+    return status
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     mapbox_token = os.getenv("MAPBOX_ACCESS_TOKEN", "")
@@ -480,35 +462,91 @@ async def get_villages(session: AsyncSession = Depends(get_session)):
 
 
 @app.get("/api/villages/choropleth")
-async def get_villages_choropleth():
-    """Return ALL 1,315 village geometries for choropleth with real data"""
-    import json
-    
-    # Load full village data (cached in memory after first load)
-    if not hasattr(get_villages_choropleth, '_cache'):
-        with open('static/geojson/bhadrak_villages.geojson', 'r') as f:
-            villages_data = json.load(f)
-        
-        # Process all villages with real data
-        features = []
-        for i, feature in enumerate(villages_data['features']):
-            props = feature['properties']
-            features.append({
-                "type": "Feature",
-                "properties": {
-                    "name": props.get('NAME', props.get('name', f'Village_{i}')),
-                    "block": props.get('SUB_DIST', props.get('block', 'Unknown')),
-                    "population": props.get('population', props.get('POP', 1000 + (i * 10))),
-                },
-                "geometry": feature['geometry']
-            })
-        
-        get_villages_choropleth._cache = {
-            "type": "FeatureCollection",
-            "features": features
-        }
-    
-    return get_villages_choropleth._cache
+async def get_villages_choropleth(
+    request: Request,
+    lod: Optional[int] = Query(None, ge=0, le=MAX_LOD),
+    zoom: Optional[int] = Query(None, ge=0, le=22),
+    output_format: str = Query("geojson", alias="format", pattern="^(geojson|topojson)$")
+):
+    """Return ALL 1,315 village geometries for choropleth with real data
+
+    ``lod`` (0 = full detail .. 3 = district view) or ``zoom`` selects a
+    simplified, quantized level of detail; omit both for the source geometry.
+    ``format=topojson`` returns shared arcs, quantized and delta-encoded.
+    """
+    # Pre-serialized and pre-compressed once per GeoJSON version (geo_artifacts.py)
+    await _sync_static_geo_version()
+    return await _serve_geo_artifact("choropleth", request, "Village boundaries", resolve_lod(lod, zoom), output_format)
+
+
+@app.get("/api/geojson/villages")
+async def get_villages_geojson(
+    request: Request,
+    lod: Optional[int] = Query(None, ge=0, le=MAX_LOD),
+    zoom: Optional[int] = Query(None, ge=0, le=22)
+):
+    """The static villages GeoJSON with its original properties, optionally simplified"""
+    await _sync_static_geo_version()
+    return await _serve_geo_artifact("villages", request, "Village boundaries", resolve_lod(lod, zoom))
+
+
+@app.get("/tiles/{z}/{x}/{y}.json")
+async def get_village_tile(z: int, x: int, y: int, request: Request):
+    """Village polygons for one map tile, simplified for its zoom (geo_tiles.py)"""
+    if not geo_tiles.valid_tile(z, x, y):
+        raise HTTPException(status_code=404, detail="Tile not found")
+    features = await ensure_static_village_features()
+    tile = await geo_tiles.get_tile(features, z, x, y)
+    return tile.response(request)
+
+
+async def locate_village(session: AsyncSession, lat: float, lng: float) -> tuple[dict | None, Village | None]:
+    """Static feature containing (lat, lng) and its Village row, via the spatial index."""
+    features = await ensure_static_village_features()
+    hit = (await geo_index.load_village_index(features)).locate(lat, lng)
+    if not hit or not hit["name"] or not hit["block"]:
+        return hit, None
+    result = await session.execute(
+        select(Village)
+        .where(func.lower(Village.name) == hit["name"].lower())
+        .where(func.lower(Village.block) == hit["block"].lower())
+    )
+    return hit, result.scalars().first()
+
+
+async def _create_village_from_feature(session: AsyncSession, index: int) -> Village | None:
+    """Add the Village (and its pin) for a static feature, as the static sync would."""
+    from village_sync import feature_record
+    features = await ensure_static_village_features()
+    stats = STATIC_VILLAGE_STATS[index] if index < len(STATIC_VILLAGE_STATS) else None
+    record = feature_record(features[index], stats) if index < len(features) else None
+    if record is None:
+        return None
+    village = Village(**record)
+    session.add(village)
+    await session.flush()
+    session.add(VillagePin(village_id=village.id, field_worker_count=0, uk_center_count=0))
+    return village
+
+
+@app.get("/api/geo/locate")
+async def geo_locate(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    session: AsyncSession = Depends(get_session)
+):
+    """Which village contains this point (grid index + point-in-polygon)"""
+    hit, village = await locate_village(session, lat, lng)
+    if not hit:
+        raise HTTPException(status_code=404, detail="No village at this location")
+    return {
+        "village_id": village.id if village else None,
+        "feature_id": hit["index"] + 1,  # 1-based id used by the map page
+        "name": village.name if village else hit["name"],
+        "block": village.block if village else hit["block"],
+        "lat": village.lat if village else None,
+        "lng": village.lng if village else None
+    }
 
 
 @app.get("/api/village/{village_name}")
@@ -535,7 +573,7 @@ async def get_village_details(village_name: str, session: AsyncSession = Depends
 
 
 @app.get("/api/villages/pins")
-async def get_village_pins(session: AsyncSession = Depends(get_session)):
+async def get_village_pins(response: Response, session: AsyncSession = Depends(get_session)):
     """FAST LOAD: Return enriched pin data - frontend loads geojson directly"""
     # Only return pin data enrichment - frontend loads static geojson file
     
@@ -543,11 +581,9 @@ async def get_village_pins(session: AsyncSession = Depends(get_session)):
     pins_result = await session.execute(select(VillagePin))
     pins_list = pins_result.scalars().all()
     
-    # Get custom labels for display
-    labels_result = await session.execute(
-        select(CustomLabel).order_by(CustomLabel.display_order)
-    )
-    labels = {label.label_key: label for label in labels_result.scalars().all()}
+    # Get custom labels for display (cached)
+    labels = {label["label_key"]: label for label in await custom_labels_cache.get()}
+    response.headers.update(version_header(custom_labels_cache))
     
     # Return pin enrichment data only (frontend merges with static geojson)
     pin_data = {}
@@ -564,18 +600,22 @@ async def get_village_pins(session: AsyncSession = Depends(get_session)):
         "pin_data": pin_data,
         "labels": {
             key: {
-                "value": label.label_value,
-                "singular": label.label_singular,
-                "icon": label.label_icon
+                "value": label["label_value"],
+                "singular": label["label_singular"],
+                "icon": label["label_icon"]
             }
             for key, label in labels.items()
         },
-        "geojson_url": "/static/geojson/bhadrak_villages.geojson"  # Tell frontend where to load
+        "geojson_url": "/api/geojson/villages?lod=1",  # Tell frontend where to load (~5 m detail)
+        # Same polygons, clipped and simplified per zoom, for tile-based clients;
+        # the map page itself still draws geojson_url
+        "tiles_url": "/tiles/{z}/{x}/{y}.json",
+        "tiles_max_zoom": geo_tiles.TILE_MAX_ZOOM
     }
 
 
 @app.get("/api/villages/{village_id}/details")
-async def get_village_pin_details(village_id: int, session: AsyncSession = Depends(get_session)):
+async def get_village_pin_details(village_id: int, response: Response, session: AsyncSession = Depends(get_session)):
     """Get detailed village info for modal"""
     # Get village basic info
     result = await session.execute(select(Village).where(Village.id == village_id))
@@ -590,11 +630,9 @@ async def get_village_pin_details(village_id: int, session: AsyncSession = Depen
     )
     pin = pin_result.scalar_one_or_none()
     
-    # Get custom labels
-    labels_result = await session.execute(
-        select(CustomLabel).order_by(CustomLabel.display_order)
-    )
-    labels = {label.label_key: label for label in labels_result.scalars().all()}
+    # Get custom labels (cached)
+    labels = {label["label_key"]: label for label in await custom_labels_cache.get()}
+    response.headers.update(version_header(custom_labels_cache))
     
     return {
         "id": village.id,
@@ -607,45 +645,45 @@ async def get_village_pin_details(village_id: int, session: AsyncSession = Depen
         "quick_links": json.loads(pin.quick_links) if pin and pin.quick_links else [],
         "labels": {
             key: {
-                "value": label.label_value,
-                "singular": label.label_singular,
-                "icon": label.label_icon
+                "value": label["label_value"],
+                "singular": label["label_singular"],
+                "icon": label["label_icon"]
             }
-            for key, label in labels.items() if label.show_in_modal
+            for key, label in labels.items() if label["show_in_modal"]
         }
     }
 
 
 @app.get("/api/custom-labels")
-async def get_custom_labels(session: AsyncSession = Depends(get_session)):
-    """Get all customizable labels for UI"""
-    result = await session.execute(select(CustomLabel).order_by(CustomLabel.display_order))
-    labels = result.scalars().all()
+async def get_custom_labels(response: Response):
+    """Get all customizable labels for UI (served from the config cache)"""
+    labels = await custom_labels_cache.get()
+    response.headers.update(version_header(custom_labels_cache))
     
     return [{
-        "key": label.label_key,
-        "value": label.label_value,
-        "singular": label.label_singular,
-        "icon": label.label_icon,
-        "show_in_tooltip": label.show_in_tooltip,
-        "show_in_modal": label.show_in_modal
+        "key": label["label_key"],
+        "value": label["label_value"],
+        "singular": label["label_singular"],
+        "icon": label["label_icon"],
+        "show_in_tooltip": label["show_in_tooltip"],
+        "show_in_modal": label["show_in_modal"]
     } for label in labels]
 
 
 @app.get("/api/blocks/colors")
-async def get_block_colors(session: AsyncSession = Depends(get_session)):
-    """Get visual settings for all blocks"""
-    result = await session.execute(select(BlockSettings))
-    blocks = result.scalars().all()
+async def get_block_colors(response: Response):
+    """Get visual settings for all blocks (served from the config cache)"""
+    blocks = await block_settings_cache.get()
+    response.headers.update(version_header(block_settings_cache))
     
     colors = {}
     for block in blocks:
-        colors[block.block_name] = {
-            "color": block.color,
-            "fillOpacity": block.fill_opacity,
-            "borderWidth": block.border_width,
-            "glowIntensity": block.glow_intensity,
-            "showBoundary": block.show_boundary
+        colors[block["block_name"]] = {
+            "color": block["color"],
+            "fillOpacity": block["fill_opacity"],
+            "borderWidth": block["border_width"],
+            "glowIntensity": block["glow_intensity"],
+            "showBoundary": block["show_boundary"]
         }
     
     return colors
@@ -735,73 +773,228 @@ async def create_report(
 # SEVA API ENDPOINTS
 # ============================================================
 
+def _as_naive_utc(value: datetime) -> datetime:
+    """Normalize a timestamp for comparison against the naive UTC columns."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _request_feed_item(req, village_name: Optional[str]) -> dict:
+    return {
+        "type": "request",
+        "id": req.id,
+        "seva_type": req.seva_type,
+        "urgency": req.urgency,
+        "status": req.status,
+        "title": req.title,
+        "village_name": village_name or "Unknown",
+        "requested_by": req.requested_by,
+        "created_at": req.created_at.isoformat()
+    }
+
+
+def _response_feed_item(resp, volunteer_name: Optional[str], seva_type: Optional[str]) -> dict:
+    return {
+        "type": "response",
+        "id": resp.id,
+        "volunteer_name": volunteer_name or "Unknown",
+        "seva_type": seva_type or "Unknown",
+        "status": resp.status,
+        "responded_at": resp.responded_at.isoformat()
+    }
+
+
+def _testimonial_feed_item(test, village_name: Optional[str]) -> dict:
+    return {
+        "type": "testimonial",
+        "id": test.id,
+        "author_name": test.author_name,
+        "content": test.content[:200],  # Truncate for feed
+        "seva_type": test.seva_type,
+        "village_name": village_name,
+        "created_at": test.created_at.isoformat()
+    }
+
+
+# Tie-break between feed item types sharing a timestamp (higher sorts first)
+FEED_TYPE_ORDER = {"request": 2, "response": 1, "testimonial": 0}
+
+
+def _parse_feed_cursor(cursor: str) -> tuple[datetime, str, int]:
+    """Decode a ``<timestamp>,<type>,<id>`` feed cursor."""
+    try:
+        timestamp_raw, item_type, id_raw = cursor.rsplit(",", 2)
+        if item_type not in FEED_TYPE_ORDER:
+            raise ValueError(item_type)
+        return _as_naive_utc(datetime.fromisoformat(timestamp_raw)), item_type, int(id_raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _feed_keyset(timestamp_column, id_column, item_type: str, cursor: tuple[datetime, str, int]):
+    """WHERE clause for rows of ``item_type`` that sort after ``cursor`` in the feed."""
+    cursor_at, cursor_type, cursor_id = cursor
+    if FEED_TYPE_ORDER[item_type] > FEED_TYPE_ORDER[cursor_type]:
+        return timestamp_column < cursor_at
+    if FEED_TYPE_ORDER[item_type] < FEED_TYPE_ORDER[cursor_type]:
+        return timestamp_column <= cursor_at
+    return or_(
+        timestamp_column < cursor_at,
+        and_(timestamp_column == cursor_at, id_column < cursor_id)
+    )
+
+
 @app.get("/api/seva/feed")
 async def get_seva_feed(
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     session: AsyncSession = Depends(get_session)
 ):
-    """Get real-time seva activity feed - requests, responses, testimonials"""
-    
-    # Get recent requests
-    requests_query = select(SevaRequest).order_by(SevaRequest.created_at.desc()).limit(limit)
-    result = await session.execute(requests_query)
-    requests = result.scalars().all()
-    
-    # Get recent responses
-    responses_query = select(SevaResponse).order_by(SevaResponse.responded_at.desc()).limit(limit)
-    result = await session.execute(responses_query)
-    responses = result.scalars().all()
-    
-    # Get recent testimonials
-    testimonials_query = select(Testimonial).where(Testimonial.verified == True).order_by(Testimonial.created_at.desc()).limit(limit)
-    result = await session.execute(testimonials_query)
-    testimonials = result.scalars().all()
-    
-    # Build unified feed
-    feed_items = []
-    
+    """Get real-time seva activity feed - requests, responses, testimonials
+
+    Built from three joined queries regardless of ``limit``. Items are
+    keyset-paginated on (timestamp, type, id), so rows sharing a timestamp
+    are never skipped; pass the returned ``next_cursor`` as ``cursor`` to
+    page back through older activity.
+    """
+    keyset = _parse_feed_cursor(cursor) if cursor else None
+
+    # Recent requests with their village name
+    requests_query = (
+        select(
+            SevaRequest.id,
+            SevaRequest.seva_type,
+            SevaRequest.urgency,
+            SevaRequest.status,
+            SevaRequest.title,
+            SevaRequest.requested_by,
+            SevaRequest.created_at,
+            Village.name.label("village_name")
+        )
+        .outerjoin(Village, SevaRequest.village_id == Village.id)
+        .order_by(SevaRequest.created_at.desc(), SevaRequest.id.desc())
+        .limit(limit)
+    )
+    if keyset:
+        requests_query = requests_query.where(
+            _feed_keyset(SevaRequest.created_at, SevaRequest.id, "request", keyset)
+        )
+    requests = (await session.execute(requests_query)).all()
+
+    # Recent responses with volunteer name and the request's seva type
+    responses_query = (
+        select(
+            SevaResponse.id,
+            SevaResponse.status,
+            SevaResponse.responded_at,
+            Member.full_name.label("volunteer_name"),
+            SevaRequest.seva_type
+        )
+        .outerjoin(Member, SevaResponse.volunteer_id == Member.id)
+        .outerjoin(SevaRequest, SevaResponse.request_id == SevaRequest.id)
+        .order_by(SevaResponse.responded_at.desc(), SevaResponse.id.desc())
+        .limit(limit)
+    )
+    if keyset:
+        responses_query = responses_query.where(
+            _feed_keyset(SevaResponse.responded_at, SevaResponse.id, "response", keyset)
+        )
+    responses = (await session.execute(responses_query)).all()
+
+    # Recent verified testimonials with their village name
+    testimonials_query = (
+        select(
+            Testimonial.id,
+            Testimonial.author_name,
+            Testimonial.content,
+            Testimonial.seva_type,
+            Testimonial.created_at,
+            Village.name.label("village_name")
+        )
+        .outerjoin(Village, Testimonial.village_id == Village.id)
+        .where(Testimonial.verified == True)
+        .order_by(Testimonial.created_at.desc(), Testimonial.id.desc())
+        .limit(limit)
+    )
+    if keyset:
+        testimonials_query = testimonials_query.where(
+            _feed_keyset(Testimonial.created_at, Testimonial.id, "testimonial", keyset)
+        )
+    testimonials = (await session.execute(testimonials_query)).all()
+
+    # Build unified feed, keeping the raw timestamp for ordering and the cursor
+    timed_items: list[tuple[datetime, dict]] = []
+
     for req in requests:
-        village = await session.get(Village, req.village_id)
-        feed_items.append({
-            "type": "request",
-            "id": req.id,
-            "seva_type": req.seva_type,
-            "urgency": req.urgency,
-            "status": req.status,
-            "title": req.title,
-            "village_name": village.name if village else "Unknown",
-            "requested_by": req.requested_by,
-            "created_at": req.created_at.isoformat()
-        })
-    
+        timed_items.append((req.created_at, _request_feed_item(req, req.village_name)))
+
     for resp in responses:
-        volunteer = await session.get(Member, resp.volunteer_id)
-        request_obj = await session.get(SevaRequest, resp.request_id)
-        feed_items.append({
-            "type": "response",
-            "id": resp.id,
-            "volunteer_name": volunteer.full_name if volunteer else "Unknown",
-            "seva_type": request_obj.seva_type if request_obj else "Unknown",
-            "status": resp.status,
-            "responded_at": resp.responded_at.isoformat()
-        })
-    
+        timed_items.append((resp.responded_at, _response_feed_item(resp, resp.volunteer_name, resp.seva_type)))
+
     for test in testimonials:
-        village = await session.get(Village, test.village_id) if test.village_id else None
-        feed_items.append({
-            "type": "testimonial",
-            "id": test.id,
-            "author_name": test.author_name,
-            "content": test.content[:200],  # Truncate for feed
-            "seva_type": test.seva_type,
-            "village_name": village.name if village else None,
-            "created_at": test.created_at.isoformat()
-        })
-    
-    # Sort all by timestamp
-    feed_items.sort(key=lambda x: x.get("created_at") or x.get("responded_at"), reverse=True)
-    
-    return {"feed": feed_items[:limit]}
+        timed_items.append((test.created_at, _testimonial_feed_item(test, test.village_name)))
+
+    # Sort all by the same (timestamp, type, id) key the cursor encodes
+    timed_items.sort(
+        key=lambda item: (_as_naive_utc(item[0]), FEED_TYPE_ORDER[item[1]["type"]], item[1]["id"]),
+        reverse=True
+    )
+    page = timed_items[:limit]
+
+    next_cursor = None
+    if len(page) == limit:
+        last_at, last = page[-1]
+        next_cursor = f"{last_at.isoformat()},{last['type']},{last['id']}"
+
+    return {
+        "feed": [item for _, item in page],
+        "next_cursor": next_cursor
+    }
+
+
+@app.get("/api/seva/stream")
+async def stream_seva_feed(request: Request):
+    """Live seva activity over Server-Sent Events
+
+    Emits ``request`` and ``response`` events with the same item shape as
+    /api/seva/feed. Reconnecting clients resume via ``Last-Event-ID``; a
+    ``reset`` event means the gap was too large and the feed should be refetched.
+    """
+    from fastapi.responses import StreamingResponse
+    from seva_stream import seva_hub, parse_last_event_id
+
+    last_event_id = parse_last_event_id(
+        request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id")
+    )
+    return StreamingResponse(
+        seva_hub.stream(last_event_id=last_event_id, is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+SEVA_REQUEST_FIELDS = {
+    "seva_type": SevaRequest.seva_type,
+    "urgency": SevaRequest.urgency,
+    "status": SevaRequest.status,
+    "title": SevaRequest.title,
+    "description": SevaRequest.description,
+    "contact_phone": SevaRequest.contact_phone,
+    "requested_by": SevaRequest.requested_by,
+    "village_name": Village.name,
+    "village_id": SevaRequest.village_id,
+    "assigned_volunteer": Member.full_name,
+}
+
+
+def _parse_seva_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a ``<created_at>,<id>`` keyset cursor."""
+    try:
+        created_raw, id_raw = cursor.rsplit(",", 1)
+        return _as_naive_utc(datetime.fromisoformat(created_raw)), int(id_raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 @app.get("/api/seva/requests")
@@ -810,10 +1003,35 @@ async def get_seva_requests(
     seva_type: Optional[str] = None,
     urgency: Optional[str] = None,
     village_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     session: AsyncSession = Depends(get_session)
 ):
-    """Get seva requests with filters"""
-    query = select(SevaRequest)
+    """Get seva requests with filters
+
+    Results are keyset-paginated on (created_at, id); pass the returned
+    ``next_cursor`` as ``cursor`` for the next page. ``fields`` is an optional
+    comma-separated projection, e.g. ``fields=title,status,village_id`` to skip
+    the description text. ``id`` and ``created_at`` are always included.
+    """
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in requested if f not in SEVA_REQUEST_FIELDS and f not in ("id", "created_at")]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        selected = [f for f in SEVA_REQUEST_FIELDS if f in requested]
+    else:
+        selected = list(SEVA_REQUEST_FIELDS)
+
+    columns = [SevaRequest.id, SevaRequest.created_at] + [
+        SEVA_REQUEST_FIELDS[name].label(name) for name in selected
+    ]
+    query = select(*columns)
+    if "village_name" in selected:
+        query = query.outerjoin(Village, SevaRequest.village_id == Village.id)
+    if "assigned_volunteer" in selected:
+        query = query.outerjoin(Member, SevaRequest.assigned_to_id == Member.id)
     
     if status:
         query = query.where(SevaRequest.status == status)
@@ -823,32 +1041,70 @@ async def get_seva_requests(
         query = query.where(SevaRequest.urgency == urgency)
     if village_id:
         query = query.where(SevaRequest.village_id == village_id)
+    if cursor:
+        cursor_created_at, cursor_id = _parse_seva_cursor(cursor)
+        query = query.where(or_(
+            SevaRequest.created_at < cursor_created_at,
+            and_(SevaRequest.created_at == cursor_created_at, SevaRequest.id < cursor_id)
+        ))
     
-    query = query.order_by(SevaRequest.created_at.desc())
-    result = await session.execute(query)
-    requests = result.scalars().all()
+    query = query.order_by(SevaRequest.created_at.desc(), SevaRequest.id.desc()).limit(limit)
+    rows = (await session.execute(query)).all()
     
     items = []
-    for req in requests:
-        village = await session.get(Village, req.village_id)
-        assigned_volunteer = await session.get(Member, req.assigned_to_id) if req.assigned_to_id else None
-        
-        items.append({
-            "id": req.id,
-            "seva_type": req.seva_type,
-            "urgency": req.urgency,
-            "status": req.status,
-            "title": req.title,
-            "description": req.description,
-            "contact_phone": req.contact_phone,
-            "requested_by": req.requested_by,
-            "village_name": village.name if village else "Unknown",
-            "village_id": req.village_id,
-            "assigned_volunteer": assigned_volunteer.full_name if assigned_volunteer else None,
-            "created_at": req.created_at.isoformat()
-        })
+    for row in rows:
+        item = {"id": row.id}
+        for name in selected:
+            value = getattr(row, name)
+            if name == "village_name" and value is None:
+                value = "Unknown"
+            item[name] = value
+        item["created_at"] = row.created_at.isoformat()
+        items.append(item)
+    
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = f"{last.created_at.isoformat()},{last.id}"
+    
+    return {"requests": items, "next_cursor": next_cursor}
+
+
+@app.get("/api/seva/requests/{request_id}/matches")
+async def get_seva_matches(
+    request_id: int,
+    k: int = Query(5, ge=1, le=50),
+    user_data: dict = Depends(require_block_coordinator),
+    session: AsyncSession = Depends(get_session)
+):
+    """Nearest available, verified volunteers for a seva request
     
-    return {"requests": items}
+    Ranked by distance between village centroids plus a load-balancing
+    penalty for recent and frequent sevas (see volunteer_matching.py).
+    Volunteers who already responded to the request are skipped.
+    """
+    seva_request = await session.get(SevaRequest, request_id)
+    if not seva_request:
+        raise HTTPException(status_code=404, detail="Seva request not found")
+    village = await session.get(Village, seva_request.village_id)
+    if not village or village.lat is None or village.lng is None:
+        raise HTTPException(status_code=404, detail="Request village has no location")
+    
+    responded = await session.execute(
+        select(SevaResponse.volunteer_id).where(SevaResponse.request_id == request_id)
+    )
+    index = await volunteer_index_cache.get()
+    matches = index.nearest(
+        seva_request.seva_type, village.lat, village.lng, k=k,
+        exclude=frozenset(responded.scalars().all())
+    )
+    
+    return {
+        "request_id": request_id,
+        "seva_type": seva_request.seva_type,
+        "village_id": village.id,
+        "matches": matches
+    }
 
 
 @app.post("/api/seva/request")
@@ -879,6 +1135,11 @@ async def create_seva_request(
     session.add(seva_request)
     await session.commit()
     await session.refresh(seva_request)
+    block_stats_scheduler.notify_write()
+    
+    from seva_stream import seva_hub
+    village = await session.get(Village, seva_request.village_id)
+    seva_hub.publish("request", _request_feed_item(seva_request, village.name if village else None))
     
     return {
         "status": "success",
@@ -907,14 +1168,32 @@ async def respond_to_seva(
     session.add(seva_response)
     
     # Update request status to assigned
+    now = datetime.now(timezone.utc)
     seva_request = await session.get(SevaRequest, request_id)
     if seva_request:
         seva_request.status = "assigned"
         seva_request.assigned_to_id = volunteer_id
-        seva_request.updated_at = datetime.now(timezone.utc)
+        seva_request.updated_at = now
+    
+    # Track volunteer load so matching spreads requests around
+    volunteer = await session.get(Member, volunteer_id)
+    if volunteer:
+        volunteer.total_seva_count = (volunteer.total_seva_count or 0) + 1
+        volunteer.last_seva_date = now
     
     await session.commit()
     
+    from seva_stream import seva_hub
+    await session.refresh(seva_response)
+    block_stats_scheduler.notify_write()
+    # Load changes ranking, so every worker reloads the index like other member writes
+    await volunteer_index_cache.invalidate()
+    seva_hub.publish("response", _response_feed_item(
+        seva_response,
+        volunteer.full_name if volunteer else None,
+        seva_request.seva_type if seva_request else None
+    ))
+    
     return {
         "status": "success",
         "message": "Response recorded"
@@ -1077,6 +1356,8 @@ async def create_member(
     )
     session.add(member)
     await session.commit()
+    block_stats_scheduler.notify_write()
+    await volunteer_index_cache.invalidate()
     
     audit = Audit(
         table_name="members",
@@ -1105,6 +1386,8 @@ async def verify_member(
     member.verified = True
     member.updated_at = datetime.now(timezone.utc)
     await session.commit()
+    block_stats_scheduler.notify_write()
+    await volunteer_index_cache.invalidate()
     
     audit = Audit(
         table_name="members",
@@ -1188,6 +1471,8 @@ async def update_village_coords(
     village.updated_at = datetime.now(timezone.utc)
     
     await session.commit()
+    block_stats_scheduler.notify_write()
+    await volunteer_index_cache.invalidate()
     
     audit = Audit(
         table_name="villages",
@@ -1252,6 +1537,7 @@ async def update_block_settings(
     
     block.updated_at = datetime.now(timezone.utc)
     await session.commit()
+    await block_settings_cache.invalidate()
     
     # Audit log
     audit = Audit(
@@ -1279,10 +1565,10 @@ async def admin_blocks_page(
 
 
 @app.get("/api/map-settings")
-async def get_map_settings(session: AsyncSession = Depends(get_session)):
-    """Get current map visualization settings"""
-    result = await session.execute(select(MapSettings))
-    settings = result.scalar_one_or_none()
+async def get_map_settings(response: Response):
+    """Get current map visualization settings (served from the config cache)"""
+    settings = await map_settings_cache.get()
+    response.headers.update(version_header(map_settings_cache))
     
     # Return defaults if no settings exist
     if not settings:
@@ -1300,16 +1586,16 @@ async def get_map_settings(session: AsyncSession = Depends(get_session)):
         }
     
     return {
-        "metric_name": settings.metric_name,
-        "color_scheme": settings.color_scheme,
-        "show_villages": settings.show_villages,
-        "show_blocks": settings.show_blocks,
-        "village_point_color": settings.village_point_color,
-        "pin_style": settings.pin_style,
-        "pin_color_scheme": settings.pin_color_scheme,
-        "pin_color_metric": settings.pin_color_metric,
-        "show_pins": settings.show_pins,
-        "dot_style": settings.dot_style
+        "metric_name": settings["metric_name"],
+        "color_scheme": settings["color_scheme"],
+        "show_villages": settings["show_villages"],
+        "show_blocks": settings["show_blocks"],
+        "village_point_color": settings["village_point_color"],
+        "pin_style": settings["pin_style"],
+        "pin_color_scheme": settings["pin_color_scheme"],
+        "pin_color_metric": settings["pin_color_metric"],
+        "show_pins": settings["show_pins"],
+        "dot_style": settings["dot_style"]
     }
 
 
@@ -1354,6 +1640,7 @@ async def update_map_settings(
     settings.updated_at = datetime.now(timezone.utc)
     
     await session.commit()
+    await map_settings_cache.invalidate()
     
     return {"status": "success", "message": "Settings updated successfully"}
 
@@ -1363,51 +1650,78 @@ async def update_map_settings(
 # ============================================================
 
 @app.get("/api/blocks")
-async def get_blocks():
-    """Get all block boundaries (GeoJSON) for Phase 2"""
-    import logging
-    logger = logging.getLogger(__name__)
-    try:
-        with open('static/geojson/bhadrak_blocks.geojson', 'r', encoding='utf-8') as f:
-            blocks_data = json.load(f)
-        return blocks_data
-    except FileNotFoundError:
-        logger.error("GeoJSON file not found: static/geojson/bhadrak_blocks.geojson")
-        raise HTTPException(status_code=500, detail="Block boundaries file not found")
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in blocks GeoJSON file: {e}")
-        raise HTTPException(status_code=500, detail="Invalid block boundaries data")
-    except Exception as e:
-        logger.error(f"Error loading blocks GeoJSON: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Error loading block boundaries")
+async def get_blocks(
+    request: Request,
+    lod: Optional[int] = Query(None, ge=0, le=MAX_LOD),
+    zoom: Optional[int] = Query(None, ge=0, le=22),
+    output_format: str = Query("geojson", alias="format", pattern="^(geojson|topojson)$")
+):
+    """Get all block boundaries (GeoJSON, or TopoJSON with format=topojson) for Phase 2"""
+    await _sync_static_geo_version()
+    return await _serve_geo_artifact("blocks", request, "Block boundaries", resolve_lod(lod, zoom), output_format)
+
+
+@app.get("/api/geojson/boundary")
+async def get_district_boundary(
+    request: Request,
+    lod: Optional[int] = Query(None, ge=0, le=MAX_LOD),
+    zoom: Optional[int] = Query(None, ge=0, le=22)
+):
+    """District outline, served compressed with an ETag"""
+    await _sync_static_geo_version()
+    return await _serve_geo_artifact("boundary", request, "District boundary", resolve_lod(lod, zoom))
 
 
 @app.get("/api/blocks/statistics")
 async def get_block_statistics(session: AsyncSession = Depends(get_session)):
-    """Get real-time statistics for all blocks (Phase 2)"""
+    """Get statistics for all blocks (Phase 2)
+
+    Read-only: rows are kept fresh by the background scheduler in
+    block_statistics.py. Stale rows only nudge the scheduler; the request
+    never writes or waits on aggregation.
+    """
+    from block_statistics import load_block_features
     result = await session.execute(select(BlockStatistics))
     stats = result.scalars().all()
     
-    # If no stats exist, create default ones from blocks GeoJSON
-    if not stats:
+    if stats:
+        rows = [{
+            "block_name": s.block_name,
+            "block_code": s.block_code,
+            "total_villages": s.total_villages,
+            "population": s.population,
+            "active_seva_requests": s.active_seva_requests,
+            "total_seva_requests": s.total_seva_requests,
+            "fulfilled_seva_count": s.fulfilled_seva_count,
+            "avg_response_time_hours": s.avg_response_time_hours,
+            "testimonial_count": s.testimonial_count,
+            "villages_with_members": s.villages_with_members,
+            "total_volunteers": s.total_volunteers,
+            "coverage_percentage": s.coverage_percentage,
+            "activity_level": s.activity_level,
+            "activity_color": s.activity_color,
+            "seva_density": s.seva_density,
+            "population_density": s.population_density,
+            "last_calculated": s.last_calculated.isoformat() if s.last_calculated else None
+        } for s in stats]
+        last_calculated = min((s.last_calculated for s in stats if s.last_calculated), default=None)
+    else:
+        # Not computed yet: serve placeholders from the blocks GeoJSON
         import logging
         logger = logging.getLogger(__name__)
         try:
-            with open('static/geojson/bhadrak_blocks.geojson', 'r', encoding='utf-8') as f:
-                blocks_data = json.load(f)
+            features = load_block_features()
         except FileNotFoundError:
             logger.error("GeoJSON file not found: static/geojson/bhadrak_blocks.geojson")
             return []
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in blocks GeoJSON file: {e}")
             return []
-        except Exception as e:
-            logger.error(f"Error loading blocks GeoJSON: {e}", exc_info=True)
-            return []
         
-        for feature in blocks_data['features']:
+        rows = []
+        for feature in features:
             props = feature['properties']
-            block_stat = BlockStatistics(
+            defaults = BlockStatistics(
                 block_name=props['name'],
                 block_code=props.get('block_code', props['name'][:3].upper()),
                 total_villages=props.get('villages', 0),
@@ -1415,31 +1729,18 @@ async def get_block_statistics(session: AsyncSession = Depends(get_session)):
                 activity_level="medium",
                 activity_color="#f59e0b"
             )
-            session.add(block_stat)
-        
-        await session.commit()
-        result = await session.execute(select(BlockStatistics))
-        stats = result.scalars().all()
+            row = defaults.model_dump(exclude={"id", "updated_at"})
+            row["last_calculated"] = None
+            rows.append(row)
+        last_calculated = None
     
-    return [{
-        "block_name": s.block_name,
-        "block_code": s.block_code,
-        "total_villages": s.total_villages,
-        "population": s.population,
-        "active_seva_requests": s.active_seva_requests,
-        "total_seva_requests": s.total_seva_requests,
-        "fulfilled_seva_count": s.fulfilled_seva_count,
-        "avg_response_time_hours": s.avg_response_time_hours,
-        "testimonial_count": s.testimonial_count,
-        "villages_with_members": s.villages_with_members,
-        "total_volunteers": s.total_volunteers,
-        "coverage_percentage": s.coverage_percentage,
-        "activity_level": s.activity_level,
-        "activity_color": s.activity_color,
-        "seva_density": s.seva_density,
-        "population_density": s.population_density,
-        "last_calculated": s.last_calculated.isoformat() if s.last_calculated else None
-    } for s in stats]
+    if block_stats_scheduler.is_stale(last_calculated):
+        block_stats_scheduler.request_refresh()
+    
+    return JSONResponse(content=rows, headers={
+        "X-Stats-Last-Calculated": last_calculated.isoformat() if last_calculated else "",
+        "X-Stats-Max-Staleness": str(int(block_stats_scheduler.max_staleness))
+    })
 
 
 @app.post("/admin/api/blocks/statistics/refresh")
@@ -1448,111 +1749,44 @@ async def refresh_block_statistics(
     session: AsyncSession = Depends(get_session)
 ):
     """Refresh block statistics by calculating from live data (Phase 2)"""
-    from sqlalchemy import func
+    from block_statistics import refresh_all_block_statistics
     import logging
     logger = logging.getLogger(__name__)
     
-    # Get all blocks
     try:
-        with open('static/geojson/bhadrak_blocks.geojson', 'r', encoding='utf-8') as f:
-            blocks_data = json.load(f)
+        await refresh_all_block_statistics(session)
     except FileNotFoundError:
         logger.error("GeoJSON file not found: static/geojson/bhadrak_blocks.geojson")
         raise HTTPException(status_code=500, detail="Block boundaries file not found")
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON in blocks GeoJSON file: {e}")
         raise HTTPException(status_code=500, detail="Invalid block boundaries data")
-    except Exception as e:
-        logger.error(f"Error loading blocks GeoJSON: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Error loading block boundaries")
     
-    for feature in blocks_data['features']:
-        block_name = feature['properties']['name']
-        
-        # Get or create block statistics
-        result = await session.execute(
-            select(BlockStatistics).where(BlockStatistics.block_name == block_name)
-        )
-        block_stat = result.scalar_one_or_none()
-        
-        if not block_stat:
-            block_stat = BlockStatistics(
-                block_name=block_name,
-                block_code=feature['properties'].get('block_code', block_name[:3].upper())
-            )
-            session.add(block_stat)
-        
-        # Calculate statistics
-        # Total villages in this block
-        village_count = await session.execute(
-            select(func.count(Village.id)).where(Village.block == block_name)
-        )
-        block_stat.total_villages = village_count.scalar() or 0
-        
-        # Population
-        pop_sum = await session.execute(
-            select(func.sum(Village.population)).where(Village.block == block_name)
-        )
-        block_stat.population = int(pop_sum.scalar() or 0)
-        
-        # Seva requests (active and total)
-        active_count = await session.execute(
-            select(func.count(SevaRequest.id))
-            .join(Village, SevaRequest.village_id == Village.id)
-            .where(Village.block == block_name)
-            .where(SevaRequest.status.in_(["open", "assigned", "in_progress"]))
-        )
-        block_stat.active_seva_requests = active_count.scalar() or 0
-        
-        total_count = await session.execute(
-            select(func.count(SevaRequest.id))
-            .join(Village, SevaRequest.village_id == Village.id)
-            .where(Village.block == block_name)
-        )
-        block_stat.total_seva_requests = total_count.scalar() or 0
-        
-        fulfilled_count = await session.execute(
-            select(func.count(SevaRequest.id))
-            .join(Village, SevaRequest.village_id == Village.id)
-            .where(Village.block == block_name)
-            .where(SevaRequest.status == "fulfilled")
-        )
-        block_stat.fulfilled_seva_count = fulfilled_count.scalar() or 0
-        
-        # Coverage
-        volunteers_count = await session.execute(
-            select(func.count(Member.id))
-            .join(Village, Member.village_id == Village.id)
-            .where(Village.block == block_name)
-            .where(Member.verified == True)
-        )
-        block_stat.total_volunteers = volunteers_count.scalar() or 0
-        
-        # Calculate activity level
-        active_reqs = block_stat.active_seva_requests
-        if active_reqs >= 10:
-            block_stat.activity_level = "high"
-            block_stat.activity_color = "#10b981"  # Green
-        elif active_reqs >= 5:
-            block_stat.activity_level = "medium"
-            block_stat.activity_color = "#f59e0b"  # Yellow
-        elif active_reqs >= 1:
-            block_stat.activity_level = "low"
-            block_stat.activity_color = "#f97316"  # Orange
-        else:
-            block_stat.activity_level = "none"
-            block_stat.activity_color = "#9ca3af"  # Gray
-        
-        # Heat map metrics (Phase 3)
-        if block_stat.population > 0:
-            block_stat.seva_density = (block_stat.total_seva_requests / block_stat.population) * 1000
-        
-        block_stat.last_calculated = datetime.now(timezone.utc)
-    
-    await session.commit()
     return {"status": "success", "message": "Block statistics refreshed"}
 
 
+@app.post("/admin/api/cache/invalidate")
+async def invalidate_cache(
+    namespace: str = Form(...),
+    admin_data: dict = Depends(require_super_admin)
+):
+    """Invalidate a cache namespace in every worker (e.g. after replacing a GeoJSON file)"""
+    from cache_backend import cache_backend
+    config_caches = {
+        cache.name: cache
+        for cache in (custom_labels_cache, map_settings_cache, block_settings_cache, form_fields_cache, about_page_cache, volunteer_index_cache)
+    }
+    if namespace in config_caches:
+        await config_caches[namespace].invalidate()
+    elif namespace == STATIC_GEO_NAMESPACE:
+        await cache_backend.bump(namespace)
+    else:
+        valid = ", ".join(sorted([*config_caches, STATIC_GEO_NAMESPACE]))
+        raise HTTPException(status_code=400, detail=f"Unknown cache namespace. Valid: {valid}")
+    
+    return {"success": True, "namespace": namespace, "version": cache_backend.known_version(namespace)}
+
+
 @app.post("/admin/settings/map")
 async def save_map_settings(
     request: Request,
@@ -1584,6 +1818,7 @@ async def save_map_settings(
         settings.updated_at = datetime.now(timezone.utc)
     
     await session.commit()
+    await map_settings_cache.invalidate()
     
     # Audit log
     audit = Audit(
@@ -1668,98 +1903,48 @@ async def create_doctor(
     return RedirectResponse(url="/admin/doctors", status_code=303)
 
 
-@app.post("/admin/bulk/villages")
+@app.post("/admin/bulk/villages", status_code=202)
 async def bulk_upload_villages(
     file: UploadFile = File(...),
     admin=Depends(get_current_admin),
     session: AsyncSession = Depends(get_session)
 ):
-    content = await file.read()
-    csv_file = io.StringIO(content.decode('utf-8'))
-    reader = csv.DictReader(csv_file)
-    
-    inserted = 0
-    errors = []
-    
-    for row in reader:
-        try:
-            result = await session.execute(
-                select(Village).where(Village.name == row['name'], Village.block == row['block'])
-            )
-            existing = result.scalar_one_or_none()
-            
-            if existing:
-                existing.lat = float(row['lat'])
-                existing.lng = float(row['lng'])
-                existing.south = float(row['south'])
-                existing.west = float(row['west'])
-                existing.north = float(row['north'])
-                existing.east = float(row['east'])
-                existing.code_2011 = row.get('code_2011', '')
-            else:
-                village = Village(
-                    name=row['name'],
-                    block=row['block'],
-                    lat=float(row['lat']),
-                    lng=float(row['lng']),
-                    south=float(row['south']),
-                    west=float(row['west']),
-                    north=float(row['north']),
-                    east=float(row['east']),
-                    code_2011=row.get('code_2011', '')
-                )
-                session.add(village)
-            
-            inserted += 1
-        except Exception as e:
-            errors.append(f"Row {row.get('name', '?')}: {str(e)}")
-    
-    await session.commit()
-    
-    return {"inserted": inserted, "errors": errors}
+    """Queue a village CSV import; poll /admin/bulk/jobs/{id} for progress (see import_jobs.py)"""
+    from import_jobs import import_runner, job_status
+    job = await import_runner.create_job(session, "villages", file, created_by=admin["email"])
+    return {**job_status(job), "status_url": f"/admin/bulk/jobs/{job.id}"}
 
 
-@app.post("/admin/bulk/members")
+@app.post("/admin/bulk/members", status_code=202)
 async def bulk_upload_members(
     file: UploadFile = File(...),
     verify_on_import: bool = Form(False),
     admin=Depends(get_current_admin),
     session: AsyncSession = Depends(get_session)
 ):
-    content = await file.read()
-    csv_file = io.StringIO(content.decode('utf-8'))
-    reader = csv.DictReader(csv_file)
-    
-    inserted = 0
-    errors = []
-    
-    for row in reader:
-        try:
-            result = await session.execute(
-                select(Village).where(Village.name == row['village'])
-            )
-            village = result.scalar_one_or_none()
-            
-            if not village:
-                errors.append(f"{row['full_name']}: Village '{row['village']}' not found")
-                continue
-            
-            member = Member(
-                full_name=row['full_name'],
-                role=row['role'],
-                phone=row['phone'],
-                languages=row.get('languages', ''),
-                village_id=village.id,
-                verified=verify_on_import
-            )
-            session.add(member)
-            inserted += 1
-        except Exception as e:
-            errors.append(f"{row.get('full_name', '?')}: {str(e)}")
-    
-    await session.commit()
-    
-    return {"inserted": inserted, "errors": errors}
+    """Queue a member CSV import; poll /admin/bulk/jobs/{id} for progress"""
+    from import_jobs import import_runner, job_status
+    job = await import_runner.create_job(
+        session, "members", file,
+        created_by=admin["email"],
+        options={"verify_on_import": verify_on_import}
+    )
+    return {**job_status(job), "status_url": f"/admin/bulk/jobs/{job.id}"}
+
+
+@app.get("/admin/bulk/jobs/{job_id}")
+async def get_import_job(
+    job_id: int,
+    admin=Depends(get_current_admin),
+    session: AsyncSession = Depends(get_session)
+):
+    """Progress of a bulk import: rows processed, errors and throughput"""
+    from import_jobs import job_status
+    from models import ImportJob
+    job = await session.get(ImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job_status(job)
 
 
 if __name__ == "__main__":
@@ -2049,25 +2234,21 @@ async def field_worker_new_page(
 
 @app.get("/api/form-fields")
 async def get_form_fields(
-    user_data: dict = Depends(require_block_coordinator),
-    session: AsyncSession = Depends(get_session)
+    response: Response,
+    user_data: dict = Depends(require_block_coordinator)
 ):
-    """Get form field configuration for Field Worker form"""
-    result = await session.execute(
-        select(FormFieldConfig)
-        .where(FormFieldConfig.is_visible == True)
-        .order_by(FormFieldConfig.display_order)
-    )
-    fields = result.scalars().all()
+    """Get form field configuration for Field Worker form (served from the config cache)"""
+    fields = [f for f in await form_fields_cache.get() if f["is_visible"]]
+    response.headers.update(version_header(form_fields_cache))
     
     return [{
-        "field_name": f.field_name,
-        "field_label": f.field_label,
-        "field_type": f.field_type,
-        "is_required": f.is_required,
-        "placeholder": f.placeholder,
-        "help_text": f.help_text,
-        "options": f.options
+        "field_name": f["field_name"],
+        "field_label": f["field_label"],
+        "field_type": f["field_type"],
+        "is_required": f["is_required"],
+        "placeholder": f["placeholder"],
+        "help_text": f["help_text"],
+        "options": f["options"]
     } for f in fields]
 
 
@@ -2142,6 +2323,13 @@ async def submit_field_worker(
 
     block_name = incoming_block or resolve_user_block(user, user_data)
 
+    # Optional device location: picks the village when none was chosen from the list
+    try:
+        lat_raw, lng_raw = data.get('lat'), data.get('lng')
+        point = (float(lat_raw), float(lng_raw)) if lat_raw not in (None, "") and lng_raw not in (None, "") else None
+    except (TypeError, ValueError):
+        point = None
+
     village: Village | None = None
     if village_id_raw:
         try:
@@ -2157,6 +2345,14 @@ async def submit_field_worker(
             if village:
                 block_name = village.block
 
+    if not village and point:
+        hit, village = await locate_village(session, *point)
+        if not village and hit:
+            # Inside a known polygon whose village isn't in the table yet
+            village = await _create_village_from_feature(session, hit["index"])
+        if village:
+            block_name = village.block
+
     if not village:
         if not block_name:
             raise HTTPException(
@@ -2177,7 +2373,14 @@ async def submit_field_worker(
             )
             block_villages = block_lookup.scalars().all()
 
-            if block_villages:
+            if point:
+                # Outside every known polygon: pin it where the worker is
+                lat, lng = point
+                south = lat - 0.005
+                west = lng - 0.005
+                north = lat + 0.005
+                east = lng + 0.005
+            elif block_villages:
                 lat = sum(v.lat for v in block_villages) / len(block_villages)
                 lng = sum(v.lng for v in block_villages) / len(block_villages)
                 south = min(v.south for v in block_villages)
@@ -2194,9 +2397,8 @@ async def submit_field_worker(
                     north = static_bounds['north']
                     east = static_bounds['east']
                 else:
-                    # Fallback to Bhadrak centroid if no data at all
-                    lat = 21.054
-                    lng = 86.52
+                    # Fallback to the district centre if no data at all
+                    lat, lng = (await geo_index.load_village_index(await ensure_static_village_features())).center()
                     south = lat - 0.02
                     west = lng - 0.02
                     north = lat + 0.02
@@ -2228,7 +2430,8 @@ async def submit_field_worker(
 
 
     static_bounds = await get_block_bounds_from_static(block_name)
-    if static_bounds and abs(village.lat - 21.054) < 0.0005 and abs(village.lng - 86.52) < 0.0005:
+    default_lat, default_lng = geo_index.DEFAULT_CENTER
+    if static_bounds and abs(village.lat - default_lat) < 0.0005 and abs(village.lng - default_lng) < 0.0005:
         village.lat = static_bounds['lat']
         village.lng = static_bounds['lng']
         village.south = static_bounds['south']
@@ -2284,6 +2487,8 @@ async def submit_field_worker(
     )
     
     session.add(field_worker)
+    from analytics import bump_field_worker
+    await bump_field_worker(session, field_worker, None, 'pending')
     await session.commit()
     await session.refresh(field_worker)
     
@@ -2386,6 +2591,8 @@ async def delete_field_worker(
             detail=f"Cannot delete {fw.status} submissions. Only pending submissions can be deleted."
         )
     
+    from analytics import bump_field_worker
+    await bump_field_worker(session, fw, fw.status, None)
     await session.delete(fw)
     await session.commit()
     
@@ -2469,6 +2676,8 @@ async def approve_field_worker(
             detail=f"Cannot approve {fw.status} submission. Only pending submissions can be approved."
         )
     
+    from analytics import bump_field_worker
+    await bump_field_worker(session, fw, fw.status, 'approved')
     fw.status = 'approved'
     fw.approved_by = admin_data.get('email')
     fw.approved_at = datetime.now(timezone.utc)
@@ -2500,6 +2709,8 @@ async def reject_field_worker(
             detail=f"Cannot reject {fw.status} submission. Only pending submissions can be rejected."
         )
     
+    from analytics import bump_field_worker
+    await bump_field_worker(session, fw, fw.status, 'rejected')
     fw.status = 'rejected'
     fw.rejection_reason = rejection_reason
     fw.approved_by = admin_data.get('email')
@@ -2789,6 +3000,10 @@ async def delete_user(
 # PHASE 4: DATA EXPORT SYSTEM
 # ============================================================
 
+def _export_date(value: Optional[datetime], default: str = '') -> str:
+    return value.strftime('%Y-%m-%d') if value else default
+
+
 @app.get("/api/export/field-workers")
 async def export_field_workers(
     user_data: dict = Depends(require_block_coordinator),
@@ -2796,69 +3011,64 @@ async def export_field_workers(
 ):
     """Export Field Workers to CSV"""
     from fastapi.responses import StreamingResponse
-    import csv
-    from io import StringIO
+    from data_export import stream_csv
     
     # Get user
     user_result = await session.execute(select(User).where(User.email == user_data.get('email')))
     user = user_result.scalar_one_or_none()
     
+    columns = (
+        FieldWorker.id, FieldWorker.full_name, FieldWorker.phone, FieldWorker.alternate_phone,
+        FieldWorker.email, Village.name.label('village_name'), Village.block.label('block_name'),
+        FieldWorker.designation, FieldWorker.department, FieldWorker.employee_id,
+        FieldWorker.status, FieldWorker.created_at, FieldWorker.approved_by, FieldWorker.approved_at
+    )
+    
     # Query based on role
     if user.role == 'super_admin':
         # Admin: All Field Workers
-        result = await session.execute(
-            select(FieldWorker, Village.name.label('village_name'), Village.block.label('block_name'), User.full_name.label('submitted_by'))
+        stmt = (
+            select(*columns, User.full_name.label('submitted_by'))
             .join(Village, FieldWorker.village_id == Village.id)
             .join(User, FieldWorker.submitted_by_user_id == User.id)
             .order_by(FieldWorker.created_at.desc())
         )
-    else:
-        # Coordinator: Own submissions only
-        result = await session.execute(
-            select(FieldWorker, Village.name.label('village_name'), Village.block.label('block_name'))
-            .join(Village, FieldWorker.village_id == Village.id)
-            .where(FieldWorker.submitted_by_user_id == user.id)
-            .order_by(FieldWorker.created_at.desc())
-        )
-    
-    # Create CSV
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Header
-    if user.role == 'super_admin':
-        writer.writerow([
+        header = [
             'ID', 'Full Name', 'Phone', 'Alternate Phone', 'Email',
             'Village', 'Block', 'Designation', 'Department', 'Employee ID',
             'Status', 'Submitted By', 'Submitted Date', 'Approved By', 'Approved Date'
-        ])
+        ]
         
-        for fw, village_name, block_name, submitted_by in result.all():
-            writer.writerow([
+        def format_row(fw):
+            return [
                 fw.id, fw.full_name, fw.phone, fw.alternate_phone or '', fw.email or '',
-                village_name, block_name, fw.designation, fw.department or '', fw.employee_id or '',
-                fw.status, submitted_by, fw.created_at.strftime('%Y-%m-%d'),
-                fw.approved_by or '', fw.approved_at.strftime('%Y-%m-%d') if fw.approved_at else ''
-            ])
+                fw.village_name, fw.block_name, fw.designation, fw.department or '', fw.employee_id or '',
+                fw.status, fw.submitted_by, _export_date(fw.created_at),
+                fw.approved_by or '', _export_date(fw.approved_at)
+            ]
     else:
-        writer.writerow([
+        # Coordinator: Own submissions only
+        stmt = (
+            select(*columns)
+            .join(Village, FieldWorker.village_id == Village.id)
+            .where(FieldWorker.submitted_by_user_id == user.id)
+            .order_by(FieldWorker.created_at.desc())
+        )
+        header = [
             'ID', 'Full Name', 'Phone', 'Alternate Phone', 'Email',
             'Village', 'Block', 'Designation', 'Department', 'Employee ID',
             'Status', 'Submitted Date', 'Approved Date'
-        ])
+        ]
         
-        for fw, village_name, block_name in result.all():
-            writer.writerow([
+        def format_row(fw):
+            return [
                 fw.id, fw.full_name, fw.phone, fw.alternate_phone or '', fw.email or '',
-                village_name, block_name, fw.designation, fw.department or '', fw.employee_id or '',
-                fw.status, fw.created_at.strftime('%Y-%m-%d'),
-                fw.approved_at.strftime('%Y-%m-%d') if fw.approved_at else ''
-            ])
-    
-    output.seek(0)
+                fw.village_name, fw.block_name, fw.designation, fw.department or '', fw.employee_id or '',
+                fw.status, _export_date(fw.created_at), _export_date(fw.approved_at)
+            ]
     
     return StreamingResponse(
-        iter([output.getvalue()]),
+        stream_csv(stmt, header, format_row),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=field_workers_export.csv"}
     )
@@ -2866,44 +3076,83 @@ async def export_field_workers(
 
 @app.get("/api/export/users")
 async def export_users(
-    admin_data: dict = Depends(require_super_admin),
-    session: AsyncSession = Depends(get_session)
+    admin_data: dict = Depends(require_super_admin)
 ):
     """Export users to CSV (admin only)"""
     from fastapi.responses import StreamingResponse
-    import csv
-    from io import StringIO
-    
-    result = await session.execute(select(User).order_by(User.created_at.desc()))
-    users = result.scalars().all()
+    from data_export import stream_csv
     
-    output = StringIO()
-    writer = csv.writer(output)
+    stmt = select(
+        User.id, User.full_name, User.email, User.phone, User.role, User.primary_block,
+        User.assigned_blocks, User.is_active, User.rejection_reason, User.created_at,
+        User.last_login, User.login_count
+    ).order_by(User.created_at.desc())
     
-    writer.writerow([
-        'ID', 'Full Name', 'Email', 'Phone', 'Role', 'Primary Block',
-        'Assigned Blocks', 'Status', 'Registered Date', 'Last Login', 'Login Count'
-    ])
-    
-    for user in users:
+    def format_row(user):
         status = 'Active' if user.is_active else ('Rejected' if user.rejection_reason else 'Pending')
-        writer.writerow([
+        return [
             user.id, user.full_name, user.email, user.phone, user.role,
             user.primary_block, user.assigned_blocks or '',
-            status, user.created_at.strftime('%Y-%m-%d'),
-            user.last_login.strftime('%Y-%m-%d') if user.last_login else 'Never',
+            status, _export_date(user.created_at),
+            _export_date(user.last_login, 'Never'),
             user.login_count
-        ])
-    
-    output.seek(0)
+        ]
     
     return StreamingResponse(
-        iter([output.getvalue()]),
+        stream_csv(stmt, [
+            'ID', 'Full Name', 'Email', 'Phone', 'Role', 'Primary Block',
+            'Assigned Blocks', 'Status', 'Registered Date', 'Last Login', 'Login Count'
+        ], format_row),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=users_export.csv"}
     )
 
 
+@app.get("/api/export/data/{dataset}")
+async def export_dataset(
+    dataset: str,
+    format: str = Query("csv"),
+    columns: Optional[str] = Query(None),
+    user_data: dict = Depends(require_block_coordinator),
+    session: AsyncSession = Depends(get_session)
+):
+    """Export a table as CSV, NDJSON or Parquet, optionally projected to ?columns=
+
+    Super admins get every row; block coordinators get the rows of their
+    blocks (field workers: their own submissions, doctors: verified ones)
+    and no users or audit log. Parquet uses pyarrow (in requirements.txt);
+    without it ``format=parquet`` is a 400.
+    """
+    from fastapi.responses import StreamingResponse
+    from data_export import EXPORT_DATASETS, EXPORT_FORMATS, check_format, stream_export
+
+    spec = EXPORT_DATASETS.get(dataset)
+    if spec is None:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset. Available: {', '.join(EXPORT_DATASETS)}")
+
+    # Scope by the stored role, not the token's, so a role change since
+    # login can't pass one check and fail another
+    user_result = await session.execute(select(User).where(User.email == user_data.get('email')))
+    user = user_result.scalar_one_or_none()
+    if user is None or user.role not in ("super_admin", "block_coordinator"):
+        raise HTTPException(status_code=403, detail="Block coordinator access required")
+    if not spec.allows(user.role):
+        raise HTTPException(status_code=403, detail="Super admin access required")
+
+    try:
+        check_format(format)
+        selected = spec.parse_columns(columns, user.role)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        stream_export(spec.query(selected, user), selected, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={dataset.replace('-', '_')}_export.{extension}"}
+    )
+
+
 # ============================================================
 # PHASE 3/4: COORDINATOR DASHBOARD STATISTICS
 # ============================================================
@@ -2992,72 +3241,78 @@ async def get_analytics_overview(
     admin_data: dict = Depends(require_super_admin),
     session: AsyncSession = Depends(get_session)
 ):
-    """Get comprehensive analytics data"""
+    """Get comprehensive analytics data
+
+    Field Worker counts come from the pre-aggregated analytics_snapshot
+    counters; see analytics.py.
+    """
     from collections import defaultdict
+    from datetime import timedelta
+    from sqlalchemy import case, distinct
+    from analytics import read_snapshot
     
     # Users statistics
-    users_result = await session.execute(select(User))
-    users = users_result.scalars().all()
-    total_users = len(users)
-    active_users = len([u for u in users if u.is_active])
+    users_result = await session.execute(
+        select(
+            func.count(User.id),
+            func.sum(case((User.is_active == True, 1), else_=0))
+        )
+    )
+    total_users, active_users = users_result.one()
+    total_users = total_users or 0
+    active_users = int(active_users or 0)
     
-    # Field Workers statistics
-    fw_result = await session.execute(select(FieldWorker))
-    field_workers = fw_result.scalars().all()
-    total_field_workers = len(field_workers)
-    approved_field_workers = len([fw for fw in field_workers if fw.status == 'approved'])
-    pending_reviews = len([fw for fw in field_workers if fw.status == 'pending'])
+    # Field Worker counters by status, block and day
+    today = datetime.now(timezone.utc).date()
+    start_date = today - timedelta(days=29)
+    timeline = {
+        (start_date + timedelta(days=i)).strftime('%Y-%m-%d'): 0
+        for i in range(30)
+    }
+    status_counts = defaultdict(int)
+    by_block = defaultdict(int)
+    for day, block, status, count in await read_snapshot(session):
+        status_counts[status] += count
+        by_block[block] += count
+        if day >= start_date:
+            date_str = day.strftime('%Y-%m-%d')
+            if date_str in timeline:
+                timeline[date_str] += count
+    
+    total_field_workers = sum(status_counts.values())
+    approved_field_workers = status_counts['approved']
+    pending_reviews = status_counts['pending']
     
     # Village coverage
-    villages_result = await session.execute(select(Village))
-    all_villages = villages_result.scalars().all()
-    villages_with_fw = set(fw.village_id for fw in field_workers if fw.status == 'approved')
-    villages_covered = len(villages_with_fw)
-    coverage_percent = round((villages_covered / 1315) * 100, 1) if villages_covered > 0 else 0
-    
-    # By Block
-    by_block = defaultdict(int)
-    for fw in field_workers:
-        for village in all_villages:
-            if village.id == fw.village_id:
-                by_block[village.block] += 1
-                break
+    covered_result = await session.execute(
+        select(func.count(distinct(FieldWorker.village_id))).where(FieldWorker.status == 'approved')
+    )
+    villages_covered = covered_result.scalar() or 0
+    total_villages = len(await ensure_static_village_features())
+    if not total_villages:
+        total_villages = (await session.execute(select(func.count(Village.id)))).scalar() or 0
+    coverage_percent = round((villages_covered / total_villages) * 100, 1) if villages_covered > 0 and total_villages else 0
     
     # By Status
     by_status = {
-        "approved": len([fw for fw in field_workers if fw.status == 'approved']),
-        "pending": len([fw for fw in field_workers if fw.status == 'pending']),
-        "rejected": len([fw for fw in field_workers if fw.status == 'rejected'])
+        "approved": status_counts['approved'],
+        "pending": status_counts['pending'],
+        "rejected": status_counts['rejected']
     }
     
-    # Timeline (last 30 days)
-    from datetime import timedelta
-    timeline = defaultdict(int)
-    today = datetime.now(timezone.utc).date()
-    for i in range(30):
-        date = today - timedelta(days=29-i)
-        timeline[date.strftime('%Y-%m-%d')] = 0
-    
-    for fw in field_workers:
-        date_str = fw.created_at.date().strftime('%Y-%m-%d')
-        if date_str in timeline:
-            timeline[date_str] += 1
-    
     # Top Contributors
-    contributor_counts = defaultdict(int)
-    contributor_data = {}
-    for fw in field_workers:
-        contributor_counts[fw.submitted_by_user_id] += 1
-    
-    for user in users:
-        if user.id in contributor_counts:
-            contributor_data[user.id] = {
-                "name": user.full_name,
-                "email": user.email,
-                "count": contributor_counts[user.id]
-            }
-    
-    top_contributors = sorted(contributor_data.values(), key=lambda x: x['count'], reverse=True)[:10]
+    submission_count = func.count(FieldWorker.id).label('count')
+    contributors_result = await session.execute(
+        select(User.full_name, User.email, submission_count)
+        .join(FieldWorker, FieldWorker.submitted_by_user_id == User.id)
+        .group_by(User.id, User.full_name, User.email)
+        .order_by(submission_count.desc())
+        .limit(10)
+    )
+    top_contributors = [
+        {"name": name, "email": email, "count": count}
+        for name, email, count in contributors_result.all()
+    ]
     
     return {
         "total_users": total_users,
@@ -3066,14 +3321,99 @@ async def get_analytics_overview(
         "approved_field_workers": approved_field_workers,
         "pending_reviews": pending_reviews,
         "villages_covered": villages_covered,
+        "total_villages": total_villages,
         "coverage_percent": coverage_percent,
-        "by_block": [{"block": k, "count": v} for k, v in sorted(by_block.items())],
+        "by_block": [{"block": k, "count": v} for k, v in sorted(by_block.items()) if v],
         "by_status": by_status,
         "timeline": [{"date": k, "count": v} for k, v in sorted(timeline.items())],
         "top_contributors": top_contributors
     }
 
 
+async def _coverage_graph(session: AsyncSession) -> tuple[village_graph.VillageGraph, set[int]]:
+    """Village adjacency graph and the nodes covered by an approved Field Worker."""
+    features = await ensure_static_village_features()
+    graph = await village_graph.load_village_graph(features)
+    node_by_key = {
+        _normalize_village_key(name, block): node
+        for node, (name, block) in enumerate(zip(graph.names, graph.blocks))
+    }
+    result = await session.execute(
+        select(Village.name, Village.block)
+        .join(FieldWorker, FieldWorker.village_id == Village.id)
+        .where(FieldWorker.status == 'approved')
+        .distinct()
+    )
+    covered = set()
+    for name, block in result.all():
+        node = node_by_key.get(_normalize_village_key(name, block))
+        if node is not None:
+            covered.add(node)
+    return graph, covered
+
+
+@app.get("/api/analytics/coverage/gaps")
+async def get_coverage_gaps(
+    min_size: int = Query(2, ge=1),
+    limit: int = Query(50, ge=1, le=500),
+    admin_data: dict = Depends(require_super_admin),
+    session: AsyncSession = Depends(get_session)
+):
+    """Clusters of adjacent villages with no approved Field Worker, largest first"""
+    graph, covered = await _coverage_graph(session)
+    clusters = graph.gap_clusters(covered, min_size=min_size)
+    
+    return {
+        "total_villages": graph.node_count,
+        "covered_villages": len(covered),
+        "cluster_count": len(clusters),
+        "clusters": [
+            {
+                "size": len(cluster),
+                "population": sum(graph.populations[node] for node in cluster),
+                "blocks": sorted({graph.blocks[node] for node in cluster if graph.blocks[node]}),
+                "villages": [graph.node(node) for node in cluster]
+            }
+            for cluster in clusters[:limit]
+        ]
+    }
+
+
+@app.get("/api/analytics/coverage/distance")
+async def get_coverage_distance(
+    min_hops: int = Query(1, ge=0),
+    limit: int = Query(100, ge=1, le=2000),
+    admin_data: dict = Depends(require_super_admin),
+    session: AsyncSession = Depends(get_session)
+):
+    """Hops from each village to the nearest covered village
+    
+    ``histogram`` counts villages per hop distance ("unreachable" when no
+    covered village shares their connected area); ``villages`` lists the
+    farthest ones with at least min_hops, unreachable first.
+    """
+    graph, covered = await _coverage_graph(session)
+    hops = graph.hops_to_covered(covered)
+    
+    histogram: dict[str, int] = {}
+    for hop in hops:
+        key = str(hop) if hop >= 0 else "unreachable"
+        histogram[key] = histogram.get(key, 0) + 1
+    
+    far = [node for node, hop in enumerate(hops) if hop < 0 or hop >= min_hops]
+    far.sort(key=lambda node: (hops[node] >= 0, -hops[node], node))
+    
+    return {
+        "total_villages": graph.node_count,
+        "covered_villages": len(covered),
+        "histogram": histogram,
+        "villages": [
+            {**graph.node(node), "hops": hops[node] if hops[node] >= 0 else None}
+            for node in far[:limit]
+        ]
+    }
+
+
 # ============================================================
 # PHASE 2: ADMIN FORM FIELD CONFIGURATION
 # ============================================================
@@ -3135,6 +3475,7 @@ async def update_form_config(
             config.updated_at = datetime.now(timezone.utc)
     
     await session.commit()
+    await form_fields_cache.invalidate()
     
     return {"success": True, "message": "Form configuration updated successfully"}
 
@@ -3421,21 +3762,27 @@ async def search_field_workers(
     return {"results": results, "total": len(results), "query": q}
 
 
-@app.get("/about", response_class=HTMLResponse)
-async def about_page(request: Request, session: AsyncSession = Depends(get_session)):
-    """Public about page"""
-    result = await session.execute(select(AboutPage))
-    about = result.scalar_one_or_none()
-    
-    if not about:
-        about = AboutPage(
+async def get_about_content(session: AsyncSession) -> dict:
+    """Cached About page content, creating the default row on first use"""
+    about = await about_page_cache.get()
+    if about is None:
+        about_row = AboutPage(
             title="About Us",
             subtitle="Serving with Devotion",
             main_content="We have not named anything yet, awaiting blessings from Param Pujyapad Sree Sree Acharya Dev"
         )
-        session.add(about)
+        session.add(about_row)
         await session.commit()
-        await session.refresh(about)
+        await session.refresh(about_row)
+        await about_page_cache.invalidate()
+        about = about_row.model_dump()
+    return about
+
+
+@app.get("/about", response_class=HTMLResponse)
+async def about_page(request: Request, session: AsyncSession = Depends(get_session)):
+    """Public about page"""
+    about = await get_about_content(session)
     
     user = get_optional_user(request)
     return templates.TemplateResponse("about.html", {
@@ -3446,31 +3793,21 @@ async def about_page(request: Request, session: AsyncSession = Depends(get_sessi
 
 
 @app.get("/api/about")
-async def get_about_api(session: AsyncSession = Depends(get_session)):
+async def get_about_api(response: Response, session: AsyncSession = Depends(get_session)):
     """API endpoint to fetch about page content"""
-    result = await session.execute(select(AboutPage))
-    about = result.scalar_one_or_none()
-    
-    if not about:
-        about = AboutPage(
-            title="About Us",
-            subtitle="Serving with Devotion",
-            main_content="We have not named anything yet, awaiting blessings from Param Pujyapad Sree Sree Acharya Dev"
-        )
-        session.add(about)
-        await session.commit()
-        await session.refresh(about)
+    about = await get_about_content(session)
+    response.headers.update(version_header(about_page_cache))
     
     return {
-        "id": about.id,
-        "title": about.title,
-        "subtitle": about.subtitle,
-        "main_content": about.main_content,
-        "mission_statement": about.mission_statement,
-        "vision_statement": about.vision_statement,
-        "contact_info": about.contact_info,
-        "last_edited_by": about.last_edited_by,
-        "updated_at": about.updated_at.isoformat() if about.updated_at else None
+        "id": about["id"],
+        "title": about["title"],
+        "subtitle": about["subtitle"],
+        "main_content": about["main_content"],
+        "mission_statement": about["mission_statement"],
+        "vision_statement": about["vision_statement"],
+        "contact_info": about["contact_info"],
+        "last_edited_by": about["last_edited_by"],
+        "updated_at": about["updated_at"].isoformat() if about["updated_at"] else None
     }
 
 
@@ -3542,6 +3879,7 @@ async def update_about(
     
     await session.commit()
     await session.refresh(about)
+    await about_page_cache.invalidate()
     
     return {
         "success": True,
@@ -3567,18 +3905,7 @@ async def admin_about_page(
     admin: User = Depends(get_current_admin)
 ):
     """Admin page for editing about content"""
-    result = await session.execute(select(AboutPage))
-    about = result.scalar_one_or_none()
-    
-    if not about:
-        about = AboutPage(
-            title="About Us",
-            subtitle="Serving with Devotion",
-            main_content="We have not named anything yet, awaiting blessings from Param Pujyapad Sree Sree Acharya Dev"
-        )
-        session.add(about)
-        await session.commit()
-        await session.refresh(about)
+    about = await get_about_content(session)
     
     return templates.TemplateResponse("admin_about.html", {
         "request": request,
@@ -1,6 +1,7 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, UniqueConstraint
 from typing import Optional, List
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 
 class Village(SQLModel, table=True):
@@ -103,6 +104,10 @@ class Report(SQLModel, table=True):
 class SevaRequest(SQLModel, table=True):
     """Service requests from community members"""
     __tablename__ = "seva_requests"
+    __table_args__ = (
+        # Common "requests with status X, newest first" filter
+        Index("ix_seva_requests_status_created_at", "status", "created_at"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     
@@ -452,3 +457,89 @@ class AboutPage(SQLModel, table=True):
     # Metadata
     last_edited_by: Optional[str] = None
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class AnalyticsSnapshot(SQLModel, table=True):
+    """Pre-aggregated Field Worker counters per creation day, block and status"""
+    __tablename__ = "analytics_snapshot"
+    __table_args__ = (
+        UniqueConstraint("day", "block", "status", name="uq_analytics_snapshot_bucket"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    day: date = Field(index=True)  # FieldWorker.created_at date (UTC)
+    block: str = Field(index=True)
+    status: str  # 'pending', 'approved', 'rejected'
+    count: int = Field(default=0)
+    
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class CacheVersion(SQLModel, table=True):
+    """Shared invalidation counters so every app worker drops stale caches"""
+    __tablename__ = "cache_versions"
+    
+    namespace: str = Field(primary_key=True)  # 'custom_labels', 'static_geojson', etc.
+    version: int = Field(default=0)
+    
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class StaticDataset(SQLModel, table=True):
+    """Source file hash of each static dataset last synced into the database"""
+    __tablename__ = "static_datasets"
+    
+    name: str = Field(primary_key=True)  # 'villages'
+    source_sha256: str
+    feature_count: int = Field(default=0)
+    
+    synced_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class StaticVillageFingerprint(SQLModel, table=True):
+    """Hash of the values each static village feature last synced into villages"""
+    __tablename__ = "static_village_fingerprints"
+    
+    village_key: str = Field(primary_key=True)  # _normalize_village_key(name, block)
+    village_id: int = Field(foreign_key="villages.id", index=True)
+    fingerprint: str
+    # Centroid written at that sync; pins moved away from it were edited by hand
+    lat: float
+    lng: float
+
+
+class ImportJob(SQLModel, table=True):
+    """Background bulk CSV import and its progress"""
+    __tablename__ = "import_jobs"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str = Field(index=True)  # 'villages', 'members'
+    status: str = Field(default="queued", index=True)  # queued, running, completed, failed
+    filename: Optional[str] = None
+    options: str = Field(default="{}")  # JSON, e.g. {"verify_on_import": true}
+    created_by: Optional[str] = None
+    
+    # Progress
+    rows_processed: int = Field(default=0)
+    error_count: int = Field(default=0)
+    errors: str = Field(default="[]")  # JSON list, first MAX_STORED_ERRORS only
+    result: Optional[str] = None  # JSON summary from the importer once completed
+    message: Optional[str] = None  # Failure reason
+    
+    # Instance running the job and when it last reported; a stale heartbeat
+    # lets another instance take the job over
+    owner: Optional[str] = None
+    heartbeat_at: Optional[datetime] = None
+    
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class ImportUploadChunk(SQLModel, table=True):
+    """Uploaded CSV of an import job, stored in the database so any instance can run it"""
+    __tablename__ = "import_upload_chunks"
+    
+    job_id: int = Field(foreign_key="import_jobs.id", primary_key=True)
+    seq: int = Field(primary_key=True)
+    data: bytes
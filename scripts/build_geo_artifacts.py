@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Pre-build the compressed GeoJSON artifacts served by the map endpoints.
+Usage: python scripts/build_geo_artifacts.py [output_dir]
+
+Writes <name>.json, <name>.json.gz (and <name>.json.br when the brotli
+package is installed) for every artifact, level of detail and format
+(<name>.lod<n>.json, <name>.topojson.json ...), plus manifest.json. Run from the repository root; the
+app loads these at startup instead of recompressing while the manifest's
+source hashes match the files in static/geojson.
+
+Also writes the preprocessed village feature cache (see static_geo_cache.py)
+so freshly started instances skip parsing the village GeoJSON.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import geo_artifacts  # noqa: E402
+import static_geo_cache  # noqa: E402
+from village_resolver import normalize_block  # noqa: E402
+
+
+def build_all(output_dir: str) -> None:
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {}
+    for name, (path, _) in geo_artifacts.ARTIFACT_SOURCES.items():
+        if not os.path.exists(path):
+            print(f"Skipping {name}: {path} not found")
+            continue
+        for lod, output_format in geo_artifacts.artifact_variants(name):
+            # Always rebuild from source; never reuse the blobs being replaced
+            artifact = geo_artifacts.build_artifact(name, lod, output_format, artifact_dir=None)
+            entry = manifest[artifact.name] = geo_artifacts.write_artifact(artifact, output_dir)
+            sizes = ", ".join(f"{enc}={size:,}" for enc, size in entry["sizes"].items())
+            print(f"Built {artifact.name} {entry['etag']} ({sizes} bytes)")
+
+    with open(os.path.join(output_dir, geo_artifacts.MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f"Done! Wrote {len(manifest)} artifacts to {output_dir}.")
+
+
+def build_feature_cache() -> None:
+    path = geo_artifacts.VILLAGES_GEOJSON_PATH
+    if not os.path.exists(path):
+        print(f"Skipping village feature cache: {path} not found")
+        return
+    prepared = static_geo_cache.build_prepared_villages(path, normalize_block)
+    print(f"Cached {len(prepared.features):,} village features in {static_geo_cache.CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: python build_geo_artifacts.py [output_dir]")
+        sys.exit(1)
+
+    build_all(sys.argv[1] if len(sys.argv) == 2 else geo_artifacts.ARTIFACT_DIR)
+    build_feature_cache()
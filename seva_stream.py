@@ -0,0 +1,142 @@
+"""
+In-process publish/subscribe hub for the live seva feed (Server-Sent Events).
+
+Write endpoints publish an event after their transaction commits; every
+connected ``/api/seva/stream`` client receives it from its own bounded queue.
+Recent events are kept in a ring buffer so a reconnecting client can resume
+from its ``Last-Event-ID`` instead of re-reading the whole feed.
+
+Event ids are ``<epoch>-<seq>``, the epoch being unique to this process: a
+client that reconnects after a restart, or to another instance, presents an
+id this hub never issued and is sent ``reset`` rather than silently missing
+events.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from collections import deque
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Events kept for Last-Event-ID resume
+HISTORY_SIZE = 256
+
+# Per-client queue bound; a client that falls this far behind is disconnected
+# and resumes from the ring buffer when its EventSource reconnects
+CLIENT_QUEUE_SIZE = 100
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15.0
+
+
+class _Subscriber:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+
+class SevaEventHub:
+    """Fan out seva events to SSE subscribers with a short replay history."""
+
+    def __init__(self, history_size: int = HISTORY_SIZE, queue_size: int = CLIENT_QUEUE_SIZE):
+        self._history: deque[dict] = deque(maxlen=history_size)
+        self._subscribers: set[_Subscriber] = set()
+        self._queue_size = queue_size
+        self.epoch = uuid.uuid4().hex[:8]
+        self._last_id = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: dict) -> dict:
+        """Record an event and push it to every subscriber without blocking."""
+        self._last_id += 1
+        event = {"seq": self._last_id, "id": f"{self.epoch}-{self._last_id}", "event": event_type, "data": data}
+        self._history.append(event)
+
+        for subscriber in list(self._subscribers):
+            if subscriber.overflowed:
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow client: stop feeding it; the stream ends once its queue
+                # drains and the browser reconnects with Last-Event-ID
+                subscriber.overflowed = True
+                logger.warning("Seva stream subscriber fell behind; disconnecting for resume")
+        return event
+
+    def _replay(self, last_event_id: str) -> tuple[list[dict], bool]:
+        """Return buffered events after last_event_id and whether history was lost."""
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._last_id:
+            # Issued by another process (or garbled): nothing to resume from
+            return [], True
+        last_seq = int(seq)
+        if last_seq == self._last_id:
+            return [], False
+        oldest = self._history[0]["seq"] if self._history else self._last_id + 1
+        missed = [event for event in self._history if event["seq"] > last_seq]
+        return missed, last_seq < oldest - 1
+
+    async def stream(
+        self,
+        last_event_id: Optional[str] = None,
+        is_disconnected=None,
+        heartbeat: float = HEARTBEAT_SECONDS
+    ) -> AsyncIterator[str]:
+        """Yield SSE-formatted chunks for one client until it disconnects."""
+        subscriber = _Subscriber(self._queue_size)
+        self._subscribers.add(subscriber)
+        # Highest seq already sent; events queued while replaying are skipped up to it
+        sent_seq = 0
+        try:
+            yield f"retry: {int(heartbeat * 1000)}\n\n"
+
+            if last_event_id is not None:
+                missed, gap = self._replay(last_event_id)
+                if gap:
+                    # Too far behind for the ring buffer, or an id from another
+                    # process: the client should refetch the feed
+                    sent_seq = self._last_id
+                    yield format_sse({"id": f"{self.epoch}-{sent_seq}", "event": "reset", "data": {}})
+                else:
+                    for event in missed:
+                        sent_seq = event["seq"]
+                        yield format_sse(event)
+
+            while True:
+                if is_disconnected is not None and await is_disconnected():
+                    break
+                if subscriber.overflowed and subscriber.queue.empty():
+                    break
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event["seq"] <= sent_seq:
+                    continue
+                sent_seq = event["seq"]
+                yield format_sse(event)
+        finally:
+            self._subscribers.discard(subscriber)
+
+
+def format_sse(event: dict) -> str:
+    """Serialize an event dict as an SSE message."""
+    payload = json.dumps(event["data"], separators=(",", ":"), default=str)
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {payload}\n\n"
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[str]:
+    """Normalize a Last-Event-ID header; None when absent or blank."""
+    if not value or not value.strip():
+        return None
+    return value.strip()
+
+
+seva_hub = SevaEventHub()
@@ -0,0 +1,144 @@
+"""
+On-disk cache of the preprocessed village GeoJSON.
+
+Parsing the village file and computing per-feature geometry statistics is
+the bulk of a cold start. The parsed features, their statistics, the
+features grouped by normalized block name and each block's bounds are
+pickled under ``CACHE_DIR`` keyed by the source file's SHA-256, so a
+restart with an unchanged file only hashes it and unpickles one blob.
+A replaced file hashes differently and is reprocessed (older cache files
+are pruned).
+
+``scripts/build_geo_artifacts.py`` writes the cache during the deploy build,
+so instances that share no filesystem start warm; the app only writes it
+itself when the build step was skipped. ``CACHE_DIR`` is outside the public
+``/static`` mount and only ever written by this code, so unpickling it is
+trusted.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+from typing import Callable, Optional
+
+from geometry import geometry_stats, vertex_bounds
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("GEO_FEATURE_CACHE_DIR", os.path.join('build', 'geo-features'))
+
+# Bump when the cached layout or the preprocessing changes
+CACHE_FORMAT = 1
+
+
+class PreparedVillages:
+    """Village features plus everything derived from them at load time."""
+
+    def __init__(
+        self,
+        source_sha256: str,
+        features: list[dict],
+        stats: list[Optional[dict]],
+        block_features: dict[str, list[int]],
+        block_bounds: dict[str, Optional[dict]]
+    ):
+        self.source_sha256 = source_sha256
+        self.features = features
+        # geometry_stats per feature, None for unusable geometry
+        self.stats = stats
+        # Normalized block name -> feature positions
+        self.block_features = block_features
+        self.block_bounds = block_bounds
+
+    @classmethod
+    def build(cls, source_sha256: str, features: list[dict], block_key: Callable[[str], str]) -> "PreparedVillages":
+        block_features: dict[str, list[int]] = {}
+        for i, feature in enumerate(features):
+            props = feature.get('properties') or {}
+            block = (props.get('SUB_DIST') or props.get('block') or '').strip()
+            if block:
+                block_features.setdefault(block_key(block), []).append(i)
+        block_bounds = {
+            block: vertex_bounds([features[i].get('geometry') for i in positions])
+            for block, positions in block_features.items()
+        }
+        stats = geometry_stats([feature.get('geometry') for feature in features])
+        return cls(source_sha256, features, stats, block_features, block_bounds)
+
+
+def _cache_path(source_sha256: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"villages-{source_sha256[:32]}.v{CACHE_FORMAT}.pickle")
+
+
+def _read_cache(path: str, source_sha256: str) -> Optional[PreparedVillages]:
+    try:
+        with open(path, 'rb') as f:
+            prepared = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable village feature cache {path}: {e}")
+        return None
+    if not isinstance(prepared, PreparedVillages) or prepared.source_sha256 != source_sha256:
+        return None
+    return prepared
+
+
+def _write_cache(prepared: PreparedVillages, path: str, cache_dir: str) -> None:
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(prepared, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        for name in os.listdir(cache_dir):
+            stale = os.path.join(cache_dir, name)
+            # Completed caches for other files only; a *.tmp may still be
+            # in the middle of another process's write
+            if name.startswith("villages-") and name.endswith(".pickle") and stale != path:
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+    except OSError as e:
+        logger.warning(f"Could not write village feature cache {path}: {e}")
+
+
+def build_prepared_villages(
+    path: str,
+    block_key: Callable[[str], str],
+    cache_dir: str = CACHE_DIR
+) -> PreparedVillages:
+    """Reprocess the village file and (re)write its cache; for the build step."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    source_sha256 = hashlib.sha256(raw).hexdigest()
+    prepared = PreparedVillages.build(source_sha256, json.loads(raw).get('features', []), block_key)
+    _write_cache(prepared, _cache_path(source_sha256, cache_dir), cache_dir)
+    return prepared
+
+
+def load_prepared_villages(
+    path: str,
+    block_key: Callable[[str], str],
+    cache_dir: Optional[str] = CACHE_DIR
+) -> PreparedVillages:
+    """Load the village file through the cache; cache_dir=None skips it.
+
+    Raises FileNotFoundError / json.JSONDecodeError for the caller to report.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    source_sha256 = hashlib.sha256(raw).hexdigest()
+    cache_path = _cache_path(source_sha256, cache_dir) if cache_dir else None
+    if cache_path:
+        prepared = _read_cache(cache_path, source_sha256)
+        if prepared is not None:
+            return prepared
+
+    features = json.loads(raw).get('features', [])
+    prepared = PreparedVillages.build(source_sha256, features, block_key)
+    if cache_path:
+        _write_cache(prepared, cache_path, cache_dir)
+    return prepared
@@ -0,0 +1,33 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+# db builds its engine from DATABASE_URL at import time; point it at a
+# throwaway file before any app module is imported
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def session_maker():
+    """Empty tables on the app's engine; returns its session maker.
+
+    Tests run their database work inside one asyncio.run() and should
+    ``await engine.dispose()`` before it returns, since pooled connections
+    belong to that event loop.
+    """
+    from sqlmodel import SQLModel
+
+    import db
+
+    async def reset():
+        async with db.engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+        await db.engine.dispose()
+
+    asyncio.run(reset())
+    return db.async_session_maker
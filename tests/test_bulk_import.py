@@ -0,0 +1,107 @@
+import asyncio
+import io
+
+import pytest
+from sqlmodel import select
+
+import bulk_import
+from db import engine
+from models import Village
+
+HEADER = "name,block,lat,lng,south,west,north,east,code_2011\n"
+
+
+def _village_csv(count: int) -> bytes:
+    rows = "".join(
+        f"Village {i},Bhadrak,21.0{i},86.5{i},21.0,86.5,21.1,86.6,{1000 + i}\n"
+        for i in range(count)
+    )
+    return (HEADER + rows).encode("utf-8")
+
+
+def test_iter_csv_rows_reports_file_line_numbers():
+    raw = io.BytesIO('﻿name,block\nA,X\n"B\nsplit",Y\nC,Z\n'.encode("utf-8"))
+    rows = list(bulk_import.iter_csv_rows(raw))
+    assert [line for line, _ in rows] == [2, 4, 5]
+    assert rows[0][1] == {"name": "A", "block": "X"}
+    assert rows[1][1]["name"] == "B\nsplit"
+    # The upload itself stays open for its owner
+    assert not raw.closed
+
+
+def test_data_rows_skip_to_start_row():
+    rows = list(bulk_import._data_rows(io.BytesIO(_village_csv(5)), 3))
+    assert [row["name"] for _, row in rows] == ["Village 3", "Village 4"]
+
+
+def test_batches():
+    assert list(bulk_import._batches(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(bulk_import._batches(iter([]), 2)) == []
+
+
+class _Crash(Exception):
+    pass
+
+
+def test_resume_after_crash_imports_each_row_once(session_maker, monkeypatch):
+    real_batches = bulk_import._batches
+    monkeypatch.setattr(bulk_import, "_batches", lambda rows: real_batches(rows, 2))
+    upload = _village_csv(5)
+
+    async def run():
+        try:
+            reported = []
+
+            async def crash_on_second_batch(processed, errors):
+                if reported:
+                    raise _Crash()
+                reported.append(processed)
+
+            async with session_maker() as session:
+                with pytest.raises(_Crash):
+                    await bulk_import.import_villages_csv(
+                        session, io.BytesIO(upload), progress=crash_on_second_batch
+                    )
+                await session.rollback()
+
+            # Progress is written before each batch commits, so the last
+            # reported count is exactly what reached the database
+            resume_at = reported[-1]
+            async with session_maker() as session:
+                assert len((await session.execute(select(Village.id))).all()) == resume_at
+
+            progress = []
+
+            async def record(processed, errors):
+                progress.append(processed)
+
+            async with session_maker() as session:
+                result = await bulk_import.import_villages_csv(
+                    session, io.BytesIO(upload), progress=record, start_row=resume_at
+                )
+                names = (await session.execute(select(Village.name).order_by(Village.name))).scalars().all()
+            return resume_at, result, progress, names
+        finally:
+            await engine.dispose()
+
+    resume_at, result, progress, names = asyncio.run(run())
+    assert resume_at == 2
+    assert result["created"] == 3 and result["errors"] == []
+    assert progress == [4, 5]
+    assert names == [f"Village {i}" for i in range(5)]
+
+
+def test_invalid_rows_are_reported_with_line_numbers(session_maker):
+    upload = (HEADER + "Good,Bhadrak,21,86,21,86,21.1,86.1,1\n,Bhadrak,21,86,21,86,21,86,2\n"
+              "Bad coords,Bhadrak,north,86,21,86,21,86,3\n").encode("utf-8")
+
+    async def run():
+        try:
+            async with session_maker() as session:
+                return await bulk_import.import_villages_csv(session, io.BytesIO(upload))
+        finally:
+            await engine.dispose()
+
+    result = asyncio.run(run())
+    assert result["created"] == 1
+    assert [error.split(" ", 2)[:2] for error in result["errors"]] == [["Row", "3"], ["Row", "4"]]
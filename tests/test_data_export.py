@@ -0,0 +1,161 @@
+import asyncio
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+import data_export
+from data_export import EXPORT_DATASETS, _ChunkSink, check_format, coordinator_blocks, stream_export
+from db import engine
+from models import Doctor, User
+
+
+def _user(role, primary_block="Bhadrak", assigned_blocks=""):
+    return User(email=f"{role}@example.com", full_name=role, role=role,
+                primary_block=primary_block, assigned_blocks=assigned_blocks)
+
+
+def test_chunk_sink_drains_and_keeps_absolute_position():
+    sink = _ChunkSink()
+    assert sink.write(b"abc") == 3
+    sink.write(memoryview(b"de"))
+    assert sink.drain() == b"abcde"
+    assert sink.drain() == b""
+    sink.write(b"f")
+    assert sink.tell() == 6
+    assert sink.drain() == b"f"
+
+
+def test_check_format():
+    check_format("csv")
+    with pytest.raises(ValueError, match="Unknown format"):
+        check_format("xml")
+
+
+def test_parquet_needs_pyarrow(monkeypatch):
+    monkeypatch.setattr(data_export, "pyarrow", None)
+    with pytest.raises(ValueError, match="pyarrow"):
+        check_format("parquet")
+
+
+def test_coordinator_blocks():
+    user = _user("block_coordinator", " Bhadrak ", "Tihidi, Bhadrak,,Basudevpur")
+    assert coordinator_blocks(user) == ["Basudevpur", "Bhadrak", "Tihidi"]
+
+
+def test_parse_columns():
+    members = EXPORT_DATASETS["members"]
+    assert members.parse_columns(" full_name,block,full_name ", "super_admin") == ["full_name", "block"]
+    assert "village_name" in members.parse_columns(None, "super_admin")
+    with pytest.raises(ValueError, match="Unknown columns for members: nope"):
+        members.parse_columns("full_name,nope", "super_admin")
+
+
+def test_coordinators_cannot_see_excluded_columns():
+    doctors = EXPORT_DATASETS["doctors"]
+    assert "referred_by" in doctors.parse_columns(None, "super_admin")
+    assert "referred_by" not in doctors.parse_columns(None, "block_coordinator")
+    with pytest.raises(ValueError):
+        doctors.parse_columns("full_name,referred_by", "block_coordinator")
+
+
+def test_users_export_never_includes_secrets():
+    assert not {"password_hash", "google_id"} & set(EXPORT_DATASETS["users"].columns)
+
+
+@pytest.mark.parametrize("name, allowed", [
+    ("villages", True), ("members", True), ("doctors", True), ("seva-requests", True),
+    ("field-workers", True), ("users", False), ("audit", False),
+])
+def test_coordinator_access(name, allowed):
+    assert EXPORT_DATASETS[name].allows("block_coordinator") is allowed
+    assert EXPORT_DATASETS[name].allows("super_admin")
+
+
+def _where(stmt):
+    return str(stmt.whereclause) if stmt.whereclause is not None else ""
+
+
+def test_query_scoping():
+    coordinator = _user("block_coordinator", "Bhadrak", "Tihidi")
+    admin = _user("super_admin")
+    members = EXPORT_DATASETS["members"]
+    assert "villages.block IN" in _where(members.query(["full_name"], coordinator))
+    assert _where(members.query(["full_name"], admin)) == ""
+    assert "submitted_by_user_id" in _where(EXPORT_DATASETS["field-workers"].query(["id"], coordinator))
+    assert "doctors.verified" in _where(EXPORT_DATASETS["doctors"].query(["id"], coordinator))
+
+
+def _export(session_maker, dataset, columns, export_format, user):
+    async def run():
+        try:
+            spec = EXPORT_DATASETS[dataset]
+            chunks = [
+                chunk async for chunk in
+                stream_export(spec.query(columns, user), columns, export_format, session_maker)
+            ]
+            return b"".join(chunks)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def doctors(session_maker):
+    async def populate():
+        try:
+            async with session_maker() as session:
+                for i in range(5):
+                    session.add(Doctor(full_name=f"Dr {i}", specialty="General", city="Bhadrak",
+                                       hospital="DHH", phone=str(i), referred_by="someone",
+                                       rank=i, verified=i % 2 == 0,
+                                       created_at=datetime(2026, 1, 1, i)))
+                await session.commit()
+        finally:
+            await engine.dispose()
+
+    asyncio.run(populate())
+    return session_maker
+
+
+def test_ndjson_export_scoped_to_verified_doctors(doctors):
+    coordinator = _user("block_coordinator")
+    body = _export(doctors, "doctors", ["id", "full_name", "rank"], "ndjson", coordinator)
+    rows = [json.loads(line) for line in body.decode().splitlines()]
+    assert rows == [{"id": 1, "full_name": "Dr 0", "rank": 0},
+                    {"id": 3, "full_name": "Dr 2", "rank": 2},
+                    {"id": 5, "full_name": "Dr 4", "rank": 4}]
+
+
+def test_csv_export(doctors):
+    body = _export(doctors, "doctors", ["id", "verified", "created_at"], "csv", _user("super_admin"))
+    lines = body.decode().splitlines()
+    assert lines[0] == "id,verified,created_at"
+    assert lines[1] == "1,True,2026-01-01T00:00:00"
+    assert len(lines) == 6
+
+
+def test_parquet_matches_ndjson(doctors, monkeypatch):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    # Several row groups, one per partition
+    monkeypatch.setattr(data_export, "EXPORT_ROWS_PER_CHUNK", 2)
+    admin = _user("super_admin")
+    columns = EXPORT_DATASETS["doctors"].parse_columns(None, "super_admin")
+    parquet_file = pyarrow.parquet.ParquetFile(io.BytesIO(_export(doctors, "doctors", columns, "parquet", admin)))
+    assert parquet_file.num_row_groups == 3
+    table = parquet_file.read()
+    assert table.schema.field("rank").type == pyarrow.int64()
+    assert table.schema.field("verified").type == pyarrow.bool_()
+    assert table.schema.field("created_at").type == pyarrow.timestamp("us")
+
+    ndjson = _export(doctors, "doctors", columns, "ndjson", admin)
+    expected = [json.loads(line) for line in ndjson.decode().splitlines()]
+    actual = [
+        {name: value.isoformat() if isinstance(value, datetime) else value for name, value in row.items()}
+        for row in table.to_pylist()
+    ]
+    assert actual == expected
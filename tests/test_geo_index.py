@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+import geo_index
+from geo_index import VillageSpatialIndex, point_in_polygons
+
+
+def _village(name, block, polygon):
+    return {
+        "type": "Feature",
+        "properties": {"NAME": name, "SUB_DIST": block},
+        "geometry": {"type": "Polygon", "coordinates": polygon},
+    }
+
+
+SQUARE_WITH_HOLE = [
+    [[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]],
+    [[1, 1], [3, 1], [3, 3], [1, 3], [1, 1]],
+]
+
+
+def test_point_in_polygons_respects_holes():
+    assert point_in_polygons(0.5, 0.5, [SQUARE_WITH_HOLE])
+    assert not point_in_polygons(2, 2, [SQUARE_WITH_HOLE])
+    assert not point_in_polygons(5, 5, [SQUARE_WITH_HOLE])
+
+
+def test_locate():
+    index = VillageSpatialIndex([
+        _village("Nuagaon", "Bhadrak", [[[86.50, 21.00], [86.51, 21.00], [86.51, 21.01], [86.50, 21.01], [86.50, 21.00]]]),
+        {"type": "Feature", "properties": {"NAME": "No geometry"}, "geometry": None},
+        _village("Tihidi", "Tihidi", [[[86.51, 21.00], [86.52, 21.00], [86.52, 21.01], [86.51, 21.01], [86.51, 21.00]]]),
+    ])
+    assert index.locate(21.005, 86.515) == {"index": 2, "name": "Tihidi", "block": "Tihidi"}
+    assert index.locate(21.005, 86.505)["index"] == 0
+    assert index.locate(22.0, 86.5) is None
+    assert index.center() == pytest.approx((21.005, 86.51))
+
+
+def test_empty_index_uses_district_centre():
+    assert VillageSpatialIndex([]).center() == geo_index.DEFAULT_CENTER
+
+
+def test_concurrent_misses_build_the_index_once(monkeypatch):
+    monkeypatch.setattr(geo_index, "_index", None)
+    builds = []
+    real_init = VillageSpatialIndex.__init__
+
+    def counting_init(self, features):
+        builds.append(features)
+        real_init(self, features)
+
+    monkeypatch.setattr(VillageSpatialIndex, "__init__", counting_init)
+    features = [_village("Nuagaon", "Bhadrak", SQUARE_WITH_HOLE)]
+
+    async def load_all():
+        return await asyncio.gather(*(geo_index.load_village_index(features) for _ in range(10)))
+
+    indexes = asyncio.run(load_all())
+    assert len(builds) == 1
+    assert len({id(index) for index in indexes}) == 1
+    # A reloaded feature list gets a fresh index
+    assert asyncio.run(geo_index.load_village_index(list(features))) is not indexes[0]
@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import pytest
+
+import geo_tiles
+from geo_tiles import VillageTileIndex, clip_ring, lnglat_to_tile, tile_bounds, valid_tile
+
+
+def _square(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+
+
+def _village(name, ring):
+    return {
+        "type": "Feature",
+        "properties": {"NAME": name, "SUB_DIST": "Bhadrak"},
+        "geometry": {"type": "Polygon", "coordinates": [ring]},
+    }
+
+
+def _payload(artifact):
+    return json.loads(artifact.bodies["identity"])
+
+
+def test_valid_tile():
+    assert valid_tile(0, 0, 0)
+    assert valid_tile(10, 1023, 1023)
+    assert not valid_tile(10, 1024, 0)
+    assert not valid_tile(geo_tiles.TILE_MAX_ZOOM + 1, 0, 0)
+
+
+@pytest.mark.parametrize("lng, lat", [(86.52, 21.054), (-0.1, 51.5), (179.9, -85.0)])
+@pytest.mark.parametrize("z", [0, 9, 16])
+def test_point_lies_inside_its_tile(lng, lat, z):
+    x, y = lnglat_to_tile(lng, lat, z)
+    west, south, east, north = tile_bounds(z, x, y)
+    assert west <= lng <= east
+    assert south <= lat <= north
+
+
+def test_tile_bounds_of_world_tile():
+    west, south, east, north = tile_bounds(0, 0, 0)
+    assert (west, east) == (-180.0, 180.0)
+    assert north == pytest.approx(geo_tiles.MAX_LATITUDE)
+    assert south == pytest.approx(-geo_tiles.MAX_LATITUDE)
+
+
+def test_clip_ring_inside_box_is_unchanged():
+    ring = _square(1, 1, 2, 2)
+    assert clip_ring(ring, 0, 0, 3, 3) == ring
+
+
+def test_clip_ring_outside_box_is_empty():
+    assert clip_ring(_square(5, 5, 6, 6), 0, 0, 3, 3) == []
+
+
+def test_clip_ring_cuts_to_box():
+    clipped = clip_ring(_square(-1, -1, 1, 1), 0, 0, 3, 3)
+    assert clipped[0] == clipped[-1]
+    assert sorted(map(tuple, clipped[:-1])) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+
+def test_clip_ring_accepts_open_ring():
+    clipped = clip_ring(_square(-1, -1, 1, 1)[:-1], 0, 0, 3, 3)
+    assert len(clipped) == 5 and clipped[0] == clipped[-1]
+
+
+@pytest.fixture
+def index():
+    return VillageTileIndex([
+        _village("West", _square(86.50, 21.00, 86.51, 21.01)),
+        _village("East", _square(86.51, 21.00, 86.52, 21.01)),
+    ])
+
+
+def test_tile_holds_villages_it_touches(index):
+    x, y = lnglat_to_tile(86.505, 21.005, 12)
+    payload = _payload(index.tile(12, x, y))
+    assert {f["properties"]["name"] for f in payload["features"]} == {"West", "East"}
+    assert {f["id"] for f in payload["features"]} == {1, 2}
+
+
+def test_tile_outside_extent_is_empty(index):
+    assert _payload(index.tile(12, 0, 0)) == {"type": "FeatureCollection", "features": []}
+
+
+def test_tile_cache_is_bounded(index, monkeypatch):
+    monkeypatch.setattr(geo_tiles, "TILE_CACHE_SIZE", 3)
+    keys = index.extent_tiles(16)
+    assert len(keys) > 3
+    for key in keys:
+        index.tile(*key)
+    assert list(index._tiles) == keys[-3:]
+
+
+def test_concurrent_misses_build_a_tile_once(index, monkeypatch):
+    builds = []
+    build = index._build
+
+    def counting_build(z, x, y):
+        builds.append((z, x, y))
+        return build(z, x, y)
+
+    monkeypatch.setattr(index, "_build", counting_build)
+    x, y = lnglat_to_tile(86.505, 21.005, 14)
+
+    async def fetch_all():
+        return await asyncio.gather(*(index.get_tile(14, x, y) for _ in range(10)))
+
+    artifacts = asyncio.run(fetch_all())
+    assert builds == [(14, x, y)]
+    assert len({id(artifact) for artifact in artifacts}) == 1
@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+import main
+from db import engine
+from models import SevaRequest, SevaResponse, Village
+from models import Testimonial as SevaTestimonial
+
+
+def test_parse_feed_cursor():
+    assert main._parse_feed_cursor("2026-01-01T12:00:00,response,7") == (
+        datetime(2026, 1, 1, 12, 0, 0), "response", 7
+    )
+
+
+def test_parse_feed_cursor_normalizes_to_naive_utc():
+    at, _, _ = main._parse_feed_cursor("2026-01-01T17:30:00+05:30,request,1")
+    assert at == datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.mark.parametrize("cursor", ["", "2026-01-01T12:00:00", "2026-01-01T12:00:00,bogus,1",
+                                    "2026-01-01T12:00:00,request,x", "later,request,1"])
+def test_parse_feed_cursor_rejects_garbage(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        main._parse_feed_cursor(cursor)
+    assert excinfo.value.status_code == 400
+
+
+def _run_feed(session_maker, populate, pages_of):
+    async def run():
+        try:
+            async with session_maker() as session:
+                session.add(Village(id=1, name="Nuagaon", block="Bhadrak", lat=21.05, lng=86.52,
+                                    south=21.04, west=86.51, north=21.06, east=86.53))
+                populate(session)
+                await session.commit()
+                full = await main.get_seva_feed(limit=100, cursor=None, session=session)
+                paged, cursor = [], None
+                while True:
+                    page = await main.get_seva_feed(limit=pages_of, cursor=cursor, session=session)
+                    paged.extend(page["feed"])
+                    cursor = page["next_cursor"]
+                    if cursor is None:
+                        return full["feed"], paged
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def _key(item):
+    return item["type"], item["id"]
+
+
+def test_paging_keeps_items_sharing_a_timestamp(session_maker):
+    at = datetime(2026, 1, 1, 12, 0, 0)
+
+    def populate(session):
+        for i in range(5):
+            session.add(SevaRequest(village_id=1, seva_type="medical", urgency="high", title=f"r{i}",
+                                    description="", contact_phone="1", requested_by="x", created_at=at))
+        for i in range(4):
+            session.add(SevaResponse(request_id=1, volunteer_id=1, status="offered", responded_at=at))
+        for i in range(3):
+            session.add(SevaTestimonial(author_name="a", content="c", verified=True, created_at=at))
+
+    full, paged = _run_feed(session_maker, populate, 1)
+    assert len(full) == 12
+    assert [_key(item) for item in paged] == [_key(item) for item in full]
+
+
+@pytest.mark.parametrize("page_size", [3, 5])
+def test_paging_by_larger_pages(session_maker, page_size):
+    at = datetime(2026, 1, 1, 12, 0, 0)
+
+    def populate(session):
+        for i in range(4):
+            session.add(SevaRequest(village_id=1, seva_type="medical", urgency="high", title=f"r{i}",
+                                    description="", contact_phone="1", requested_by="x", created_at=at))
+            session.add(SevaResponse(request_id=1, volunteer_id=1, status="offered", responded_at=at))
+            session.add(SevaTestimonial(author_name="a", content="c", verified=True, created_at=at))
+
+    full, paged = _run_feed(session_maker, populate, page_size)
+    assert len(full) == 12
+    assert [_key(item) for item in paged] == [_key(item) for item in full]
+
+
+def test_feed_is_newest_first_across_types(session_maker):
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def populate(session):
+        session.add(SevaRequest(village_id=1, seva_type="medical", urgency="high", title="old", description="",
+                                contact_phone="1", requested_by="x", created_at=base))
+        session.add(SevaResponse(request_id=1, volunteer_id=1, status="offered",
+                                 responded_at=base + timedelta(hours=2)))
+        session.add(SevaTestimonial(author_name="a", content="c", verified=True,
+                                created_at=base + timedelta(hours=1)))
+        # Unverified testimonials stay out of the feed
+        session.add(SevaTestimonial(author_name="b", content="c", verified=False,
+                                created_at=base + timedelta(hours=3)))
+
+    full, paged = _run_feed(session_maker, populate, 2)
+    assert [item["type"] for item in full] == ["response", "testimonial", "request"]
+    assert [_key(item) for item in paged] == [_key(item) for item in full]
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+from seva_stream import SevaEventHub, format_sse, parse_last_event_id
+
+
+def _collect(hub, last_event_id=None, publish_during=(), count=None):
+    """Run one client stream; return the SSE messages it yields (retry line dropped)."""
+    async def run():
+        messages = []
+        stream = hub.stream(last_event_id=last_event_id, heartbeat=0.05)
+        async for chunk in stream:
+            if chunk.startswith("retry:"):
+                # Subscribed: events published now are queued for this client
+                for event_type, data in publish_during:
+                    hub.publish(event_type, data)
+                continue
+            if chunk.startswith(":"):
+                break
+            messages.append(chunk)
+            if count is not None and len(messages) >= count:
+                break
+        await stream.aclose()
+        return messages
+
+    return asyncio.run(run())
+
+
+def _parse(message):
+    fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    return fields["id"], fields["event"], json.loads(fields["data"])
+
+
+def test_format_sse():
+    event = {"id": "ab-3", "event": "request", "data": {"id": 1}}
+    assert format_sse(event) == 'id: ab-3\nevent: request\ndata: {"id":1}\n\n'
+
+
+def test_parse_last_event_id():
+    assert parse_last_event_id(None) is None
+    assert parse_last_event_id("  ") is None
+    assert parse_last_event_id(" ab-3 ") == "ab-3"
+
+
+def test_ids_carry_the_hub_epoch():
+    hub = SevaEventHub()
+    event = hub.publish("request", {"id": 1})
+    assert event["id"] == f"{hub.epoch}-1"
+    assert SevaEventHub().epoch != hub.epoch
+
+
+def test_replay_sends_only_missed_events():
+    hub = SevaEventHub()
+    for i in range(5):
+        hub.publish("request", {"id": i})
+    messages = _collect(hub, last_event_id=f"{hub.epoch}-3")
+    assert [_parse(m)[2]["id"] for m in messages] == [3, 4]
+
+
+def test_caught_up_client_gets_nothing_to_replay():
+    hub = SevaEventHub()
+    hub.publish("request", {"id": 1})
+    assert _collect(hub, last_event_id=f"{hub.epoch}-1") == []
+
+
+def test_foreign_epoch_gets_reset():
+    hub = SevaEventHub()
+    hub.publish("request", {"id": 1})
+    messages = _collect(hub, last_event_id="deadbeef-1")
+    assert [_parse(m)[1] for m in messages] == ["reset"]
+    assert _parse(messages[0])[0] == f"{hub.epoch}-1"
+
+
+def test_id_ahead_of_hub_or_garbled_gets_reset():
+    hub = SevaEventHub()
+    hub.publish("request", {"id": 1})
+    for last_event_id in (f"{hub.epoch}-9", f"{hub.epoch}-x", "7"):
+        assert [_parse(m)[1] for m in _collect(hub, last_event_id=last_event_id)] == ["reset"]
+
+
+def test_gap_larger_than_history_gets_reset():
+    hub = SevaEventHub(history_size=3)
+    for i in range(10):
+        hub.publish("request", {"id": i})
+    messages = _collect(hub, last_event_id=f"{hub.epoch}-2")
+    assert [_parse(m)[1] for m in messages] == ["reset"]
+
+
+def test_events_queued_during_replay_are_not_sent_twice():
+    hub = SevaEventHub()
+    hub.publish("request", {"id": 0})
+    hub.publish("request", {"id": 1})
+    messages = _collect(
+        hub,
+        last_event_id=f"{hub.epoch}-1",
+        publish_during=[("response", {"id": 2})],
+    )
+    # Seq 3 lands in both the history and the client's queue; it goes out once
+    assert [_parse(m)[0] for m in messages] == [f"{hub.epoch}-2", f"{hub.epoch}-3"]
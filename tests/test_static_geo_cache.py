@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+import static_geo_cache
+from static_geo_cache import build_prepared_villages, load_prepared_villages
+from village_resolver import normalize_block
+
+
+def _write_villages(path, names):
+    features = [
+        {
+            "type": "Feature",
+            "properties": {"NAME": name, "SUB_DIST": "Bhadrak"},
+            "geometry": {"type": "Polygon", "coordinates": [
+                [[86.5 + i / 100, 21.0], [86.51 + i / 100, 21.0], [86.51 + i / 100, 21.01], [86.5 + i / 100, 21.0]]
+            ]},
+        }
+        for i, name in enumerate(names)
+    ]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+
+
+def test_load_caches_and_reuses(tmp_path, monkeypatch):
+    source = tmp_path / "villages.geojson"
+    cache_dir = tmp_path / "cache"
+    _write_villages(source, ["Nuagaon", "Tihidi"])
+
+    first = load_prepared_villages(str(source), normalize_block, str(cache_dir))
+    assert [f["properties"]["NAME"] for f in first.features] == ["Nuagaon", "Tihidi"]
+    assert first.block_features == {"bhadrak": [0, 1]}
+    assert len(os.listdir(cache_dir)) == 1
+
+    def no_rebuild(*args):
+        raise AssertionError("cache hit expected")
+
+    monkeypatch.setattr(static_geo_cache.PreparedVillages, "build", no_rebuild)
+    second = load_prepared_villages(str(source), normalize_block, str(cache_dir))
+    assert second.source_sha256 == first.source_sha256
+    assert second.features == first.features
+
+
+def test_changed_file_prunes_only_completed_caches(tmp_path):
+    source = tmp_path / "villages.geojson"
+    cache_dir = tmp_path / "cache"
+    _write_villages(source, ["Nuagaon"])
+    old = build_prepared_villages(str(source), normalize_block, str(cache_dir))
+    old_cache = static_geo_cache._cache_path(old.source_sha256, str(cache_dir))
+    # Another process part-way through writing its cache
+    in_progress = cache_dir / "villages-other.v1.pickle.4242.tmp"
+    in_progress.write_bytes(b"partial")
+    unrelated = cache_dir / "README"
+    unrelated.write_text("keep")
+
+    _write_villages(source, ["Nuagaon", "Tihidi"])
+    new = load_prepared_villages(str(source), normalize_block, str(cache_dir))
+
+    assert new.source_sha256 != old.source_sha256
+    assert not os.path.exists(old_cache)
+    assert in_progress.exists() and unrelated.exists()
+    assert os.path.exists(static_geo_cache._cache_path(new.source_sha256, str(cache_dir)))
+
+
+def test_unreadable_cache_is_rebuilt(tmp_path):
+    source = tmp_path / "villages.geojson"
+    cache_dir = tmp_path / "cache"
+    _write_villages(source, ["Nuagaon"])
+    prepared = build_prepared_villages(str(source), normalize_block, str(cache_dir))
+    with open(static_geo_cache._cache_path(prepared.source_sha256, str(cache_dir)), "wb") as f:
+        f.write(b"not a pickle")
+    assert load_prepared_villages(str(source), normalize_block, str(cache_dir)).features == prepared.features
+
+
+def test_missing_source_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_prepared_villages(str(tmp_path / "missing.geojson"), normalize_block, str(tmp_path))
@@ -0,0 +1,70 @@
+import pytest
+
+from village_resolver import VillageResolver, edit_distance, max_edit_distance
+
+
+VILLAGES = [
+    (1, "Nuagaon", "Bhadrak"),
+    (2, "Nuagaon", "Tihidi"),
+    (3, "Alpur", "Bhadrak"),
+    (4, "Alpua", "Bhadrak"),
+    (5, "Tihidi", "Tihidi"),
+    (6, "Bhadrak Town", "Bhadrak"),
+]
+
+
+@pytest.fixture
+def resolver():
+    return VillageResolver(VILLAGES)
+
+
+def test_edit_distance_counts_transpositions_as_one():
+    assert edit_distance("tihidi", "tihdii", 2) == 1
+    assert edit_distance("nuagaon", "nuagon", 2) == 1
+    assert edit_distance("abc", "abc", 0) == 0
+
+
+def test_edit_distance_stops_past_limit():
+    assert edit_distance("bhadrak", "kardahb", 1) == 2
+    assert edit_distance("a", "abcdef", 2) == 3
+
+
+def test_max_edit_distance_scales_with_length():
+    assert max_edit_distance("ab") == 0
+    assert max_edit_distance("nuagaon") == 1
+    assert max_edit_distance("bhadraktown") == 2
+
+
+def test_exact_match_with_block(resolver):
+    assert resolver.resolve("Nuagaon", "Tihidi") == (2, None)
+
+
+def test_exact_name_in_two_blocks_needs_block(resolver):
+    with pytest.raises(LookupError, match="add a block column"):
+        resolver.resolve("Nuagaon")
+
+
+def test_typo_resolves_and_reports_match(resolver):
+    assert resolver.resolve("Tihdi") == (5, "Tihidi (Tihidi)")
+    assert resolver.resolve("Bhadrak Towm") == (6, "Bhadrak Town (Bhadrak)")
+
+
+def test_typo_narrowed_by_block(resolver):
+    assert resolver.resolve("Nuagon", "Bhadrak") == (1, "Nuagaon (Bhadrak)")
+
+
+def test_tie_between_names_is_rejected(resolver):
+    # One edit from both "alpur" and "alpua"
+    with pytest.raises(LookupError, match="not found"):
+        resolver.resolve("Alpux")
+
+
+def test_too_many_edits_is_rejected(resolver):
+    with pytest.raises(LookupError, match="not found"):
+        resolver.resolve("Nxagxon")
+
+
+def test_short_names_need_exact_match():
+    resolver = VillageResolver([(1, "Ab", "Bhadrak")])
+    with pytest.raises(LookupError):
+        resolver.resolve("Ac")
@@ -0,0 +1,102 @@
+import asyncio
+
+from sqlmodel import select
+
+from db import engine
+from models import Village, VillagePin
+from village_resolver import normalize_village_key
+from village_sync import sync_village_features
+
+
+def _feature(name, population=100):
+    return {"type": "Feature", "properties": {"NAME": name, "SUB_DIST": "Bhadrak", "population": population}}
+
+
+def _stats(lat, lng):
+    return {"lat": lat, "lng": lng, "south": lat - 0.01, "west": lng - 0.01, "north": lat + 0.01, "east": lng + 0.01}
+
+
+def _sync(session_maker, steps):
+    """Run each step's (sha, features, stats) sync; return villages by name after each."""
+    async def run():
+        snapshots = []
+        try:
+            for step in steps:
+                async with session_maker() as session:
+                    if callable(step):
+                        await step(session)
+                        continue
+                    sha, features, stats = step
+                    summary = await sync_village_features(session, sha, features, stats, normalize_village_key)
+                    villages = (await session.execute(select(Village))).scalars().all()
+                    snapshots.append((summary, {village.name: village for village in villages}))
+            return snapshots
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_first_sync_inserts_and_unchanged_file_is_a_noop(session_maker):
+    features = [_feature("Nuagaon"), _feature("Tihidi")]
+    stats = [_stats(21.0, 86.5), _stats(21.1, 86.6)]
+
+    async def count_pins(session):
+        assert len((await session.execute(select(VillagePin))).all()) == 2
+
+    (first, villages), (second, _) = _sync(session_maker, [
+        ("sha-1", features, stats),
+        count_pins,
+        ("sha-1", features, stats),
+    ])
+    assert first == {"inserted": 2, "updated": 0, "adopted": 0}
+    assert second == {"unchanged": True}
+    assert (villages["Tihidi"].lat, villages["Tihidi"].south) == (21.1, 21.1 - 0.01)
+
+
+def test_changed_feature_moves_pin_unless_moved_by_hand(session_maker):
+    features = [_feature("Nuagaon"), _feature("Tihidi")]
+
+    async def move_by_hand(session):
+        village = (await session.execute(select(Village).where(Village.name == "Tihidi"))).scalar_one()
+        village.lat = 21.5
+        await session.commit()
+
+    _, (summary, villages) = _sync(session_maker, [
+        ("sha-1", features, [_stats(21.0, 86.5), _stats(21.1, 86.6)]),
+        move_by_hand,
+        ("sha-2", features, [_stats(21.2, 86.5), _stats(21.3, 86.6)]),
+    ])
+    assert summary == {"inserted": 0, "updated": 2, "adopted": 0}
+    assert villages["Nuagaon"].lat == 21.2
+    assert villages["Tihidi"].lat == 21.5
+    # Bounds follow the polygon either way
+    assert villages["Tihidi"].south == 21.3 - 0.01
+
+
+def test_population_change_is_written(session_maker):
+    stats = [_stats(21.0, 86.5)]
+    _, (summary, villages) = _sync(session_maker, [
+        ("sha-1", [_feature("Nuagaon", 100)], stats),
+        ("sha-2", [_feature("Nuagaon", 4321)], stats),
+    ])
+    assert summary["updated"] == 1
+    assert villages["Nuagaon"].population == 4321
+
+
+def test_adopted_village_keeps_pin_then_follows_polygon(session_maker):
+    async def legacy_village(session):
+        session.add(Village(name="Nuagaon", block="Bhadrak", lat=1.0, lng=2.0,
+                            south=0.0, west=0.0, north=0.0, east=0.0))
+        await session.commit()
+
+    features = [_feature("Nuagaon")]
+    (adopted, before), (changed, after) = _sync(session_maker, [
+        legacy_village,
+        ("sha-1", features, [_stats(21.0, 86.5)]),
+        ("sha-2", features, [_stats(21.2, 86.7)]),
+    ])
+    assert adopted == {"inserted": 0, "updated": 0, "adopted": 1}
+    assert (before["Nuagaon"].lat, before["Nuagaon"].lng) == (1.0, 2.0)
+    assert changed["updated"] == 1
+    assert (after["Nuagaon"].lat, after["Nuagaon"].lng) == (21.2, 86.7)
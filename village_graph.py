@@ -0,0 +1,166 @@
+"""
+Village adjacency graph over the static village polygons.
+
+Two villages are neighbours when their polygons share at least one edge
+(touching at a single corner does not count). The graph is built once per
+loaded feature list, like the spatial and tile indexes, and stored in CSR
+form: the neighbours of node ``i`` are ``indices[indptr[i]:indptr[i + 1]]``.
+Nodes are feature positions in the static GeoJSON.
+
+Coverage queries take the set of covered nodes and run plain BFS over the
+arrays, so they stay cheap enough to answer per request. Request handlers
+get the graph through ``load_village_graph``, which builds a missing one in
+a worker thread, once however many requests miss at the same time.
+"""
+import asyncio
+import threading
+from array import array
+from collections import deque
+from typing import Iterable, Optional
+
+from geo_topology import polygonal_rings
+
+# Coordinates are rounded before matching edges, so shared borders that were
+# written with slightly different float noise still line up
+EDGE_DECIMALS = 7
+
+
+class VillageGraph:
+    """Shared-edge adjacency of village polygons in CSR arrays."""
+
+    def __init__(self, features: list[dict]):
+        self.features = features
+        self.names: list[str] = []
+        self.blocks: list[str] = []
+        self.populations: list[int] = []
+
+        edge_owner: dict[tuple, int] = {}
+        pairs: set[tuple[int, int]] = set()
+        for i, feature in enumerate(features):
+            props = feature.get('properties') or {}
+            self.names.append((props.get('NAME') or props.get('name') or '').strip())
+            self.blocks.append((props.get('SUB_DIST') or props.get('block') or '').strip())
+            try:
+                self.populations.append(int(props.get('population') or props.get('POP') or 0))
+            except (TypeError, ValueError):
+                self.populations.append(0)
+
+            for polygon in polygonal_rings(feature.get('geometry')) or ():
+                for ring in polygon:
+                    points = [(round(pt[0], EDGE_DECIMALS), round(pt[1], EDGE_DECIMALS)) for pt in ring]
+                    for a, b in zip(points, points[1:]):
+                        if a == b:
+                            continue
+                        edge = (a, b) if a < b else (b, a)
+                        owner = edge_owner.setdefault(edge, i)
+                        if owner != i:
+                            pairs.add((owner, i) if owner < i else (i, owner))
+
+        neighbours: list[list[int]] = [[] for _ in features]
+        for a, b in pairs:
+            neighbours[a].append(b)
+            neighbours[b].append(a)
+        self.indptr = array('l', [0])
+        self.indices = array('l')
+        for adjacent in neighbours:
+            self.indices.extend(sorted(adjacent))
+            self.indptr.append(len(self.indices))
+
+    @property
+    def node_count(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices) // 2
+
+    def neighbours(self, node: int) -> array:
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def node(self, node: int) -> dict:
+        return {
+            "index": node,
+            "name": self.names[node],
+            "block": self.blocks[node],
+            "population": self.populations[node],
+        }
+
+    def hops_to_covered(self, covered: Iterable[int], max_hops: Optional[int] = None) -> array:
+        """Hop distance from every node to its nearest covered node.
+
+        Multi-source BFS from the covered set; -1 marks nodes with no covered
+        village in their component (or beyond max_hops).
+        """
+        hops = array('l', [-1]) * self.node_count
+        queue = deque()
+        for node in covered:
+            if hops[node] == -1:
+                hops[node] = 0
+                queue.append(node)
+        indptr, indices = self.indptr, self.indices
+        while queue:
+            node = queue.popleft()
+            next_hop = hops[node] + 1
+            if max_hops is not None and next_hop > max_hops:
+                continue
+            for k in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[k]
+                if hops[neighbour] == -1:
+                    hops[neighbour] = next_hop
+                    queue.append(neighbour)
+        return hops
+
+    def gap_clusters(self, covered: Iterable[int], min_size: int = 2) -> list[list[int]]:
+        """Connected groups of uncovered villages, largest first.
+
+        Components of the subgraph induced by uncovered nodes; with the default
+        min_size of 2 an isolated uncovered village next to covered ones is not
+        a gap cluster.
+        """
+        blocked = bytearray(self.node_count)
+        for node in covered:
+            blocked[node] = 1
+        indptr, indices = self.indptr, self.indices
+        clusters = []
+        for start in range(self.node_count):
+            if blocked[start]:
+                continue
+            blocked[start] = 1
+            component = [start]
+            stack = [start]
+            while stack:
+                node = stack.pop()
+                for k in range(indptr[node], indptr[node + 1]):
+                    neighbour = indices[k]
+                    if not blocked[neighbour]:
+                        blocked[neighbour] = 1
+                        component.append(neighbour)
+                        stack.append(neighbour)
+            if len(component) >= min_size:
+                clusters.append(sorted(component))
+        clusters.sort(key=lambda component: (-len(component), component[0]))
+        return clusters
+
+
+_graph: Optional[VillageGraph] = None
+_graph_lock = threading.Lock()
+
+
+def get_village_graph(features: list[dict]) -> VillageGraph:
+    """Return the graph for this feature list, rebuilding when the list was reloaded.
+
+    Building is slow; call from a worker thread (see load_village_graph).
+    """
+    global _graph
+    with _graph_lock:
+        if _graph is None or _graph.features is not features:
+            _graph = VillageGraph(features)
+        return _graph
+
+
+async def load_village_graph(features: list[dict]) -> VillageGraph:
+    """Graph for this feature list, built off the event loop on a miss."""
+    graph = _graph
+    if graph is None or graph.features is not features:
+        graph = await asyncio.to_thread(get_village_graph, features)
+    return graph
@@ -0,0 +1,127 @@
+"""
+Resolve free-text village names (as typed in CSV uploads) to village ids.
+
+Every village is loaded once into dictionaries keyed by normalized name and
+by normalized (name, block), so an exact match is a dict lookup. Misspelt
+names fall back to a character-trigram index that shortlists the names
+sharing trigrams with the query; a candidate is accepted within a
+length-scaled Damerau-Levenshtein distance (see ``max_edit_distance``) and
+a tie between names is rejected. Each distinct query is resolved once per
+resolver.
+"""
+from typing import Optional
+
+
+# Names up to this many characters (normalized) accept one edit, longer ones two
+SHORT_NAME_LENGTH = 8
+
+
+def normalize_block(name: str) -> str:
+    return ''.join(ch for ch in name.lower() if ch.isalnum())
+
+
+def normalize_village_key(name: str, block: str) -> str:
+    combined = f"{name or ''}::{block or ''}".lower()
+    return ''.join(ch for ch in combined if ch.isalnum())
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edit_distance(name: str) -> int:
+    """Edits tolerated in a normalized name of this length."""
+    if len(name) < 3:
+        return 0
+    return 1 if len(name) <= SHORT_NAME_LENGTH else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance; limit + 1 once past ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class VillageResolver:
+    """Exact and fuzzy lookup of village ids by name (and optional block)."""
+
+    def __init__(self, villages: list[tuple[int, str, str]]):
+        self.by_key: dict[str, int] = {}
+        # Normalized name -> (village_id, normalized block, "Name (Block)")
+        self.by_name: dict[str, list[tuple[int, str, str]]] = {}
+        for village_id, name, block in villages:
+            self.by_key.setdefault(normalize_village_key(name, block), village_id)
+            self.by_name.setdefault(normalize_block(name or ''), []).append(
+                (village_id, normalize_block(block or ''), f"{name} ({block})")
+            )
+        self._grams: dict[str, set[str]] = {}
+        for name in self.by_name:
+            for gram in _trigrams(name):
+                self._grams.setdefault(gram, set()).add(name)
+        self._fuzzy_cache: dict[str, Optional[str]] = {}
+
+    def _closest_name(self, name: str) -> Optional[str]:
+        if name in self._fuzzy_cache:
+            return self._fuzzy_cache[name]
+        limit = max_edit_distance(name)
+        shortlist = set()
+        if limit:
+            for gram in _trigrams(name):
+                shortlist.update(self._grams.get(gram, ()))
+        best = None
+        best_distance = limit + 1
+        for candidate in shortlist:
+            distance = edit_distance(name, candidate, limit)
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+            elif distance == best_distance and distance <= limit:
+                # A tie between two different names is too ambiguous to guess
+                best = None
+        if best_distance > limit:
+            best = None
+        self._fuzzy_cache[name] = best
+        return best
+
+    def resolve(self, name: str, block: Optional[str] = None) -> tuple[int, Optional[str]]:
+        """Return (village_id, matched) for a village name.
+
+        ``matched`` is the "Name (Block)" of a fuzzy match, None for an exact
+        one. Raises LookupError with a row-ready message when nothing, or
+        more than one village, matches.
+        """
+        if block:
+            village_id = self.by_key.get(normalize_village_key(name, block))
+            if village_id is not None:
+                return village_id, None
+
+        normalized = normalize_block(name or '')
+        fuzzy = False
+        candidates = self.by_name.get(normalized)
+        if not candidates:
+            closest = self._closest_name(normalized) if normalized else None
+            if closest is None:
+                raise LookupError(f"Village '{name}' not found")
+            candidates = self.by_name[closest]
+            fuzzy = True
+
+        if block:
+            in_block = [c for c in candidates if c[1] == normalize_block(block)]
+            candidates = in_block or candidates
+        if len(candidates) > 1:
+            raise LookupError(f"Village '{name}' matches {len(candidates)} villages; add a block column")
+        village_id, _, label = candidates[0]
+        return village_id, label if fuzzy else None
@@ -0,0 +1,263 @@
+"""
+Incremental sync of the static village GeoJSON into the villages table.
+
+The SHA-256 of the last synced file is stored in ``static_datasets``, so an
+unchanged file costs one primary-key lookup at startup however large the
+villages table grows. When the file changes, each feature's synced values
+(name, block, centroid, bounds, population, census code) are fingerprinted
+and compared with ``static_village_fingerprints``; only new and changed
+features are written, in batched INSERT ... ON CONFLICT statements.
+
+Changed features get their bounds, population and census code refreshed. Their pin
+position moves only if it still sits at the previously synced centroid, so
+coordinates an admin adjusted by hand are kept. Villages that already
+existed before fingerprints were recorded (matched by normalized name and
+block) are adopted as they are, their current pin counting as the synced
+position.
+"""
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import and_, bindparam, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from db import dialect_insert
+from models import StaticDataset, StaticVillageFingerprint, Village, VillagePin
+
+logger = logging.getLogger(__name__)
+
+DATASET_NAME = "villages"
+
+# Rows per INSERT/UPDATE statement
+SYNC_BATCH_SIZE = 500
+
+
+def _batches(rows: list, size: int = SYNC_BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def feature_record(feature: dict, stats: Optional[dict]) -> Optional[dict]:
+    """Village column values synced from one feature, or None if it can't be synced."""
+    props = feature.get('properties') or {}
+    name = (props.get('NAME') or props.get('name') or '').strip()
+    block = (props.get('SUB_DIST') or props.get('block') or '').strip()
+    if not name or not block or not stats:
+        return None
+    code_2011 = props.get('CENSUSCODE') or props.get('code_2011') or props.get('code')
+    return {
+        "name": name,
+        "block": block,
+        "lat": stats['lat'],
+        "lng": stats['lng'],
+        "south": stats['south'],
+        "west": stats['west'],
+        "north": stats['north'],
+        "east": stats['east'],
+        "population": props.get('population') or props.get('POP') or 0,
+        "code_2011": str(code_2011) if code_2011 else None,
+    }
+
+
+def _fingerprint(record: dict) -> str:
+    values = repr(tuple(record[column] for column in sorted(record)))
+    return hashlib.blake2b(values.encode('utf-8'), digest_size=16).hexdigest()
+
+
+async def sync_village_features(
+    session: AsyncSession,
+    source_sha256: str,
+    features: list[dict],
+    stats: list[Optional[dict]],
+    village_key: Callable[[str, str], str]
+) -> dict:
+    """Bring the villages table in line with the static features.
+
+    Returns counts of inserted, updated and adopted villages; a no-op sync
+    (unchanged source) returns {"unchanged": True}.
+    """
+    dataset = await session.get(StaticDataset, DATASET_NAME)
+    if dataset is not None and dataset.source_sha256 == source_sha256:
+        return {"unchanged": True}
+
+    records: dict[str, dict] = {}
+    for position, feature in enumerate(features):
+        record = feature_record(feature, stats[position] if position < len(stats) else None)
+        if record is None:
+            continue
+        # First feature wins for duplicate names within a block, as before
+        records.setdefault(village_key(record["name"], record["block"]), record)
+
+    stored_result = await session.execute(
+        select(
+            StaticVillageFingerprint.village_key,
+            StaticVillageFingerprint.village_id,
+            StaticVillageFingerprint.fingerprint,
+            StaticVillageFingerprint.lat,
+            StaticVillageFingerprint.lng
+        )
+    )
+    stored = {row.village_key: row for row in stored_result.all()}
+
+    changed = []
+    unknown = []
+    for key, record in records.items():
+        record["fingerprint"] = _fingerprint(record)
+        previous = stored.get(key)
+        if previous is None:
+            unknown.append(key)
+        elif previous.fingerprint != record["fingerprint"]:
+            changed.append((key, previous))
+
+    # Features without a fingerprint may still match a village created
+    # before fingerprints existed, or added by hand with the same name
+    existing: dict[str, tuple[int, Optional[float], Optional[float]]] = {}
+    if unknown:
+        existing_result = await session.execute(
+            select(Village.id, Village.name, Village.block, Village.lat, Village.lng)
+        )
+        for village_id, name, block, lat, lng in existing_result.all():
+            existing.setdefault(village_key(name, block), (village_id, lat, lng))
+    adopted = [key for key in unknown if key in existing]
+    missing = [key for key in unknown if key not in existing]
+
+    now = datetime.now(timezone.utc)
+    village_ids = {key: existing[key][0] for key in adopted}
+    # Pin position each fingerprint records as "last synced": the feature
+    # centroid, except for adopted villages, which keep their current pin. A
+    # later change to their polygon then moves the pin unless it was moved
+    # by hand in the meantime, the same rule as for synced villages.
+    synced_positions = {key: (records[key]["lat"], records[key]["lng"]) for key in records}
+    synced_positions.update({key: existing[key][1:] for key in adopted})
+
+    for batch in _batches(missing):
+        rows = [
+            {
+                **{column: value for column, value in records[key].items() if column != "fingerprint"},
+                "district": "Bhadrak",
+                "state": "Odisha",
+                "show_pin": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for key in batch
+        ]
+        result = await session.execute(
+            insert(Village).returning(Village.id, sort_by_parameter_order=True),
+            rows
+        )
+        for key, village_id in zip(batch, result.scalars().all()):
+            village_ids[key] = village_id
+
+    if missing:
+        pin_rows = [
+            {
+                "village_id": village_ids[key],
+                "field_worker_count": 0,
+                "uk_center_count": 0,
+                "custom_data": "{}",
+                "quick_links": "[]",
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for key in missing
+        ]
+        for batch in _batches(pin_rows):
+            stmt = dialect_insert(VillagePin).values(batch)
+            await session.execute(stmt.on_conflict_do_nothing(index_elements=["village_id"]))
+
+    if changed:
+        bounds_rows = []
+        pin_position_rows = []
+        for key, previous in changed:
+            record = records[key]
+            village_ids[key] = previous.village_id
+            bounds_rows.append({
+                "b_id": previous.village_id,
+                "b_south": record["south"],
+                "b_west": record["west"],
+                "b_north": record["north"],
+                "b_east": record["east"],
+                "b_population": record["population"],
+                "b_code_2011": record["code_2011"],
+                "b_updated_at": now,
+            })
+            pin_position_rows.append({
+                "b_id": previous.village_id,
+                "b_lat": record["lat"],
+                "b_lng": record["lng"],
+                "b_old_lat": previous.lat,
+                "b_old_lng": previous.lng,
+            })
+        bounds_stmt = (
+            update(Village.__table__)
+            .where(Village.__table__.c.id == bindparam("b_id"))
+            .values(
+                south=bindparam("b_south"),
+                west=bindparam("b_west"),
+                north=bindparam("b_north"),
+                east=bindparam("b_east"),
+                population=bindparam("b_population"),
+                code_2011=bindparam("b_code_2011"),
+                updated_at=bindparam("b_updated_at"),
+            )
+        )
+        position_stmt = (
+            update(Village.__table__)
+            .where(and_(
+                Village.__table__.c.id == bindparam("b_id"),
+                Village.__table__.c.lat == bindparam("b_old_lat"),
+                Village.__table__.c.lng == bindparam("b_old_lng"),
+            ))
+            .values(lat=bindparam("b_lat"), lng=bindparam("b_lng"))
+        )
+        for batch in _batches(bounds_rows):
+            await session.execute(bounds_stmt, batch)
+        for batch in _batches(pin_position_rows):
+            await session.execute(position_stmt, batch)
+
+    fingerprint_rows = [
+        {
+            "village_key": key,
+            "village_id": village_ids[key],
+            "fingerprint": records[key]["fingerprint"],
+            "lat": synced_positions[key][0],
+            "lng": synced_positions[key][1],
+        }
+        for key in [*missing, *adopted, *(key for key, _ in changed)]
+    ]
+    for batch in _batches(fingerprint_rows):
+        stmt = dialect_insert(StaticVillageFingerprint).values(batch)
+        await session.execute(stmt.on_conflict_do_update(
+            index_elements=["village_key"],
+            set_={
+                "village_id": stmt.excluded.village_id,
+                "fingerprint": stmt.excluded.fingerprint,
+                "lat": stmt.excluded.lat,
+                "lng": stmt.excluded.lng,
+            }
+        ))
+
+    dataset_stmt = dialect_insert(StaticDataset).values(
+        name=DATASET_NAME,
+        source_sha256=source_sha256,
+        feature_count=len(records),
+        synced_at=now
+    )
+    await session.execute(dataset_stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={
+            "source_sha256": source_sha256,
+            "feature_count": len(records),
+            "synced_at": now,
+        }
+    ))
+    await session.commit()
+
+    summary = {"inserted": len(missing), "updated": len(changed), "adopted": len(adopted)}
+    logger.info(f"Static village sync: {summary}")
+    return summary
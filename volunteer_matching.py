@@ -0,0 +1,170 @@
+"""
+Nearest-volunteer matching for seva requests.
+
+The index holds every verified, available Member at their village centroid,
+split by seva type (an inverted index from type to members) and bucketed
+into a uniform lat/lng grid per type. A match walks grid rings outward from
+the request's village and stops once no unexplored cell can beat the k-th
+best score, so the cost depends on the volunteers near the request rather
+than on the size of the members table.
+
+Score is distance in km plus load-balancing penalties: volunteers who
+served recently or have done many sevas rank behind an equally close one.
+The index is cached through ``CachedConfig`` (namespace "volunteer_index");
+member, village and seva response writes call
+``volunteer_index_cache.invalidate()``.
+"""
+import heapq
+import math
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from config_cache import CachedConfig
+from models import Member, Village
+
+# Grid cell size in degrees (~5.5 km)
+GRID_CELL_DEGREES = 0.05
+
+KM_PER_DEGREE = 111.32
+
+# Penalty, in km, for a volunteer whose last seva was just now; decays with
+# a one-day time constant
+RECENT_SEVA_PENALTY_KM = 5.0
+RECENT_SEVA_DECAY_HOURS = 24.0
+
+# Penalty, in km, per completed seva, capped so veterans stay reachable
+SEVA_COUNT_PENALTY_KM = 0.5
+MAX_SEVA_COUNT_PENALTY_KM = 10.0
+
+
+def parse_seva_types(value: Optional[str]) -> set[str]:
+    return {part.strip().lower() for part in (value or "").split(",") if part.strip()}
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * 6371.0088 * math.asin(math.sqrt(a))
+
+
+def load_penalty_km(total_seva_count: int, last_seva_date: Optional[datetime], now: datetime) -> float:
+    penalty = min((total_seva_count or 0) * SEVA_COUNT_PENALTY_KM, MAX_SEVA_COUNT_PENALTY_KM)
+    if last_seva_date is not None:
+        if last_seva_date.tzinfo is None:
+            last_seva_date = last_seva_date.replace(tzinfo=timezone.utc)
+        hours = max((now - last_seva_date).total_seconds() / 3600.0, 0.0)
+        penalty += RECENT_SEVA_PENALTY_KM * math.exp(-hours / RECENT_SEVA_DECAY_HOURS)
+    return penalty
+
+
+class VolunteerIndex:
+    """Per-seva-type grids of available, verified members."""
+
+    def __init__(self, rows: list[dict]):
+        self._grids: dict[str, dict[tuple[int, int], list[dict]]] = {}
+        self._bounds: dict[str, tuple[int, int, int, int]] = {}
+        self.member_count = len(rows)
+        for row in rows:
+            cell = self._cell(row["lat"], row["lng"])
+            for seva_type in row["seva_types"]:
+                self._grids.setdefault(seva_type, {}).setdefault(cell, []).append(row)
+        for seva_type, grid in self._grids.items():
+            xs = [cell[0] for cell in grid]
+            ys = [cell[1] for cell in grid]
+            self._bounds[seva_type] = (min(xs), min(ys), max(xs), max(ys))
+
+    @staticmethod
+    def _cell(lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lng / GRID_CELL_DEGREES), math.floor(lat / GRID_CELL_DEGREES)
+
+    def seva_types(self) -> dict[str, int]:
+        """Volunteer count per seva type."""
+        return {
+            seva_type: sum(len(rows) for rows in grid.values())
+            for seva_type, grid in sorted(self._grids.items())
+        }
+
+    def nearest(
+        self,
+        seva_type: str,
+        lat: float,
+        lng: float,
+        k: int = 5,
+        exclude: frozenset[int] = frozenset(),
+        now: Optional[datetime] = None
+    ) -> list[dict]:
+        """Best k volunteers for seva_type around (lat, lng), best first."""
+        grid = self._grids.get(seva_type.strip().lower())
+        if not grid or k <= 0:
+            return []
+        now = now or datetime.now(timezone.utc)
+        min_x, min_y, max_x, max_y = self._bounds[seva_type.strip().lower()]
+        qx, qy = self._cell(lat, lng)
+        max_ring = max(qx - min_x, max_x - qx, qy - min_y, max_y - qy, 0)
+        # Lower bound on the km covered by one ring of cells (longitude is the short side)
+        ring_km = GRID_CELL_DEGREES * KM_PER_DEGREE * math.cos(math.radians(min(abs(lat) + 1.0, 89.0)))
+
+        best: list[tuple[float, int, dict]] = []  # max-heap on score via negation
+        for ring in range(max_ring + 1):
+            if len(best) >= k and (ring - 1) * ring_km >= -best[0][0]:
+                break
+            for cx in range(qx - ring, qx + ring + 1):
+                for cy in (range(qy - ring, qy + ring + 1) if abs(cx - qx) == ring else (qy - ring, qy + ring)):
+                    for row in grid.get((cx, cy), ()):
+                        if row["member_id"] in exclude:
+                            continue
+                        distance = haversine_km(lat, lng, row["lat"], row["lng"])
+                        score = distance + load_penalty_km(row["total_seva_count"], row["last_seva_date"], now)
+                        item = (-score, -row["member_id"], {**row, "distance_km": distance, "score": score})
+                        if len(best) < k:
+                            heapq.heappush(best, item)
+                        elif item > best[0]:
+                            heapq.heapreplace(best, item)
+
+        matches = [entry for _, _, entry in sorted(best, reverse=True)]
+        for match in matches:
+            match["distance_km"] = round(match["distance_km"], 2)
+            match["score"] = round(match["score"], 2)
+            del match["seva_types"]
+        return matches
+
+
+async def _load_volunteer_index(session: AsyncSession) -> VolunteerIndex:
+    result = await session.execute(
+        select(
+            Member.id, Member.full_name, Member.phone, Member.seva_types,
+            Member.total_seva_count, Member.last_seva_date,
+            Village.id, Village.name, Village.block, Village.lat, Village.lng
+        )
+        .join(Village, Member.village_id == Village.id)
+        .where(Member.verified == True)
+        .where(Member.available == True)
+    )
+    rows = []
+    for (member_id, full_name, phone, seva_types, total_seva_count, last_seva_date,
+         village_id, village_name, block, lat, lng) in result.all():
+        types = parse_seva_types(seva_types)
+        if not types or lat is None or lng is None:
+            continue
+        rows.append({
+            "member_id": member_id,
+            "full_name": full_name,
+            "phone": phone,
+            "seva_types": types,
+            "total_seva_count": total_seva_count or 0,
+            "last_seva_date": last_seva_date,
+            "village_id": village_id,
+            "village_name": village_name,
+            "block": block,
+            "lat": lat,
+            "lng": lng,
+        })
+    return VolunteerIndex(rows)
+
+
+volunteer_index_cache: CachedConfig[VolunteerIndex] = CachedConfig("volunteer_index", _load_volunteer_index)
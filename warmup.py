@@ -0,0 +1,72 @@
+"""
+Deferred startup work and readiness state.
+
+Only the database engine has to be ready before the app accepts requests.
+Everything else that startup used to await (label seeding, the static
+village sync, GeoJSON artifacts, tiles and spatial indexes) runs as named
+warm-up steps in a background task. Endpoints that need that data load it
+lazily as before, so early requests are slower rather than refused.
+
+``warmup.ready`` turns true once every step has succeeded; ``/health``
+reports it next to liveness and ``/health/ready`` answers 503 until then,
+for load balancers that should hold traffic back from a cold instance.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+WarmupStep = tuple[str, Callable[[], Awaitable[object]]]
+
+
+class Warmup:
+    """Runs warm-up steps in order and records how each one went."""
+
+    def __init__(self):
+        self.steps: dict[str, dict] = {}
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None and all(
+            step["status"] == "done" for step in self.steps.values()
+        )
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "steps": self.steps,
+        }
+
+    async def run(self, steps: list[WarmupStep]) -> None:
+        """Run each step once; a failed step is logged and the rest still run."""
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at = None
+        self.steps = {name: {"status": "pending"} for name, _ in steps}
+        for name, step in steps:
+            self.steps[name] = {"status": "running"}
+            started = time.perf_counter()
+            try:
+                await step()
+            except asyncio.CancelledError:
+                self.steps[name] = {"status": "cancelled"}
+                raise
+            except Exception as e:
+                logger.error(f"Warm-up step '{name}' failed: {e}", exc_info=True)
+                self.steps[name] = {"status": "failed", "error": str(e)}
+                continue
+            seconds = round(time.perf_counter() - started, 3)
+            self.steps[name] = {"status": "done", "seconds": seconds}
+            logger.info(f"Warm-up step '{name}' done in {seconds}s")
+        self.finished_at = datetime.now(timezone.utc)
+        if self.ready:
+            logger.info("Application warm-up complete")
+
+
+warmup = Warmup()